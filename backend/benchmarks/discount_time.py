@@ -0,0 +1,143 @@
+"""
+Benchmark do cálculo do tempo de desconto (ProductionTimes.get_discount_time).
+
+Compara a implementação anterior (apply por linha e um str.contains por chave do dicionário de
+descontos) com a implementação vetorizada, sobre um mês de paradas simuladas, e verifica que os
+resultados são idênticos.
+
+Uso (a partir da pasta backend):
+    python -m benchmarks.discount_time --rows 60000 --repeat 5
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+# pylint: disable=import-error
+from src.helpers.variables import (
+    AF_REP,
+    DESC_EFF,
+    DESC_PERF,
+    DESC_REP,
+    NOT_EFF,
+    NOT_PERF,
+    IndicatorType,
+)
+from src.service.functions.production_times import ProductionTimes
+
+CASES = {
+    IndicatorType.EFFICIENCY: (DESC_EFF, NOT_EFF),
+    IndicatorType.PERFORMANCE: (DESC_PERF, NOT_PERF),
+    IndicatorType.REPAIR: (DESC_REP, AF_REP),
+}
+
+
+def legacy_discount_time(
+    df: pd.DataFrame, desc_dict: dict[str, int], skip_list: list[str], indicator: IndicatorType
+) -> pd.DataFrame:
+    """Implementação anterior do get_discount_time (referência)."""
+    df = df.copy()
+    df["desconto"] = 0
+
+    mask = df[["motivo", "problema", "causa"]].apply(lambda x: x.isin(skip_list).any(), axis=1)
+    df.loc[mask, "desconto"] = 0 if indicator == IndicatorType.REPAIR else df.tempo
+    if indicator == IndicatorType.REPAIR:
+        df.loc[df["problema"] == "Manutenção Preventiva", "desconto"] = df.tempo
+
+    indicator_dict = {
+        IndicatorType.EFFICIENCY: df,
+        IndicatorType.PERFORMANCE: df[~mask],
+        IndicatorType.REPAIR: df[mask],
+    }
+
+    df = indicator_dict[indicator].reset_index(drop=True)
+
+    for key, value in desc_dict.items():
+        mask = (
+            df[["motivo", "problema", "causa"]]
+            .apply(lambda x, key=key: x.str.contains(key, case=False, na=False))
+            .any(axis=1)
+        )
+        df.loc[mask, "desconto"] = value
+
+    df.loc[:, "desconto"] = df[["desconto", "tempo"]].min(axis=1)
+    df.loc[:, "excedente"] = (df.tempo - df.desconto).clip(lower=0)
+
+    return df
+
+
+def month_of_stops(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Gera um mês de paradas com os motivos, problemas e causas usados nos descontos."""
+    rng = np.random.default_rng(seed)
+
+    texts = sorted(
+        {*DESC_EFF, *DESC_PERF, *DESC_REP, *NOT_EFF, *NOT_PERF, *AF_REP}
+        | {"Ajustes", "Falha Elétrica", "Quebra de Esteira", "Outros", "troca de sabor - linha"}
+    )
+    options = np.array([*texts, None], dtype=object)
+
+    return pd.DataFrame(
+        {
+            "maquina_id": rng.choice([f"TMF{i:03d}" for i in range(30)], rows),
+            "linha": rng.integers(1, 15, rows),
+            "turno": rng.choice(["NOT", "MAT", "VES"], rows),
+            "data_registro": pd.Timestamp("today").normalize()
+            - pd.to_timedelta(rng.integers(0, 31, rows), unit="D"),
+            "motivo": rng.choice(options, rows),
+            "problema": rng.choice(options, rows),
+            "causa": rng.choice(options, rows),
+            "tempo": rng.integers(1, 480, rows),
+        }
+    )
+
+
+def best_time(func, repeat: int) -> float:
+    """Melhor tempo (s) de `repeat` execuções."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    """Executa o benchmark e imprime a comparação."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 2)[1])
+    parser.add_argument("--rows", type=int, default=60000, help="Paradas no mês (padrão: 60000)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    df = month_of_stops(args.rows)
+    production_times = ProductionTimes()
+    results = []
+
+    for indicator, (desc_dict, skip_list) in CASES.items():
+        expected = legacy_discount_time(df, desc_dict, skip_list, indicator)
+        result = production_times.get_discount_time(df, desc_dict, skip_list, indicator)
+        pd.testing.assert_frame_equal(result, expected)
+
+        before = best_time(
+            lambda: legacy_discount_time(df, desc_dict, skip_list, indicator), args.repeat
+        )
+        after = best_time(
+            lambda: production_times.get_discount_time(df, desc_dict, skip_list, indicator),
+            args.repeat,
+        )
+        results.append(
+            {
+                "indicator": indicator.value,
+                "before_s": round(before, 4),
+                "after_s": round(after, 4),
+                "speedup": round(before / after, 1),
+            }
+        )
+
+    print(f"{args.rows} paradas - resultados idênticos")
+    print(pd.DataFrame(results).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark dos backends de leitura do SQL Server: pd.read_sql x lotes Arrow.
+
+Cada execução roda em um processo separado, para que o pico de memória (RSS) de um backend não
+contamine o do outro.
+
+Uso (a partir da pasta backend):
+    python -m benchmarks.fetch_backends --days 31
+    python -m benchmarks.fetch_backends --query "SELECT * FROM AUTOMACAO.dbo.maquina_ihm" --repeat 5
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+import pandas as pd
+
+BACKENDS = ("pandas", "arrow")
+
+
+def peak_rss_mb() -> float:
+    """Retorna o pico de memória (RSS) do processo atual em MB."""
+    try:
+        import resource  # pylint: disable=import-outside-toplevel
+
+        # ru_maxrss em KB no Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    except ImportError:
+        import psutil  # pylint: disable=import-outside-toplevel
+
+        # No Windows o psutil informa o pico do working set
+        return psutil.Process().memory_info().peak_wset / 1024**2
+
+
+def run_once(query: str, database: str, backend: str) -> dict:
+    """Executa a query uma vez com o backend informado e retorna as métricas."""
+    # pylint: disable=import-outside-toplevel
+    from src.model.db_automacao_model import DBAutomacaoModel
+    from src.model.db_totvsdb_model import DBTotvsdbModel
+
+    model = DBAutomacaoModel() if database == "automacao" else DBTotvsdbModel()
+    baseline = peak_rss_mb()
+
+    start = time.perf_counter()
+    data = model.get_data(query, backend=backend)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "backend": backend,
+        "rows": 0 if data is None else len(data),
+        "wall_time_s": round(elapsed, 3),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "peak_rss_delta_mb": round(peak_rss_mb() - baseline, 1),
+        "frame_mb": (
+            0 if data is None else round(data.memory_usage(deep=True).sum() / 1024**2, 1)
+        ),
+    }
+
+
+def main() -> None:
+    """Executa o benchmark e imprime a comparação."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 2)[1])
+    parser.add_argument("--query", help="Query a ser executada (padrão: maquina_info por período)")
+    parser.add_argument("--database", choices=("automacao", "totvsdb"), default="automacao")
+    parser.add_argument("--days", type=int, default=31, help="Dias de maquina_info (padrão: 31)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--worker", choices=BACKENDS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    first_day = (pd.Timestamp("today") - pd.Timedelta(days=args.days)).strftime("%Y-%m-%d")
+    query = args.query or (
+        f"SELECT * FROM AUTOMACAO.dbo.maquina_info WHERE data_registro >= '{first_day}'"
+    )
+
+    # Processo filho: executa uma única medição
+    if args.worker:
+        print(json.dumps(run_once(query, args.database, args.worker)))
+        return
+
+    results = []
+    for _ in range(args.repeat):
+        for backend in BACKENDS:
+            output = subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "benchmarks.fetch_backends",
+                    "--query",
+                    query,
+                    "--database",
+                    args.database,
+                    "--worker",
+                    backend,
+                ],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            results.append(json.loads(output.stdout.strip().splitlines()[-1]))
+
+    df = pd.DataFrame(results)
+    print(df.to_string(index=False))
+    print()
+    print(df.groupby("backend").median(numeric_only=True).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,13 @@ Criado em: 09/08/2024
 Criado por: Bruno Tomaz
 """
 
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
+from src.database.connection import dispose_engines, get_pool_metrics
+from src.database.query import get_query_metrics
+from src.helpers.responses import NegotiationMiddleware
 from src.helpers.scheduler_tasks import start_scheduler
 
 # pylint: disable=import-error
@@ -18,7 +23,18 @@ from src.router import (
     protheus_sd3_route,
 )
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    """Ciclo de vida da aplicação: no encerramento, libera as conexões dos pools."""
+    yield
+    dispose_engines()
+
+
+app = FastAPI(lifespan=lifespan)
+
+# Formato (Accept, X-Payload-Version) e ETag das rotas que retornam DataFrames
+app.add_middleware(NegotiationMiddleware)
 
 app.include_router(machine_route.machine_router, prefix="/machine", tags=["Maquinas"])
 app.include_router(local_route.local_router, prefix="/local", tags=["Local"])
@@ -47,6 +63,18 @@ def read_root():
     }
 
 
+@app.get("/metrics/pool", tags=["Métricas"], summary="Métricas do pool de conexões.")
+def read_pool_metrics():
+    """Retorna as métricas de checkout/espera do pool de cada banco de dados."""
+    return get_pool_metrics()
+
+
+@app.get("/metrics/queries", tags=["Métricas"], summary="Tempo de execução das queries.")
+def read_query_metrics():
+    """Retorna as chamadas e o tempo de execução de cada query nomeada."""
+    return get_query_metrics()
+
+
 start_scheduler()
 
 if __name__ == "__main__":
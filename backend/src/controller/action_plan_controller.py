@@ -3,6 +3,7 @@
 import pandas as pd
 from fastapi import status
 from fastapi.responses import JSONResponse
+from src.helpers.responses import data_response, entity_tag, not_modified
 from src.service.action_plan_service import ActionPlanService
 
 
@@ -14,13 +15,19 @@ class ActionPlanController:
 
     def get_data(self) -> pd.DataFrame:
         """Obtém os dados da tabela action_plan do banco de dados local."""
+        # Versão do conteúdo da tabela: sem mudanças desde a última requisição, retorna 304
+        etag = entity_tag(self.__action_plan_service.get_version())
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
+
         data = self.__action_plan_service.get_data()
         if data is None or data.empty:
             return JSONResponse(
                 status_code=status.HTTP_404_NOT_FOUND, content={"message": "Data not found."}
             )
 
-        return JSONResponse(content=data.to_json(date_format="iso", orient="split"))
+        return data_response(data, etag)
 
     def insert_data(self, data: pd.DataFrame) -> None:
         """Insere dados na tabela action_plan do banco de dados local."""
@@ -5,6 +5,7 @@ from fastapi import status
 from fastapi.responses import JSONResponse
 
 # pylint: disable=import-error
+from src.helpers.responses import data_response, entity_tag, not_modified
 from src.service.historic_ind_service import HistoricIndService
 
 
@@ -16,13 +17,29 @@ class HistoricIndController:
 
     def get_data(self) -> pd.DataFrame:
         """Obtém dados do banco de dados local de Indicadores Históricos."""
+        # Versão do conteúdo da tabela: sem mudanças desde a última requisição, retorna 304
+        etag = entity_tag(self.__historic_ind_service.get_version())
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
+
         data = self.__historic_ind_service.get_data()
         if data is None or data.empty:
             return JSONResponse(
                 status_code=status.HTTP_404_NOT_FOUND, content={"message": "Data not found."}
             )
 
-        return JSONResponse(content=data.to_json(date_format="iso", orient="split"))
+        return data_response(data, etag)
+
+    def get_builds(self) -> JSONResponse:
+        """Obtém as execuções da criação do Histórico de Indicadores (mês, duração e status)."""
+        data = self.__historic_ind_service.get_builds()
+        if data is None or data.empty:
+            return JSONResponse(
+                status_code=status.HTTP_404_NOT_FOUND, content={"message": "Data not found."}
+            )
+
+        return data_response(data)
 
     def insert_data(self, data: pd.DataFrame) -> None:
         """Insere dados no banco de dados local de Indicadores Históricos."""
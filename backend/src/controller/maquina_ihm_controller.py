@@ -4,6 +4,8 @@ from fastapi import status
 from fastapi.responses import JSONResponse
 
 # pylint: disable=import-error
+from src.database.query import TableQuery
+from src.helpers.responses import data_response
 from src.service.maquina_ihm_service import MaquinaIHMService
 
 
@@ -13,13 +15,15 @@ class MaquinaIHMController:
     def __init__(self) -> None:
         self.__maquina_ihm_service = MaquinaIHMService()
 
-    def get_data(self, period: tuple):
-        """Obtém dados da tabela maquina_ihm."""
+    def get_data(self, period: tuple, query: TableQuery | None = None):
+        """Obtém dados da tabela maquina_ihm, com o filtro e as colunas pedidos (query)."""
         data = self.__maquina_ihm_service.get_data(period)
+        if data is not None and query is not None:
+            data = query.filter_frame(data)
 
         if data is None or data.empty:
             return JSONResponse(
                 status_code=status.HTTP_404_NOT_FOUND, content={"message": "Data not found."}
             )
 
-        return JSONResponse(content=data.to_json(date_format="iso", orient="split"))
+        return data_response(data)
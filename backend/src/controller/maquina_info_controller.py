@@ -1,11 +1,15 @@
 """Módulo controlador para as informações da máquina."""
 
+from itertools import chain
+
 import pandas as pd
 from fastapi import status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from src.functions.date_f import get_date, get_first_and_last_day_of_month
 
 # pylint: disable=import-error
+from src.database.query import TableQuery
+from src.helpers.responses import data_response
 from src.service.maquina_info_service import MaquinaInfoService
 
 
@@ -15,15 +19,38 @@ class MaquinaInfoController:
     def __init__(self) -> None:
         self.__maquina_info_service = MaquinaInfoService()
 
-    def get_data(self, period: tuple):
-        """Obtém os dados da tabela maquina_info."""
+    def get_data(self, period: tuple, query: TableQuery | None = None):
+        """Obtém os dados da tabela maquina_info, com o filtro e as colunas pedidos (query)."""
         data = self.__maquina_info_service.get_data(period)
+        if data is not None and query is not None:
+            data = query.filter_frame(data)
+
         if data is None or data.empty:
             return JSONResponse(
                 status_code=status.HTTP_404_NOT_FOUND, content={"message": "Data not found."}
             )
 
-        return JSONResponse(content=data.to_json(date_format="iso", orient="split"))
+        return data_response(data)
+
+    def stream_data(self, period: tuple):
+        """
+        Obtém os dados da tabela maquina_info em streaming, no formato NDJSON
+        (um registro JSON por linha), enviados em lotes conforme são lidos do banco.
+        """
+        chunks = self.__maquina_info_service.iter_data(period)
+        first = next(chunks, None)
+
+        if first is None:
+            chunks.close()
+            return JSONResponse(
+                status_code=status.HTTP_404_NOT_FOUND, content={"message": "Data not found."}
+            )
+
+        def generate():
+            for chunk in chain([first], chunks):
+                yield chunk.to_json(date_format="iso", orient="records", lines=True)
+
+        return StreamingResponse(generate(), media_type="application/x-ndjson")
 
     def get_data_cycle(self, period: tuple):
         """Obtém os dados da tabela maquina_info."""
@@ -47,7 +74,7 @@ class MaquinaInfoController:
                 status_code=status.HTTP_404_NOT_FOUND, content={"message": "Data not found."}
             )
 
-        return JSONResponse(content=data.to_json(date_format="iso", orient="split"))
+        return data_response(data)
 
     def get_pure_data(self, period: tuple):
         """Obtém os dados da tabela maquina_info."""
@@ -57,7 +84,7 @@ class MaquinaInfoController:
                 status_code=status.HTTP_404_NOT_FOUND, content={"message": "Data not found."}
             )
 
-        return JSONResponse(content=data.to_json(date_format="iso", orient="split"))
+        return data_response(data)
 
     def get_production_data(self, period: tuple):
         """Obtém os dados de produção da máquina."""
@@ -67,7 +94,7 @@ class MaquinaInfoController:
                 status_code=status.HTTP_404_NOT_FOUND, content={"message": "Data not found."}
             )
 
-        return JSONResponse(content=data.to_json(date_format="iso", orient="split"))
+        return data_response(data)
 
     def get_production_data_by_day(self, day: str):
         """Obtém os dados de produção da máquina por dia."""
@@ -77,4 +104,4 @@ class MaquinaInfoController:
                 status_code=status.HTTP_404_NOT_FOUND, content={"message": "Data not found."}
             )
 
-        return JSONResponse(content=data.to_json(date_format="iso", orient="split"))
+        return data_response(data)
@@ -4,6 +4,8 @@ from fastapi import status
 from fastapi.responses import JSONResponse
 
 # pylint: disable=import-error
+from src.database.query import TableQuery
+from src.helpers.responses import data_response
 from src.service.maquina_qualidade_service import MaquinaQualidadeService
 
 
@@ -13,12 +15,15 @@ class MaquinaQualidadeController:
     def __init__(self) -> None:
         self.__maquina_qualidade_service = MaquinaQualidadeService()
 
-    def get_data(self, period: tuple):
-        """Obtém os dados da tabela qualidade_ihm."""
+    def get_data(self, period: tuple, query: TableQuery | None = None):
+        """Obtém os dados da tabela qualidade_ihm, com o filtro e as colunas pedidos (query)."""
         data = self.__maquina_qualidade_service.get_data(period)
+        if data is not None and query is not None:
+            data = query.filter_frame(data)
+
         if data is None or data.empty:
             return JSONResponse(
                 status_code=status.HTTP_404_NOT_FOUND, content={"message": "Data not found."}
             )
 
-        return JSONResponse(content=data.to_json(date_format="iso", orient="split"))
+        return data_response(data)
@@ -5,6 +5,13 @@ from fastapi import status
 from fastapi.responses import JSONResponse
 
 # pylint: disable=import-error
+from src.database.query import TableQuery
+from src.helpers.responses import (
+    changes_response,
+    data_response,
+    entity_tag,
+    not_modified,
+)
 from src.service.performance_service import PerformanceService
 
 
@@ -14,15 +21,40 @@ class PerformanceController:
     def __init__(self) -> None:
         self.__performance_service = PerformanceService()
 
-    def get_data(self) -> pd.DataFrame:
-        """Obtém dados do banco de dados local de performance."""
-        data = self.__performance_service.get_data()
+    def get_data(self, query: TableQuery | None = None) -> pd.DataFrame:
+        """
+        Obtém dados do banco de dados local de performance.
+
+        Com filtro, projeção ou paginação (query), a consulta é feita no banco de dados local.
+        """
+        # Versão do conteúdo da tabela: sem mudanças desde a última requisição, retorna 304
+        etag = entity_tag(self.__performance_service.get_version())
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
+
+        next_cursor = None
+        if query is None or query.is_empty:
+            data = self.__performance_service.get_data()
+        else:
+            data, next_cursor = self.__performance_service.query_data(query)
+
         if data is None or data.empty:
             return JSONResponse(
                 status_code=status.HTTP_404_NOT_FOUND, content={"message": "Data not found."}
             )
 
-        return JSONResponse(content=data.to_json(date_format="iso", orient="split"))
+        return data_response(data, etag, next_cursor)
+
+    def get_changes(self, since: int) -> JSONResponse:
+        """Obtém as mudanças de performance do banco de dados local depois da versão `since`."""
+        changes = self.__performance_service.get_changes(since)
+        if changes is None:
+            return JSONResponse(
+                status_code=status.HTTP_404_NOT_FOUND, content={"message": "Data not found."}
+            )
+
+        return changes_response(changes)
 
     def insert_data(self, data: pd.DataFrame) -> None:
         """Insere dados no banco de dados local de performance."""
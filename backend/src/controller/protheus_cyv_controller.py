@@ -5,6 +5,7 @@ from fastapi import status
 from fastapi.responses import JSONResponse
 
 # pylint: disable=import-error
+from src.helpers.responses import data_response
 from src.service.protheus_cyv_service import ProtheusCYVService
 
 
@@ -29,7 +30,7 @@ class ProtheusCYVController:
                 status_code=status.HTTP_404_NOT_FOUND, content={"message": "Data not found."}
             )
 
-        return JSONResponse(content=data.to_json(date_format="iso", orient="split"))
+        return data_response(data)
 
     def get_pasta_data(self) -> pd.DataFrame:
         """Retorna os dados de CYV Pasta do DB local.
@@ -46,7 +47,7 @@ class ProtheusCYVController:
                 status_code=status.HTTP_404_NOT_FOUND, content={"message": "Data not found."}
             )
 
-        return JSONResponse(content=data.to_json(date_format="iso", orient="split"))
+        return data_response(data)
 
     def get_massa_week_data(self) -> pd.DataFrame:
         """Retorna os dados de CYV Massa do DB local por semana.
@@ -63,7 +64,7 @@ class ProtheusCYVController:
                 status_code=status.HTTP_404_NOT_FOUND, content={"message": "Data not found."}
             )
 
-        return JSONResponse(content=data.to_json(date_format="iso", orient="split"))
+        return data_response(data)
 
     def get_pasta_week_data(self) -> pd.DataFrame:
         """Retorna os dados de CYV Pasta do DB local por semana.
@@ -80,7 +81,7 @@ class ProtheusCYVController:
                 status_code=status.HTTP_404_NOT_FOUND, content={"message": "Data not found."}
             )
 
-        return JSONResponse(content=data.to_json(date_format="iso", orient="split"))
+        return data_response(data)
 
     def get_cart_entering_greenhouse(self) -> pd.DataFrame:
         """Retorna os dados de entrada de carrinhos na estufa do DB local.
@@ -97,4 +98,4 @@ class ProtheusCYVController:
                 status_code=status.HTTP_404_NOT_FOUND, content={"message": "Data not found."}
             )
 
-        return JSONResponse(content=data.to_json(date_format="iso", orient="split"))
+        return data_response(data)
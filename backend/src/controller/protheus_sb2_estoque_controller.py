@@ -5,6 +5,7 @@ from fastapi import status
 from fastapi.responses import JSONResponse
 
 # pylint: disable=import-error
+from src.helpers.responses import data_response
 from src.service.protheus_sb2_estoque_service import ProtheusSB2EstoqueService
 
 
@@ -22,4 +23,4 @@ class ProtheusSB2EstoqueController:
                 status_code=status.HTTP_404_NOT_FOUND, content={"message": "Data not found."}
             )
 
-        return JSONResponse(content=data.to_json(date_format="iso", orient="split"))
+        return data_response(data)
@@ -0,0 +1,140 @@
+"""
+Módulo com a leitura colunar (Arrow) dos resultados do SQL Server.
+
+O pd.read_sql monta todas as linhas como tuplas Python antes de criar o DataFrame. Aqui o cursor é
+lido em lotes (fetchmany) e cada lote é convertido imediatamente em um RecordBatch tipado, de forma
+que apenas um lote de objetos Python existe em memória por vez. O DataFrame final usa dtypes
+Arrow (pd.ArrowDtype).
+"""
+
+import datetime
+import decimal
+from os import getenv
+
+import pandas as pd
+import pyarrow as pa
+from dotenv import load_dotenv
+from sqlalchemy.engine import Connection as SAConnection
+
+# pylint: disable=import-error
+from src.database.query import Query
+
+load_dotenv()
+
+# Backend padrão de leitura: "pandas" (pd.read_sql) ou "arrow"
+FETCH_BACKEND = getenv("SQL_FETCH_BACKEND", "pandas").lower()
+FETCH_BATCH_SIZE = int(getenv("SQL_FETCH_BATCH_SIZE", "10000"))
+
+# Tipos Python informados pelo pyodbc em cursor.description -> tipos Arrow
+_ARROW_TYPES = {
+    str: pa.string(),
+    int: pa.int64(),
+    float: pa.float64(),
+    bool: pa.bool_(),
+    decimal.Decimal: pa.float64(),
+    datetime.date: pa.date32(),
+    datetime.datetime: pa.timestamp("us"),
+    datetime.time: pa.time64("us"),
+    bytes: pa.binary(),
+    bytearray: pa.binary(),
+}
+
+
+def _types(description) -> list[tuple[str, pa.DataType | None]]:
+    """Retorna o nome e o tipo Arrow de cada coluna a partir do cursor.description.
+
+    Tipos não informados pelo driver (None) são inferidos pelo Arrow a partir dos valores.
+    """
+    return [(column[0], _ARROW_TYPES.get(column[1])) for column in description]
+
+
+def _to_array(values: tuple, arrow_type: pa.DataType | None) -> pa.Array:
+    """Converte os valores de uma coluna do lote em um array Arrow tipado."""
+    # Decimal é convertido para float, como o coerce_float do pd.read_sql
+    if arrow_type is not None and pa.types.is_floating(arrow_type):
+        values = [None if value is None else float(value) for value in values]
+    return pa.array(values, type=arrow_type)
+
+
+def iter_record_batches(
+    conn: SAConnection, query: Query | str, batch_size: int = FETCH_BATCH_SIZE
+):
+    """
+    Executa a query e retorna os resultados em lotes de RecordBatch.
+
+    Args:
+        conn (Connection): Conexão do SQLAlchemy (emprestada do pool).
+        query (Query | str): Query nomeada com parâmetros ou SQL.
+        batch_size (int): Quantidade de linhas por lote.
+
+    Yields:
+        pa.RecordBatch: Cada lote. Se a consulta não retornar linhas, um único lote vazio com as
+        colunas da consulta.
+    """
+    # O SQLAlchemy executa (com os parâmetros) e os lotes são lidos direto do cursor do driver
+    if isinstance(query, Query):
+        result = conn.execute(query.statement, query.params)
+    else:
+        result = conn.exec_driver_sql(query)
+
+    try:
+        cursor = result.cursor
+        types = _types(cursor.description)
+        names = [name for name, _ in types]
+        empty = True
+
+        while rows := cursor.fetchmany(batch_size):
+            empty = False
+            arrays = [
+                _to_array(values, arrow_type) for values, (_, arrow_type) in zip(zip(*rows), types)
+            ]
+            yield pa.RecordBatch.from_arrays(arrays, names=names)
+
+        if empty:
+            schema = pa.schema([(name, arrow_type or pa.string()) for name, arrow_type in types])
+            yield pa.RecordBatch.from_pylist([], schema=schema)
+    finally:
+        result.close()
+
+
+def read_sql_arrow(
+    query: Query | str, conn: SAConnection, batch_size: int = FETCH_BATCH_SIZE
+) -> pd.DataFrame:
+    """
+    Lê o resultado da query em lotes Arrow e retorna um DataFrame com dtypes Arrow.
+
+    Usage:
+        >>> with connect(engine) as conn:
+        ...     df = read_sql_arrow(query, conn)
+    """
+    tables = [
+        pa.Table.from_batches([batch]) for batch in iter_record_batches(conn, query, batch_size)
+    ]
+
+    # Tipos inferidos (ex.: lote só com nulos) são unificados entre os lotes
+    table = pa.concat_tables(tables, promote_options="default")
+
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def read_sql(query: Query | str, conn: SAConnection, backend: str | None = None) -> pd.DataFrame:
+    """
+    Lê o resultado da query com o backend escolhido.
+
+    Args:
+        query (Query | str): Query nomeada com parâmetros ou SQL.
+        conn (Connection): Conexão do SQLAlchemy.
+        backend (str, optional): "pandas" ou "arrow". Padrão: SQL_FETCH_BACKEND do .env.
+    """
+    backend = (backend or FETCH_BACKEND).lower()
+
+    if backend == "arrow":
+        return read_sql_arrow(query, conn)
+
+    if backend != "pandas":
+        raise ValueError(f"Backend de leitura inválido: {backend}")
+
+    if isinstance(query, Query):
+        return pd.read_sql(query.statement, conn, params=query.params)
+
+    return pd.read_sql(query, conn)
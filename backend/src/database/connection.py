@@ -2,18 +2,172 @@
 Autor: Bruno Tomaz
 Data: 06/01/2024
 Módulo que contém a classe Connection. Responsável por criar a conexão com o banco de dados.
+
+As engines são mantidas em um registro único por processo (uma por banco de dados), com pool
+de conexões. Assim os modelos apenas emprestam conexões do pool em vez de criar e descartar
+uma engine a cada consulta.
 """
 
+import threading
+import time
 import urllib
+from dataclasses import dataclass, field
 from os import getenv
 
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
-
+from sqlalchemy import create_engine, event
 from sqlalchemy.engine import Engine
 
 load_dotenv()
 
+# Configuração do pool (pode ser sobrescrita pelo .env)
+POOL_SIZE = int(getenv("PYMSSQL_POOL_SIZE", "5"))
+POOL_MAX_OVERFLOW = int(getenv("PYMSSQL_POOL_MAX_OVERFLOW", "5"))
+POOL_TIMEOUT = int(getenv("PYMSSQL_POOL_TIMEOUT", "30"))
+POOL_RECYCLE = int(getenv("PYMSSQL_POOL_RECYCLE", "1800"))
+
+
+@dataclass
+class PoolMetrics:
+    """Métricas de uso do pool de conexões de uma engine."""
+
+    checkouts: int = 0
+    checkins: int = 0
+    connects: int = 0
+    invalidated: int = 0
+    wait_time_total: float = 0.0
+    wait_time_max: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record_wait(self, elapsed: float) -> None:
+        """Registra o tempo de espera de um checkout."""
+        with self._lock:
+            self.wait_time_total += elapsed
+            self.wait_time_max = max(self.wait_time_max, elapsed)
+
+    def as_dict(self) -> dict:
+        """Retorna as métricas em formato de dicionário."""
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "invalidated": self.invalidated,
+                "in_use": self.checkouts - self.checkins,
+                "wait_time_total": round(self.wait_time_total, 4),
+                "wait_time_avg": (
+                    round(self.wait_time_total / self.checkouts, 4) if self.checkouts else 0.0
+                ),
+                "wait_time_max": round(self.wait_time_max, 4),
+            }
+
+
+# Registro de engines por banco de dados
+_engines: dict[str, Engine] = {}
+_metrics: dict[int, PoolMetrics] = {}
+_registry_lock = threading.Lock()
+
+
+def _register_pool_events(engine: Engine, metrics: PoolMetrics) -> None:
+    """Registra os eventos do pool para coletar as métricas de uso."""
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(_dbapi_conn, _record):
+        with metrics._lock:  # pylint: disable=protected-access
+            metrics.connects += 1
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(_dbapi_conn, _record, _proxy):
+        with metrics._lock:  # pylint: disable=protected-access
+            metrics.checkouts += 1
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(_dbapi_conn, _record):
+        with metrics._lock:  # pylint: disable=protected-access
+            metrics.checkins += 1
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(_dbapi_conn, _record, _exception):
+        with metrics._lock:  # pylint: disable=protected-access
+            metrics.invalidated += 1
+
+
+def get_engine(name: str, url: str, on_create=None, **kwargs) -> Engine:
+    """
+    Retorna a engine registrada para o banco de dados, criando-a na primeira chamada.
+
+    Args:
+        name (str): Nome do banco de dados no registro.
+        url (str): URL de conexão do SQLAlchemy.
+        on_create (Callable[[Engine], None], optional): Chamada uma única vez com a engine
+            recém-criada, antes do primeiro uso (ex.: para registrar eventos).
+        **kwargs: Argumentos extras para o create_engine.
+
+    Returns:
+        Engine: Engine com pool de conexões compartilhada pelo processo.
+    """
+    engine = _engines.get(name)
+    if engine is not None:
+        return engine
+
+    with _registry_lock:
+        if name not in _engines:
+            engine = create_engine(
+                url,
+                pool_size=POOL_SIZE,
+                max_overflow=POOL_MAX_OVERFLOW,
+                pool_timeout=POOL_TIMEOUT,
+                pool_recycle=POOL_RECYCLE,
+                pool_pre_ping=True,
+                **kwargs,
+            )
+            metrics = PoolMetrics()
+            _register_pool_events(engine, metrics)
+            if on_create is not None:
+                on_create(engine)
+            _engines[name] = engine
+            _metrics[id(engine)] = metrics
+
+    return _engines[name]
+
+
+def connect(engine: Engine):
+    """
+    Empresta uma conexão do pool, registrando o tempo de espera pelo checkout.
+
+    Usage:
+        >>> with connect(engine) as conn:
+        ...     pd.read_sql(query, conn)
+    """
+    start = time.perf_counter()
+    conn = engine.connect()
+
+    metrics = _metrics.get(id(engine))
+    if metrics is not None:
+        metrics.record_wait(time.perf_counter() - start)
+
+    return conn
+
+
+def get_pool_metrics() -> dict[str, dict]:
+    """Retorna as métricas de todas as engines registradas."""
+    result = {}
+    for name, engine in _engines.items():
+        result[name] = {
+            **_metrics[id(engine)].as_dict(),
+            "pool_status": engine.pool.status(),
+        }
+    return result
+
+
+def dispose_engines() -> None:
+    """Descarta todas as engines registradas. Usado no encerramento da aplicação."""
+    with _registry_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+        _metrics.clear()
+
 
 class Connection:
     """
@@ -28,24 +182,26 @@ class Connection:
         self.__driver = "{ODBC Driver 17 for SQL Server}"
         self.__server = getenv("PYMSSQL_SERVER")
 
+    def __get_url(self, database: str) -> str:
+        """Monta a URL de conexão para o banco de dados informado."""
+        params = urllib.parse.quote_plus(
+            f"DRIVER={self.__driver};"
+            f"SERVER={self.__server};"
+            f"DATABASE={database};"
+            f"UID={self.__user};"
+            f"PWD={self.__password};"
+        )
+        return f"mssql+pyodbc:///?odbc_connect={params}"
+
     def get_connection_automacao(self) -> Engine:
         """
         Get connection
 
         Returns:
-            object: connection
+            Engine: engine compartilhada (com pool) do banco AUTOMACAO
         """
         try:
-            params = urllib.parse.quote_plus(
-                f"DRIVER={self.__driver};"
-                f"SERVER={self.__server};"
-                f"DATABASE={self.__database};"
-                f"UID={self.__user};"
-                f"PWD={self.__password};"
-            )
-            # pylint: disable=consider-using-f-string
-            conexao_automacao = create_engine("mssql+pyodbc:///?odbc_connect=%s" % params)
-            return conexao_automacao
+            return get_engine("automacao", self.__get_url(self.__database))
         # pylint: disable=broad-except
         except Exception as error:
             print(f"Error: {error}")
@@ -56,19 +212,11 @@ class Connection:
         Get connection
 
         Returns:
-            object: connection
+            Engine: engine compartilhada (com pool) do banco TOTVSDB
 
         """
         try:
-            params = urllib.parse.quote_plus(
-                f"DRIVER={self.__driver};"
-                f"SERVER={self.__server};"
-                f"DATABASE={self.__database_totvsdb};"
-                f"UID={self.__user};"
-                f"PWD={self.__password};"
-            )
-            conexao_totvsdb = create_engine(f"mssql+pyodbc:///?odbc_connect={params}", pool_size=2)
-            return conexao_totvsdb
+            return get_engine("totvsdb", self.__get_url(self.__database_totvsdb))
         # pylint: disable=broad-except
         except Exception as error:
             print(f"Error: {error}")
@@ -1,8 +1,72 @@
-""" Módulo para conexão com banco de dados SQLite3 """
+"""
+Módulo para conexão com banco de dados SQLite3
 
-from sqlalchemy import create_engine
+A engine do banco local é única por processo (registrada junto com as engines do SQL Server), com
+pool de conexões. O banco roda em modo WAL: a escrita das tabelas pelo scheduler não bloqueia as
+leituras das rotas /local, que continuam vendo a última versão confirmada das tabelas.
+"""
+
+from os import getenv
+
+from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# pylint: disable=import-error
+from src.database.connection import get_engine
 from src.helpers.paths import DB_LOCAL
 
+load_dotenv()
+
+# Pragmas do banco local (podem ser sobrescritos pelo .env)
+LOCAL_CACHE_SIZE_MB = int(getenv("LOCAL_DB_CACHE_SIZE_MB", "64"))
+LOCAL_MMAP_SIZE_MB = int(getenv("LOCAL_DB_MMAP_SIZE_MB", "256"))
+LOCAL_BUSY_TIMEOUT = int(getenv("LOCAL_DB_BUSY_TIMEOUT", "30"))
+
+PRAGMAS = {
+    # Leitores e escritor simultâneos
+    "journal_mode": "WAL",
+    # Em WAL, NORMAL é seguro contra corrupção e evita um fsync a cada commit
+    "synchronous": "NORMAL",
+    # Valor negativo: tamanho em KB
+    "cache_size": -LOCAL_CACHE_SIZE_MB * 1024,
+    "mmap_size": LOCAL_MMAP_SIZE_MB * 1024**2,
+    "temp_store": "MEMORY",
+    "busy_timeout": LOCAL_BUSY_TIMEOUT * 1000,
+}
+
+
+def _register_sqlite_events(engine: Engine) -> None:
+    """
+    Configura as conexões SQLite da engine.
+
+    Aplica os pragmas em cada nova conexão e faz o SQLAlchemy controlar o início das transações
+    (o driver sqlite3 não emite BEGIN antes de DDL, o que deixaria DROP/CREATE/ALTER fora da
+    transação).
+    """
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, _record):
+        dbapi_conn.isolation_level = None
+        cursor = dbapi_conn.cursor()
+        for pragma, value in PRAGMAS.items():
+            cursor.execute(f"PRAGMA {pragma} = {value}")
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def _on_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+
+def get_local_engine() -> Engine:
+    """Retorna a engine (com pool) do banco de dados local, compartilhada pelo processo."""
+    return get_engine(
+        "local",
+        f"sqlite:///{DB_LOCAL}",
+        on_create=_register_sqlite_events,
+        connect_args={"check_same_thread": False, "timeout": LOCAL_BUSY_TIMEOUT},
+    )
+
 
 class ConnectionLocal:
     """Obtém a conexão com o banco de dados local.
@@ -11,18 +75,19 @@ class ConnectionLocal:
     """
 
     def __init__(self):
-        self._engine = create_engine(f"sqlite:///{DB_LOCAL}")
+        self._engine = get_local_engine()
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self._engine.dispose()
+        # A engine é compartilhada pelo processo e não é descartada aqui
+        pass
 
     def get_session(self):
-        """Retorna a sessão atual do banco de dados local.
+        """Retorna a engine compartilhada do banco de dados local.
 
         Retorna:
-            sqlalchemy.orm.session.Session: A sessão do banco de dados local.
+            sqlalchemy.engine.Engine: A engine do banco de dados local.
         """
         return self._engine
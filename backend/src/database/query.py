@@ -0,0 +1,288 @@
+"""
+Módulo com o construtor de queries parametrizadas.
+
+As queries são identificadas por nome e os valores (datas, recno...) são enviados como parâmetros
+(bind) em vez de interpolados no texto. Assim o texto do SQL é sempre o mesmo para cada query, o
+SQL Server reaproveita o plano de execução em cache e o statement preparado pelo driver, e o tempo
+de cada query pode ser acompanhado pelo nome.
+"""
+
+import base64
+import binascii
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import TextClause, text
+
+
+@dataclass(frozen=True)
+class Query:
+    """Query SQL nomeada com parâmetros."""
+
+    name: str
+    sql: str
+    params: dict = field(default_factory=dict)
+
+    @property
+    def statement(self) -> TextClause:
+        """Statement do SQLAlchemy, reaproveitado para o mesmo texto de SQL."""
+        return _statement(self.sql)
+
+
+@lru_cache(maxsize=256)
+def _statement(sql: str) -> TextClause:
+    """Cria (uma única vez) o TextClause para o texto de SQL."""
+    return text(sql)
+
+
+def period_filter(column: str, period: tuple, date_format: str = "%Y-%m-%d") -> tuple[str, dict]:
+    """
+    Cria o filtro de período com parâmetros.
+
+    Mantém a regra usada nas consultas: com datas diferentes usa BETWEEN, com a mesma data
+    retorna tudo a partir dela.
+
+    Args:
+        column (str): Coluna de data.
+        period (tuple): Data de início e de fim.
+        date_format (str): Formato das datas enviado ao banco.
+
+    Returns:
+        tuple[str, dict]: Cláusula (sem WHERE) e parâmetros.
+    """
+    first_day, last_day = period
+    first_day = pd.to_datetime(first_day).strftime(date_format)
+    last_day = pd.to_datetime(last_day).strftime(date_format)
+
+    if first_day != last_day:
+        return f"{column} BETWEEN :first_day AND :last_day", {
+            "first_day": first_day,
+            "last_day": last_day,
+        }
+    return f"{column} >= :first_day", {"first_day": first_day}
+
+
+# =================================================================== Filtros Das Tabelas De Dados #
+# Colunas que podem ser filtradas por lista de valores nas rotas de dados
+FILTER_COLUMNS = ("linha", "turno", "fabrica", "maquina_id")
+
+
+@dataclass(frozen=True)
+class TableQuery:
+    """
+    Filtro, projeção e paginação pedidos nas rotas de dados (/local e /machine).
+
+    O período é inclusivo nas duas pontas (data_registro entre start e end). A paginação é por
+    cursor (keyset): o cursor identifica a última linha da página anterior na ordem de leitura.
+    """
+
+    start: str | None = None
+    end: str | None = None
+    linha: tuple[int, ...] = ()
+    turno: tuple[str, ...] = ()
+    fabrica: tuple[int, ...] = ()
+    maquina_id: tuple[str, ...] = ()
+    columns: tuple[str, ...] = ()
+    limit: int | None = None
+    cursor: str | None = None
+
+    @property
+    def filters(self) -> dict[str, tuple]:
+        """Filtros por lista de valores informados (coluna: valores)."""
+        return {column: getattr(self, column) for column in FILTER_COLUMNS if getattr(self, column)}
+
+    @property
+    def is_empty(self) -> bool:
+        """Verdadeiro se nenhum filtro, projeção ou paginação foi pedido."""
+        return self == TableQuery()
+
+    def where(self, date_column: str = "data_registro") -> tuple[list[str], dict]:
+        """
+        Cria as cláusulas do filtro com parâmetros.
+
+        Returns:
+            tuple[list[str], dict]: Cláusulas (a serem unidas com AND) e parâmetros.
+        """
+        clauses, params = [], {}
+
+        for name, operator in (("start", ">="), ("end", "<=")):
+            value = getattr(self, name)
+            if value is not None:
+                clauses.append(f'"{date_column}" {operator} :{name}')
+                params[name] = pd.to_datetime(value).strftime("%Y-%m-%d")
+
+        for column, values in self.filters.items():
+            keys = [f"{column}_{position}" for position in range(len(values))]
+            clauses.append(f'"{column}" IN ({", ".join(f":{key}" for key in keys)})')
+            params |= dict(zip(keys, values))
+
+        return clauses, params
+
+    def filter_frame(self, df: pd.DataFrame, date_column: str = "data_registro") -> pd.DataFrame:
+        """
+        Aplica o filtro e a projeção a um DataFrame (dados que não vêm de uma tabela local).
+
+        Raises:
+            ValueError: Se uma coluna filtrada ou pedida não existir nos dados.
+        """
+        check_columns([*self.filters, *self.columns], df.columns)
+
+        mask = self.__period_mask(df, date_column)
+
+        for column, values in self.filters.items():
+            mask &= df[column].isin(values).to_numpy()
+
+        df = df[mask]
+        if self.columns:
+            df = df[list(self.columns)]
+
+        return df.reset_index(drop=True)
+
+    def cursor_filter(self, columns: list[str], keys: list[str]) -> tuple[list[str], dict]:
+        """
+        Cria a cláusula que seleciona as linhas depois do cursor, na ordem das colunas.
+
+        Args:
+            columns (list[str]): Colunas da ordem de leitura (a última nunca é nula, ex.: rowid).
+            keys (list[str]): Nomes dos parâmetros dos valores do cursor, um por coluna.
+
+        Returns:
+            tuple[list[str], dict]: Cláusula (nenhuma sem cursor) e parâmetros.
+
+        Raises:
+            ValueError: Se o cursor for inválido.
+        """
+        if self.cursor is None:
+            return [], {}
+
+        values = decode_cursor(self.cursor)
+        if len(values) != len(columns):
+            raise ValueError("Cursor inválido")
+
+        return [keyset_clause(columns, keys, values)], dict(zip(keys, values))
+
+    def __period_mask(self, df: pd.DataFrame, date_column: str) -> np.ndarray:
+        """Linhas com a data dentro do período (todas se ele não foi informado)."""
+        mask = np.ones(len(df), dtype=bool)
+        if self.start is None and self.end is None:
+            return mask
+
+        dates = pd.to_datetime(df[date_column]).dt.normalize()
+        start = pd.to_datetime(self.start) if self.start is not None else dates.min()
+        end = pd.to_datetime(self.end) if self.end is not None else dates.max()
+
+        return mask & dates.between(start, end).to_numpy()
+
+
+def check_columns(columns: list[str], existing) -> None:
+    """Verifica se as colunas existem (ValueError com as que não existem)."""
+    unknown = [column for column in columns if column not in set(existing)]
+    if unknown:
+        raise ValueError(f"Colunas inexistentes: {', '.join(unknown)}")
+
+
+def keyset_clause(columns: list[str], keys: list[str], values: list) -> str:
+    """
+    Cláusula das linhas que vêm depois dos valores do cursor na ordem (crescente) das colunas.
+
+    Equivale a (colunas) > (valores), mas considera os nulos, que o SQLite ordena antes dos
+    demais valores e que a comparação com > descartaria: depois de um valor nulo vem qualquer
+    valor não nulo, e depois de um valor não nulo nenhum nulo.
+    """
+    alternatives = []
+
+    for position, (column, key, value) in enumerate(zip(columns, keys, values)):
+        equal = [f"{previous} IS :{name}" for previous, name in zip(columns, keys[:position])]
+        after = f"{column} IS NOT NULL" if value is None else f"{column} > :{key}"
+        alternatives.append(f"({' AND '.join([*equal, after])})")
+
+    return f"({' OR '.join(alternatives)})"
+
+
+def encode_cursor(values: list) -> str:
+    """Codifica os valores da última linha de uma página no cursor da próxima."""
+    values = [value.item() if isinstance(value, np.generic) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(values).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> list:
+    """Decodifica o cursor (ValueError se ele for inválido)."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (UnicodeError, binascii.Error, json.JSONDecodeError) as error:
+        raise ValueError("Cursor inválido") from error
+
+    if not isinstance(values, list):
+        raise ValueError("Cursor inválido")
+
+    return values
+
+
+# ================================================================================= Métricas #
+@dataclass
+class QueryMetrics:
+    """Métricas de execução de uma query nomeada."""
+
+    calls: int = 0
+    errors: int = 0
+    rows: int = 0
+    time_total: float = 0.0
+    time_max: float = 0.0
+    time_last: float = 0.0
+
+    def as_dict(self) -> dict:
+        """Retorna as métricas em formato de dicionário."""
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "rows": self.rows,
+            "time_total": round(self.time_total, 4),
+            "time_avg": round(self.time_total / self.calls, 4) if self.calls else 0.0,
+            "time_max": round(self.time_max, 4),
+            "time_last": round(self.time_last, 4),
+        }
+
+
+_metrics: dict[str, QueryMetrics] = {}
+_metrics_lock = threading.Lock()
+
+
+@contextmanager
+def timed(name: str):
+    """
+    Mede o tempo de execução da query nomeada.
+
+    Usage:
+        >>> with timed("maquina_info.get_data") as result:
+        ...     result["rows"] = len(df)
+    """
+    result = {"rows": 0}
+    start = time.perf_counter()
+    error = False
+    try:
+        yield result
+    except Exception:
+        error = True
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        with _metrics_lock:
+            metrics = _metrics.setdefault(name, QueryMetrics())
+            metrics.calls += 1
+            metrics.errors += int(error)
+            metrics.rows += result["rows"]
+            metrics.time_total += elapsed
+            metrics.time_max = max(metrics.time_max, elapsed)
+            metrics.time_last = elapsed
+
+
+def get_query_metrics() -> dict[str, dict]:
+    """Retorna as métricas de todas as queries nomeadas."""
+    with _metrics_lock:
+        return {name: metrics.as_dict() for name, metrics in sorted(_metrics.items())}
@@ -2,6 +2,7 @@
 
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
 
 
@@ -44,3 +45,83 @@ def get_date():
     datetime: A data atual.
     """
     return pd.Timestamp("today")
+
+
+# ================================================================================= Hora Tipada #
+def time_to_timedelta(hora: pd.Series) -> pd.Series:
+    """
+    Converte a hora de registro para timedelta64 (tempo desde a meia-noite).
+
+    Aceita datetime.time (inclusive em colunas Arrow), texto "HH:MM:SS[.ffffff]", datetime64 e
+    timedelta64, sem passar pelo texto quando a hora já é um objeto time.
+
+    Parâmetros:
+    hora (pd.Series): A hora de registro.
+
+    Retorna:
+    pd.Series: A hora como timedelta64 (NaT onde a hora é nula).
+    """
+    if pd.api.types.is_timedelta64_dtype(hora):
+        return hora
+
+    if pd.api.types.is_datetime64_any_dtype(hora):
+        return hora - hora.dt.normalize()
+
+    values = hora[hora.notna()]
+
+    try:
+        microseconds = np.fromiter(
+            (
+                (value.hour * 3600 + value.minute * 60 + value.second) * 1_000_000
+                + value.microsecond
+                for value in values
+            ),
+            dtype=np.int64,
+            count=len(values),
+        )
+        delta = pd.to_timedelta(microseconds, unit="us")
+    # Texto
+    except AttributeError:
+        delta = pd.to_timedelta(values.astype(str))
+
+    return pd.Series(delta, index=values.index).reindex(hora.index)
+
+
+def timedelta_to_time(delta: pd.Series) -> pd.Series:
+    """
+    Converte a hora em timedelta64 para datetime.time, formato usado nas saídas.
+
+    Parâmetros:
+    delta (pd.Series): A hora como timedelta64.
+
+    Retorna:
+    pd.Series: A hora como datetime.time.
+    """
+    return (pd.Timestamp(0) + delta).dt.time
+
+
+def combine_date_time(data: pd.Series, hora: pd.Series) -> pd.Series:
+    """
+    Retorna a data e hora (datetime64) a partir da data e da hora de registro.
+
+    Parâmetros:
+    data (pd.Series): A data de registro.
+    hora (pd.Series): A hora de registro (em qualquer formato aceito por time_to_timedelta).
+
+    Retorna:
+    pd.Series: A data e hora de registro.
+    """
+    return pd.to_datetime(data) + time_to_timedelta(hora)
+
+
+def get_hour(hora: pd.Series) -> pd.Series:
+    """
+    Retorna a hora cheia (0 a 23) da hora de registro.
+
+    Parâmetros:
+    hora (pd.Series): A hora de registro (em qualquer formato aceito por time_to_timedelta).
+
+    Retorna:
+    pd.Series: A hora cheia.
+    """
+    return time_to_timedelta(hora) // pd.Timedelta(hours=1)
@@ -1,11 +1,20 @@
 """ Fonções que rodam em background, de forma agendada. """
 
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import pandas as pd
 from src.functions import date_f
 from src.functions import history_functions as hist_f
-from src.helpers.variables import IndicatorType
+from src.helpers.variables import (
+    HISTORY_BACKFILL_WORKERS,
+    INCREMENTAL_INFO_IHM_JOIN,
+    INCREMENTAL_INGESTION,
+    IndicatorType,
+    RawSource,
+)
 from src.service.action_plan_service import ActionPlanService
 from src.service.efficiency_service import EfficiencyService
 from src.service.functions.ind_prod import IndProd
@@ -19,6 +28,7 @@ from src.service.maquina_qualidade_service import MaquinaQualidadeService
 from src.service.performance_service import PerformanceService
 from src.service.production_service import ProductionService
 from src.service.protheus_sb1_produtos_service import ProtheusSB1ProdutosService
+from src.service.raw_ingestion_service import RawIngestionService
 from src.service.reparo_service import ReparoService
 
 maquina_ihm_service = MaquinaIHMService()
@@ -35,6 +45,8 @@ historic_ind_service = HistoricIndService()
 prod_qualid_join = ProdQualidJoin()
 ind_production = IndProd()
 action_plan_service = ActionPlanService()
+raw_ingestion_service = RawIngestionService()
+info_ihm_join = InfoIHMJoin()
 
 # Configura o logging
 logging.basicConfig(level=logging.ERROR)
@@ -44,6 +56,35 @@ logger = logging.getLogger(__name__)
 pd.set_option("future.no_silent_downcast", True)
 
 
+# ============================================================== Ingestão Incremental Do AUTOMACAO #
+def sync_raw_data() -> None:
+    """Acrescenta nas cópias locais os registros do AUTOMACAO posteriores ao último watermark."""
+
+    if not INCREMENTAL_INGESTION:
+        return
+
+    for source in RawSource:
+        try:
+            raw_ingestion_service.sync(source)
+        # pylint: disable=w0718
+        except Exception as e:
+            logger.error("Erro ao sincronizar %s: %s", source.value, e, exc_info=True)
+
+
+def reconcile_raw_data() -> None:
+    """Substitui os últimos dias das cópias locais, cobrindo registros corrigidos ou atrasados."""
+
+    if not INCREMENTAL_INGESTION:
+        return
+
+    for source in RawSource:
+        try:
+            raw_ingestion_service.reconcile(source)
+        # pylint: disable=w0718
+        except Exception as e:
+            logger.error("Erro ao reconciliar %s: %s", source.value, e, exc_info=True)
+
+
 # ======================================================================= Produção Do Mês Corrente #
 def create_production_data() -> None:
     """Cria os dados de produção do mês corrente e salva no banco de dados local."""
@@ -61,8 +102,10 @@ def create_production_data() -> None:
         start_31 = start_31.strftime("%Y-%m-%d")
 
         # Obter os dados da máquina Info e Qualidade
-        prod = maquina_info_service.get_production_data((start_31, end))
-        qual = maquina_qualidade_service.get_data((start_31, end))
+        prod = maquina_info_service.get_production_data(
+            (start_31, end), local=INCREMENTAL_INGESTION
+        )
+        qual = maquina_qualidade_service.get_data((start_31, end), local=INCREMENTAL_INGESTION)
 
         # Receber os produtos do protheus
         products_data = protheus_sb1_produtos_service.get_data()
@@ -70,8 +113,9 @@ def create_production_data() -> None:
         # Juntar os dados de produção com os dados de qualidade e info
         data = prod_qualid_join.join_data(qual, prod, products_data)
 
-        # Salva no banco de dados local
-        production_service.replace_data(data)
+        # Salva no banco de dados local, regravando apenas as partições alteradas
+        report = production_service.upsert_data(data)
+        logger.info("Produção atualizada: %s", report)
 
     except (ValueError, KeyError, TypeError) as e:
         logger.error("Erro ao criar dados de produção: %s", e)
@@ -96,16 +140,19 @@ def create_maq_ihm_info_data() -> None:
         start_31 = today - pd.DateOffset(days=31)
 
         # Obter os dados da máquina Info e Qualidade
-        maq_ihm = maquina_ihm_service.get_data((start_31, end))
-        maq_info = maquina_info_service.get_data((start_31, end))
-
-        info_ihm_join = InfoIHMJoin(maq_ihm, maq_info)
-
-        # Unir os dados de maquina IHM e info
-        data = info_ihm_join.join_data()
-
-        # Salva no banco de dados local
-        info_ihm_service.replace_data(data)
+        maq_ihm = maquina_ihm_service.get_data((start_31, end), local=INCREMENTAL_INGESTION)
+        maq_info = maquina_info_service.get_data((start_31, end), local=INCREMENTAL_INGESTION)
+
+        # Unir os dados de maquina IHM e info (no modo incremental, apenas o final de cada linha é
+        # reprocessado)
+        if INCREMENTAL_INFO_IHM_JOIN:
+            data = info_ihm_join.update(maq_ihm, maq_info)
+        else:
+            data = InfoIHMJoin(maq_ihm, maq_info).join_data()
+
+        # Salva no banco de dados local, regravando apenas as partições alteradas
+        report = info_ihm_service.upsert_data(data)
+        logger.info("Info/IHM atualizada: %s", report)
     except (ValueError, KeyError, TypeError) as e:
         logger.error("Erro ao criar dados de maquina IHM e Info: %s", e)
     # pylint: disable=w0718
@@ -125,16 +172,18 @@ def create_ind_prod() -> None:
         df_info_ihm = info_ihm_service.get_data()
 
         # Criar os indicadores de produção
-        df_eff = ind_production.get_indicators(df_info_ihm, df_production, IndicatorType.EFFICIENCY)
-        df_perf = ind_production.get_indicators(
-            df_info_ihm, df_production, IndicatorType.PERFORMANCE
-        )
-        df_repair = ind_production.get_indicators(df_info_ihm, df_production, IndicatorType.REPAIR)
-
-        # Salvar os indicadores no banco de dados local
-        eff_service.replace_data(df_eff)
-        perf_service.replace_data(df_perf)
-        reparo_service.replace_data(df_repair)
+        indicators = ind_production.get_all_indicators(df_info_ihm, df_production)
+        df_eff = indicators[IndicatorType.EFFICIENCY]
+        df_perf = indicators[IndicatorType.PERFORMANCE]
+        df_repair = indicators[IndicatorType.REPAIR]
+
+        # Salvar os indicadores no banco de dados local, regravando apenas as partições alteradas
+        report = {
+            "eficiencia": eff_service.upsert_data(df_eff),
+            "performance": perf_service.upsert_data(df_perf),
+            "reparo": reparo_service.upsert_data(df_repair),
+        }
+        logger.info("Indicadores atualizados: %s", report)
     except (ValueError, KeyError, TypeError) as e:
         logger.error("Erro ao criar indicadores de produção: %s", e)
     # pylint: disable=w0718
@@ -143,54 +192,147 @@ def create_ind_prod() -> None:
 
 
 # =========================================================== Criação Do Histórico Dos Indicadores #
+# Meses do histórico em criação (evita que o job agendado e um backfill criem o mesmo mês)
+_building_months: set[str] = set()
+_building_lock = threading.Lock()
+
+
 def create_ind_history() -> None:
-    """Cria o histórico de indicadores de produção e salva no banco de dados local."""
+    """Cria o histórico de indicadores do mês anterior, se ainda não estiver no banco local."""
     try:
-        # Obter as datas
-        start, end = date_f.get_first_and_last_day_of_last_month()
+        start, _ = date_f.get_first_and_last_day_of_last_month()
         month = start.strftime("%Y-%m")
-        start = start.strftime("%Y-%m-%d")
-        end = end.strftime("%Y-%m-%d")
 
-        # Obter os dados de maquina info/ihm
-        maq_ihm = maquina_ihm_service.get_data((start, end))
-        maq_info = maquina_info_service.get_data((start, end))
+        # Verifica antes de consultar o AUTOMACAO, evitando refazer um mês já criado a cada hora
+        if month in historic_ind_service.get_months():
+            return
 
-        info_ihm_join = InfoIHMJoin(maq_ihm, maq_info)
+        build_ind_history(month)
+    except (ValueError, KeyError, TypeError) as e:
+        logger.error("Erro ao criar histórico de indicadores: %s", e)
+    # pylint: disable=w0718
+    except Exception as e:
+        logger.error("Erro inesperado ao criar histórico de indicadores: %s", e, exc_info=True)
 
-        # Unir os dados de maquina IHM e info
-        df_info_ihm = info_ihm_join.join_data()
 
-        # Obter os dados da máquina Info e Qualidade
-        prod = maquina_info_service.get_production_data((start, end))
-        qual = maquina_qualidade_service.get_data((start, end))
+def backfill_ind_history(months: list[str], force: bool = False) -> dict[str, str]:
+    """
+    Cria, em paralelo, o histórico de indicadores dos meses informados.
 
-        # Receber os produtos do protheus
-        products_data = protheus_sb1_produtos_service.get_data()
+    Args:
+        months (list[str]): Meses (AAAA-MM) a serem criados. Apenas meses já encerrados.
+        force (bool): Recria os meses que já estão no histórico.
 
-        # Juntar os dados de produção com os dados de qualidade e info
-        df_prod = prod_qualid_join.join_data(qual, prod, products_data)
+    Returns:
+        dict[str, str]: Status de cada mês (criado, existente, sem_dados, em_andamento, erro
+        ou mes_aberto).
+    """
+    current = pd.Period(date_f.get_date(), "M")
+    months = sorted({str(pd.Period(month, "M")) for month in months})
+    stored = set() if force else historic_ind_service.get_months()
 
-        # Criar os indicadores de produção
-        df_eff = ind_production.get_indicators(df_info_ihm, df_prod, IndicatorType.EFFICIENCY)
-        df_perf = ind_production.get_indicators(df_info_ihm, df_prod, IndicatorType.PERFORMANCE)
-        df_repair = ind_production.get_indicators(df_info_ihm, df_prod, IndicatorType.REPAIR)
+    status = {month: "mes_aberto" for month in months if pd.Period(month, "M") >= current}
+    status |= {month: "existente" for month in months if month in stored}
+    pending = [month for month in months if month not in status]
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=HISTORY_BACKFILL_WORKERS) as pool:
+            status |= dict(zip(pending, pool.map(build_ind_history, pending)))
+
+    return dict(sorted(status.items()))
+
+
+def build_ind_history(month: str) -> str:
+    """
+    Cria o histórico de indicadores de um mês e registra a duração da execução.
+
+    O mês é substituído no histórico, de forma que recriar um mês não duplica a linha.
+
+    Args:
+        month (str): Mês (AAAA-MM).
 
-        # Atualiza ou cria o histórico de indicadores no banco de dados local
-        historic_data = historic_ind_service.get_data()
+    Returns:
+        str: Status da execução (criado, sem_dados, em_andamento ou erro).
+    """
+    with _building_lock:
+        if month in _building_months:
+            return "em_andamento"
+        _building_months.add(month)
 
-        # Verifica se o mês já está no histórico, se não atualiza ou cria os dados
-        if month not in historic_data.data_registro.values:
-            # Cria o histórico de indicadores
-            df_history = hist_f.create_hist_ind(df_info_ihm, df_prod, df_eff, df_perf, df_repair)
+    started_at = pd.Timestamp("now")
+    begin = time.perf_counter()
+    status = "erro"
 
-            # Salva no banco de dados local
-            historic_ind_service.insert_data(df_history)
+    try:
+        status = _create_month(month)
     except (ValueError, KeyError, TypeError) as e:
-        logger.error("Erro ao criar histórico de indicadores: %s", e)
+        logger.error("Erro ao criar histórico de indicadores de %s: %s", month, e)
     # pylint: disable=w0718
     except Exception as e:
-        logger.error("Erro inesperado ao criar histórico de indicadores: %s", e, exc_info=True)
+        logger.error(
+            "Erro inesperado ao criar histórico de indicadores de %s: %s", month, e, exc_info=True
+        )
+    finally:
+        _record_build(month, status, started_at, round(time.perf_counter() - begin, 3))
+
+    return status
+
+
+def _create_month(month: str) -> str:
+    """Cria o histórico de indicadores do mês (criado ou sem_dados)."""
+    period = pd.Period(month, "M")
+    start = period.start_time.strftime("%Y-%m-%d")
+    end = period.end_time.strftime("%Y-%m-%d")
+
+    # Obter os dados de maquina info/ihm
+    maq_ihm = maquina_ihm_service.get_data((start, end))
+    maq_info = maquina_info_service.get_data((start, end))
+
+    # Unir os dados de maquina IHM e info
+    df_info_ihm = InfoIHMJoin(maq_ihm, maq_info).join_data()
+
+    # Obter os dados da máquina Info e Qualidade
+    prod = maquina_info_service.get_production_data((start, end))
+    qual = maquina_qualidade_service.get_data((start, end))
+
+    if prod is None or prod.empty:
+        return "sem_dados"
+
+    # Receber os produtos do protheus
+    products_data = protheus_sb1_produtos_service.get_data()
+
+    # Juntar os dados de produção com os dados de qualidade e info
+    df_prod = prod_qualid_join.join_data(qual, prod, products_data)
+
+    # Criar os indicadores de produção
+    indicators = ind_production.get_all_indicators(df_info_ihm, df_prod)
+    df_eff = indicators[IndicatorType.EFFICIENCY]
+    df_perf = indicators[IndicatorType.PERFORMANCE]
+    df_repair = indicators[IndicatorType.REPAIR]
+
+    # Cria o histórico de indicadores e salva no banco de dados local
+    df_history = hist_f.create_hist_ind(df_info_ihm, df_prod, df_eff, df_perf, df_repair)
+    historic_ind_service.replace_month(df_history, month)
+
+    return "criado"
+
+
+def _record_build(month: str, status: str, started_at: pd.Timestamp, duration: float) -> None:
+    """Registra o status e a duração da criação do mês e o libera para uma nova execução."""
+    historic_ind_service.insert_build(
+        pd.DataFrame(
+            {
+                "data_registro": [month],
+                "iniciado_em": [started_at],
+                "duracao": [duration],
+                "status": [status],
+            }
+        )
+    )
+    logger.info("Histórico de indicadores de %s: %s em %.1f s", month, status, duration)
+
+    with _building_lock:
+        _building_months.discard(month)
 
 
 def update_action_plan() -> None:
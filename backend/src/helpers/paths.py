@@ -11,3 +11,9 @@ DB_DIR = os.path.join(PARENT_DIR, "database")  # backend/src/database
 
 # Arquivos de dados
 DB_LOCAL = os.path.join(DB_DIR, "automacao_local.db")
+
+# Snapshots colunares (Arrow IPC) das tabelas derivadas
+SNAPSHOT_DIR = os.path.join(DB_DIR, "snapshots")
+
+# Cache por dia dos dados brutos do AUTOMACAO
+RAW_CACHE_DIR = os.path.join(DB_DIR, "raw_cache")
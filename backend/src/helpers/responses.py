@@ -0,0 +1,284 @@
+"""
+Módulo com as respostas das rotas que retornam DataFrames (orient="split").
+
+Na versão 1 do payload o DataFrame é convertido para texto JSON e esse texto é novamente
+codificado como string JSON pelo JSONResponse: o cliente precisa decodificar duas vezes e o
+payload carrega o escape de todas as aspas. A partir da versão 2 o JSON do DataFrame é escrito
+diretamente no corpo da resposta, pelo encoder do pandas, sem a segunda codificação.
+
+O cliente escolhe a versão pelo cabeçalho X-Payload-Version da requisição (sem o cabeçalho, a
+versão 1 é mantida para os clientes antigos) e a resposta informa a versão usada no mesmo
+cabeçalho.
+
+Pelo cabeçalho Accept o cliente pode pedir os dados em formato colunar binário, Arrow IPC
+(application/vnd.apache.arrow.stream) ou Parquet (application/x-parquet), que preservam os tipos
+(datas, inteiros, category) sem serialização em texto.
+
+As rotas das tabelas locais informam a versão do conteúdo da tabela no ETag. O cliente que envia
+o ETag recebido em If-None-Match recebe 304 Not Modified, sem corpo, enquanto a tabela não muda.
+Nas consultas paginadas, o cursor da próxima página vai no cabeçalho X-Next-Cursor.
+
+As rotas /local/{tabela}/changes retornam apenas as partições alteradas e removidas desde a versão
+(ETag) que o cliente tem em cache, para que ele as aplique ao DataFrame que já possui.
+"""
+
+import json
+from contextvars import ContextVar
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+PAYLOAD_VERSION_HEADER = "X-Payload-Version"
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+PAYLOAD_VERSIONS = (1, 2)
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+PARQUET_MEDIA_TYPE = "application/x-parquet"
+
+# Cabeçalhos da requisição em andamento (definidos pelo NegotiationMiddleware)
+_payload_version: ContextVar[int] = ContextVar("payload_version", default=PAYLOAD_VERSIONS[0])
+_accept: ContextVar[str] = ContextVar("accept", default="")
+_if_none_match: ContextVar[str] = ContextVar("if_none_match", default="")
+
+
+class SplitJSONResponse(Response):
+    """Resposta com o DataFrame em JSON (orient="split") escrito diretamente no corpo."""
+
+    media_type = "application/json"
+
+    def render(self, content: pd.DataFrame) -> bytes:
+        return content.to_json(date_format="iso", orient="split", force_ascii=False).encode(
+            "utf-8"
+        )
+
+
+class ChangesJSONResponse(Response):
+    """
+    Resposta com as mudanças de uma tabela em JSON.
+
+    As linhas (data) são escritas no corpo pelo encoder do pandas (orient="split"), como na
+    SplitJSONResponse, e os demais campos pelo json.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: dict) -> bytes:
+        data = content["data"]
+        rows = (
+            "null"
+            if data is None
+            else data.to_json(date_format="iso", orient="split", force_ascii=False)
+        )
+        fields = json.dumps(
+            {key: value for key, value in content.items() if key != "data"},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+
+        return f'{fields[:-1]},"data":{rows}}}'.encode("utf-8")
+
+
+class ArrowStreamResponse(Response):
+    """Resposta com a tabela Arrow no formato IPC de streaming."""
+
+    media_type = ARROW_STREAM_MEDIA_TYPE
+
+    def render(self, content: pa.Table) -> bytes:
+        sink = pa.BufferOutputStream()
+
+        with pa.ipc.new_stream(sink, content.schema) as writer:
+            writer.write_table(content)
+
+        return sink.getvalue().to_pybytes()
+
+
+class ParquetResponse(Response):
+    """Resposta com a tabela Arrow em um arquivo Parquet."""
+
+    media_type = PARQUET_MEDIA_TYPE
+
+    def render(self, content: pa.Table) -> bytes:
+        sink = pa.BufferOutputStream()
+        pq.write_table(content, sink)
+
+        return sink.getvalue().to_pybytes()
+
+
+# Respostas colunares por tipo de mídia
+COLUMNAR_RESPONSES = {
+    ARROW_STREAM_MEDIA_TYPE: ArrowStreamResponse,
+    PARQUET_MEDIA_TYPE: ParquetResponse,
+}
+
+
+class NegotiationMiddleware:
+    """Middleware ASGI que lê a versão do payload, os tipos aceitos e o If-None-Match."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        header = PAYLOAD_VERSION_HEADER.lower().encode("latin-1")
+        value = headers.get(header, b"").decode("latin-1").strip()
+        version = int(value) if value.isdigit() else PAYLOAD_VERSIONS[0]
+
+        # Versões desconhecidas recebem a maior versão suportada que não as ultrapasse
+        token = _payload_version.set(
+            max((v for v in PAYLOAD_VERSIONS if v <= version), default=PAYLOAD_VERSIONS[0])
+        )
+        accept_token = _accept.set(headers.get(b"accept", b"").decode("latin-1"))
+        match_token = _if_none_match.set(headers.get(b"if-none-match", b"").decode("latin-1"))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _payload_version.reset(token)
+            _accept.reset(accept_token)
+            _if_none_match.reset(match_token)
+
+
+def entity_tag(version: int | None) -> str | None:
+    """
+    Retorna o ETag da versão do conteúdo de uma tabela (None se não houver versão).
+
+    O ETag é fraco: as representações (JSON, Arrow, Parquet) da mesma versão são equivalentes.
+    """
+    return None if version is None else f'W/"{version}"'
+
+
+def not_modified(etag: str | None) -> Response | None:
+    """
+    Retorna 304 Not Modified se o If-None-Match da requisição contém o ETag (None se não).
+
+    Args:
+        etag (str | None): ETag da versão atual dos dados.
+
+    Returns:
+        Response | None: Resposta 304, sem corpo, ou None se os dados devem ser enviados.
+    """
+    if etag is None:
+        return None
+
+    tags = {tag.strip().removeprefix("W/") for tag in _if_none_match.get().split(",")}
+    if "*" not in tags and etag.removeprefix("W/") not in tags:
+        return None
+
+    return Response(status_code=304, headers=_headers(_payload_version.get(), etag))
+
+
+def data_response(
+    data: pd.DataFrame, etag: str | None = None, next_cursor: str | None = None
+) -> Response:
+    """
+    Retorna o DataFrame no formato pedido pelo cliente.
+
+    Com Accept de Arrow IPC ou Parquet, os dados vão em formato colunar (o primeiro dos dois
+    listado no Accept); caso contrário, em JSON (orient="split") na versão de payload pedida.
+
+    Args:
+        data (pd.DataFrame): Dados da resposta.
+        etag (str, optional): ETag da versão dos dados (ver entity_tag).
+        next_cursor (str, optional): Cursor da próxima página (None na última ou sem paginação).
+
+    Returns:
+        Response: ArrowStreamResponse, ParquetResponse, SplitJSONResponse (versão 2) ou
+        JSONResponse com o JSON como string (versão 1). Com formato colunar pedido e dados que
+        o Arrow não converte, 406 Not Acceptable (os tipos não são trocados pelos do JSON).
+    """
+    version = _payload_version.get()
+    headers = _headers(version, etag)
+    if next_cursor is not None:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    media_type = _columnar_media_type(_accept.get())
+    if media_type is not None:
+        return _columnar_response(data, media_type, headers)
+
+    if version >= 2:
+        return SplitJSONResponse(data, headers=headers)
+
+    return JSONResponse(content=data.to_json(date_format="iso", orient="split"), headers=headers)
+
+
+def changes_response(changes: dict) -> ChangesJSONResponse:
+    """
+    Retorna as mudanças de uma tabela desde a versão do cliente.
+
+    O corpo traz a versão atual, se a tabela precisa ser recarregada por completo (full), as
+    colunas das chaves das partições (keys) e a ordem das linhas (order_by), as partições
+    alteradas e removidas (valores das chaves) e as linhas atuais das alteradas (orient="split").
+    O cliente remove as linhas das partições alteradas e removidas e acrescenta as recebidas.
+
+    Args:
+        changes (dict): Mudanças retornadas pelo get_changes dos modelos.
+
+    Returns:
+        ChangesJSONResponse: Mudanças, com o ETag da versão atual.
+    """
+    return ChangesJSONResponse(changes, headers={"ETag": entity_tag(changes["version"])})
+
+
+# ============================================================================= Funções Auxiliares #
+def _headers(version: int, etag: str | None) -> dict[str, str]:
+    """Cabeçalhos das respostas de dados (versão do payload, Vary e, se houver, o ETag)."""
+    headers = {PAYLOAD_VERSION_HEADER: str(version), "Vary": f"Accept, {PAYLOAD_VERSION_HEADER}"}
+
+    # Com ETag, o cliente revalida a cada requisição em vez de reutilizar a resposta
+    if etag is not None:
+        headers |= {"ETag": etag, "Cache-Control": "no-cache"}
+
+    return headers
+
+
+def _columnar_response(data: pd.DataFrame, media_type: str, headers: dict) -> Response:
+    """Resposta colunar do DataFrame (406 se os dados não puderem ser convertidos para Arrow)."""
+    table = _arrow_table(data)
+    if table is None:
+        return JSONResponse(
+            status_code=406,
+            content={"detail": f"Os dados não podem ser enviados em {media_type}"},
+            headers=headers,
+        )
+
+    return COLUMNAR_RESPONSES[media_type](table, headers=headers)
+
+
+def _arrow_table(data: pd.DataFrame) -> pa.Table | None:
+    """
+    Converte o DataFrame em tabela Arrow (None se não for possível).
+
+    Colunas object com tipos mistos (ex.: textos e números), que o Arrow não converte, são
+    enviadas como texto, mantendo os nulos.
+    """
+    mixed = [
+        position
+        for position, (_, column) in enumerate(data.items())
+        if column.dtype == object and pd.api.types.infer_dtype(column).startswith("mixed")
+    ]
+    if mixed:
+        data = data.copy()
+        for position in mixed:
+            data.isetitem(position, data.iloc[:, position].map(str, na_action="ignore"))
+
+    try:
+        return pa.Table.from_pandas(data, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as error:
+        print(f"Erro ao converter os dados para Arrow: {error}")
+        return None
+
+
+def _columnar_media_type(accept: str) -> str | None:
+    """Primeiro tipo colunar listado no Accept (None se não houver)."""
+    for item in accept.split(","):
+        media_type = item.split(";")[0].strip().lower()
+        if media_type in COLUMNAR_RESPONSES:
+            return media_type
+
+    return None
@@ -5,20 +5,25 @@ CreatedBy: Bruno Tomaz
 """
 
 import asyncio
+import logging
 import threading
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 from apscheduler.schedulers.background import BackgroundScheduler
 
 # pylint: disable=import-error
 from src.helpers.background_functions import (
+    backfill_ind_history,
     create_ind_history,
     create_ind_prod,
     create_maq_ihm_info_data,
     create_production_data,
+    reconcile_raw_data,
+    sync_raw_data,
     update_action_plan,
 )
+from src.helpers.variables import INCREMENTAL_INGESTION, RAW_RECONCILE_INTERVAL
 
 # ================================================================================================ #
 #                                      AGENDAMENTO DE TAREFAS                                      #
@@ -33,6 +38,8 @@ LOW_PRIORITY_INTERVAL = 5
 NON_CRITICAL_INTERVAL = 60
 DAILY_INTERVAL = 60 * 24
 
+logger = logging.getLogger(__name__)
+
 
 async def run_in_executor(func, *args):
     """Executa uma função em um executor de thread em segundo plano.
@@ -51,11 +58,36 @@ async def run_in_executor(func, *args):
 def get_tasks() -> None:
     """Obtém as tarefas a serem agendadas."""
     with lock:
+        sync_raw_data()
         create_production_data()
         create_maq_ihm_info_data()
         create_ind_prod()
 
 
+def reconcile_tasks() -> None:
+    """Reconcilia as cópias locais do AUTOMACAO (ingestão incremental)."""
+    with lock:
+        reconcile_raw_data()
+
+
+def backfill_history(months: list[str], force: bool = False) -> None:
+    """Cria em segundo plano o histórico de indicadores dos meses informados (backfill).
+
+    Args:
+        months: Meses (AAAA-MM) a serem criados.
+        force: Recria os meses que já estão no histórico.
+    """
+    future = executor.submit(backfill_ind_history, months, force)
+    future.add_done_callback(_log_backfill_error)
+
+
+def _log_backfill_error(future: Future) -> None:
+    """Registra o erro do backfill, que de outra forma ficaria apenas no Future descartado."""
+    error = future.exception()
+    if error is not None:
+        logger.error("Erro ao criar o histórico de indicadores: %s", error, exc_info=error)
+
+
 # Iniciar o agendador
 def start_scheduler() -> None:
     """Inicia o agendador de tarefas.
@@ -65,7 +97,10 @@ def start_scheduler() -> None:
     - Criação dos dados de produção do mês corrente a cada 5 minutos
     - Criação dos dados de maquina IHM e Info do mês corrente a cada 1 minutos
     - Criação dos indicadores de produção a cada 1 minutos
-    - Criação do histórico de indicadores a cada 1 hora
+    - Reconciliação das cópias locais do AUTOMACAO a cada RAW_RECONCILE_INTERVAL minutos
+      (somente com INCREMENTAL_INGESTION habilitado)
+    - Criação do histórico de indicadores do mês anterior a cada 1 hora (somente se o mês
+      ainda não estiver no histórico)
     - Atualização do plano de ação diariamente às 0h00
 
     O agendador irá rodar em segundo plano e as tarefas serão executadas em threads separados
@@ -81,6 +116,16 @@ def start_scheduler() -> None:
             max_instances=1,
         )
 
+        # Cria a tarefa para reconciliar as cópias locais do AUTOMACAO
+        if INCREMENTAL_INGESTION:
+            scheduler.add_job(
+                lambda: asyncio.run(run_in_executor(reconcile_tasks)),
+                "interval",
+                minutes=RAW_RECONCILE_INTERVAL,
+                start_date=datetime.now() + timedelta(minutes=RAW_RECONCILE_INTERVAL),
+                max_instances=1,
+            )
+
         # Cria a tarefa para criar o histórico de indicadores
         scheduler.add_job(
             lambda: asyncio.run(run_in_executor(create_ind_history)),
@@ -0,0 +1,253 @@
+"""
+Módulo com o registro dos tipos das colunas dos dados e das tabelas do banco local.
+
+Colunas de texto com poucos valores distintos (turno, status, motivo, problema...) trafegam como
+category e a linha como inteiro pequeno, o que reduz a memória e acelera comparações, isin e
+agrupamentos. Os tipos são aplicados na entrada dos dados (serviços) e reaplicados após as
+junções, que convertem para texto as categorias que não coincidem entre os dois lados. Na
+gravação (banco local, snapshots) e na serialização das rotas os valores voltam a ser texto.
+
+As tabelas do banco local têm as colunas e chaves primárias declaradas em TABLE_SCHEMAS, usadas
+na criação das tabelas e na leitura tipada (datas como datetime64, inteiros e booleanos).
+"""
+
+import numpy as np
+import pandas as pd
+
+# pylint: disable=import-error
+from src.helpers.variables import LocalTables
+
+# Colunas de texto de baixa cardinalidade
+CATEGORY_COLUMNS = (
+    "fabrica",
+    "turno",
+    "status",
+    "motivo",
+    "equipamento",
+    "problema",
+    "causa",
+    "produto",
+)
+
+# Colunas inteiras de baixa cardinalidade e o tipo em que cabem
+SMALL_INT_COLUMNS = {"linha": "int8"}
+
+
+def apply_schema(df: pd.DataFrame | None) -> pd.DataFrame | None:
+    """
+    Aplica os tipos do registro às colunas presentes no DataFrame.
+
+    Apenas colunas de texto viram category e apenas colunas inteiras sem nulos, com valores que
+    cabem no tipo, viram inteiro pequeno; as demais são mantidas como estão.
+
+    Args:
+        df (pd.DataFrame | None): Dados a serem tipados.
+
+    Returns:
+        pd.DataFrame | None: Novo DataFrame com os tipos aplicados (None se df for None).
+    """
+    if df is None:
+        return None
+
+    dtypes = {**_category_dtypes(df), **_small_int_dtypes(df)}
+
+    return df.astype(dtypes) if dtypes else df
+
+
+def _category_dtypes(df: pd.DataFrame) -> dict[str, str]:
+    """Colunas de CATEGORY_COLUMNS presentes no DataFrame e guardadas como texto."""
+    return {
+        column: "category"
+        for column in CATEGORY_COLUMNS
+        if column in df.columns
+        and (pd.api.types.is_object_dtype(df[column]) or pd.api.types.is_string_dtype(df[column]))
+    }
+
+
+def _small_int_dtypes(df: pd.DataFrame) -> dict[str, str]:
+    """Colunas de SMALL_INT_COLUMNS inteiras, sem nulos e com valores que cabem no tipo."""
+    return {
+        column: dtype
+        for column, dtype in SMALL_INT_COLUMNS.items()
+        if column in df.columns
+        and pd.api.types.is_integer_dtype(df[column])
+        and _fits(df[column], dtype)
+    }
+
+
+def _fits(values: pd.Series, dtype: str) -> bool:
+    """Verifica se os valores (sem nulos) cabem no tipo inteiro."""
+    if values.empty:
+        return True
+
+    limits = np.iinfo(dtype)
+    return bool(values.notna().all() and values.min() >= limits.min and values.max() <= limits.max)
+
+
+def fill_missing(df: pd.DataFrame, value) -> pd.DataFrame:
+    """
+    Preenche os valores nulos como o DataFrame.fillna, aceitando colunas category.
+
+    O fillna do DataFrame falha se houver colunas category (o valor precisa estar nas
+    categorias); aqui o valor é acrescentado às categorias das colunas que têm nulos.
+    """
+    filled = {}
+
+    for column, values in df.items():
+        if not values.hasnans:
+            continue
+
+        if isinstance(values.dtype, pd.CategoricalDtype) and value not in values.cat.categories:
+            values = values.cat.add_categories([value])
+
+        filled[column] = values.fillna(value)
+
+    return df.assign(**filled) if filled else df.copy()
+
+
+# ======================================== Tabelas Locais ======================================= #
+# Tipos SQLite declarados das colunas de cada tabela local. Datas e horas são gravadas como texto
+# ISO (DATE: AAAA-MM-DD, DATETIME: AAAA-MM-DD HH:MM:SS.ffffff, TIME: HH:MM:SS.ffffff), que ordena
+# e compara como data. Colunas não declaradas (as tabelas brutas guardam todas as colunas do
+# AUTOMACAO) têm o tipo inferido do dtype
+_INDICATOR_COLUMNS = {
+    "fabrica": "INTEGER",
+    "linha": "INTEGER",
+    "maquina_id": "TEXT",
+    "turno": "TEXT",
+    "data_registro": "DATE",
+    "hora_registro": "TIME",
+    "tempo": "REAL",
+    "desconto": "REAL",
+    "excedente": "REAL",
+    "tempo_esperado": "REAL",
+}
+
+_RAW_COLUMNS = {
+    "maquina_id": "TEXT",
+    "linha": "INTEGER",
+    "data_registro": "DATE",
+    "hora_registro": "TIME",
+}
+
+TABLE_SCHEMAS = {
+    LocalTables.INFO_IHM.value: {
+        "fabrica": "INTEGER",
+        "linha": "INTEGER",
+        "maquina_id": "TEXT",
+        "turno": "TEXT",
+        "status": "TEXT",
+        "data_registro": "DATE",
+        "hora_registro": "TIME",
+        "motivo": "TEXT",
+        "equipamento": "TEXT",
+        "problema": "TEXT",
+        "causa": "TEXT",
+        "os_numero": "TEXT",
+        "operador_id": "TEXT",
+        "data_registro_ihm": "DATE",
+        "hora_registro_ihm": "TIME",
+        "s_backup": "TEXT",
+        "data_hora": "DATETIME",
+        "data_hora_final": "DATETIME",
+        "tempo": "INTEGER",
+    },
+    LocalTables.PRODUCTION.value: {
+        "fabrica": "INTEGER",
+        "linha": "INTEGER",
+        "maquina_id": "TEXT",
+        "turno": "TEXT",
+        "produto": "TEXT",
+        "total_ciclos": "INTEGER",
+        "total_produzido_sensor": "INTEGER",
+        "bdj_vazias": "INTEGER",
+        "bdj_retrabalho": "INTEGER",
+        "total_produzido": "INTEGER",
+        "data_registro": "DATE",
+        "hora_registro": "TIME",
+    },
+    LocalTables.EFFICIENCY.value: {
+        **_INDICATOR_COLUMNS,
+        "total_produzido": "INTEGER",
+        "producao_esperada": "REAL",
+        "eficiencia": "REAL",
+    },
+    LocalTables.PERFORMANCE.value: {**_INDICATOR_COLUMNS, "performance": "REAL"},
+    LocalTables.REPAIR.value: {**_INDICATOR_COLUMNS, "reparo": "REAL"},
+    # data_registro é o mês (AAAA-MM)
+    LocalTables.HISTORIC_IND.value: {
+        "data_registro": "TEXT",
+        "total_caixas": "INTEGER",
+        "eficiencia": "REAL",
+        "performance": "REAL",
+        "reparo": "REAL",
+        "parada_programada": "REAL",
+    },
+    # Uma linha por execução da criação de um mês do histórico
+    LocalTables.HISTORIC_IND_BUILD.value: {
+        "data_registro": "TEXT",
+        "iniciado_em": "DATETIME",
+        "duracao": "REAL",
+        "status": "TEXT",
+    },
+    LocalTables.ACTION_PLAN.value: {
+        "Data": "TEXT",
+        "Indicador": "TEXT",
+        "Dias_em_Aberto": "INTEGER",
+        "Prioridade": "INTEGER",
+        "Descricao_do_Problema": "TEXT",
+        "Impacto": "REAL",
+        "Causa_Raiz": "TEXT",
+        "Contencao": "TEXT",
+        "Solucao": "TEXT",
+        "Feedback": "TEXT",
+        "Responsavel": "TEXT",
+        "Conclusao": "BOOLEAN",
+    },
+    LocalTables.RAW_MAQUINA_INFO.value: _RAW_COLUMNS,
+    LocalTables.RAW_MAQUINA_IHM.value: {**_RAW_COLUMNS, "recno": "INTEGER"},
+    LocalTables.RAW_QUALIDADE_IHM.value: {**_RAW_COLUMNS, "recno": "INTEGER"},
+    LocalTables.INGESTION_WATERMARK.value: {
+        "tabela": "TEXT",
+        "data_registro": "TEXT",
+        "hora_registro": "TEXT",
+        "recno": "INTEGER",
+        "atualizado_em": "TEXT",
+    },
+    # As versões das dimensões são identificadas pelo texto da data e hora de registro
+    LocalTables.DIM_MAQUINA_CADASTRO.value: {
+        "maquina_id": "TEXT",
+        "linha": "INTEGER",
+        "fabrica": "INTEGER",
+        "data_registro": "TEXT",
+        "hora_registro": "TEXT",
+    },
+    LocalTables.DIM_MAQUINA_PRODUTO.value: {
+        "maquina_id": "TEXT",
+        "data_registro": "TEXT",
+        "hora_registro": "TEXT",
+    },
+    LocalTables.PARTITION_HASH.value: {"table_name": "TEXT", "partition": "TEXT", "hash": "TEXT"},
+    # Versão do conteúdo de cada tabela, renovada a cada escrita que altera a tabela
+    LocalTables.TABLE_VERSION.value: {
+        "table_name": "TEXT",
+        "version": "INTEGER",
+        "atualizado_em": "TEXT",
+    },
+    # Partições alteradas (upsert) ou removidas (delete) em cada versão de uma tabela. Sem
+    # partição (reset), a tabela foi substituída por completo
+    LocalTables.CHANGE_LOG.value: {
+        "table_name": "TEXT",
+        "version": "INTEGER",
+        "partition": "TEXT",
+        "operation": "TEXT",
+    },
+}
+
+# Chaves primárias das tabelas cuja unicidade é garantida por quem as grava
+TABLE_PRIMARY_KEYS = {
+    LocalTables.HISTORIC_IND.value: ("data_registro",),
+    LocalTables.INGESTION_WATERMARK.value: ("tabela",),
+    LocalTables.PARTITION_HASH.value: ("table_name", "partition"),
+    LocalTables.TABLE_VERSION.value: ("table_name",),
+}
@@ -1,6 +1,11 @@
 """ Módulo com as variáveis do sistema e classes auxiliares. """
 
 from enum import Enum
+from os import getenv
+
+from dotenv import load_dotenv
+
+load_dotenv()
 
 # cSpell: words eficiencia, manutencao, producao
 
@@ -14,7 +19,97 @@ class LocalTables(Enum):
     PRODUCTION = "producao"
     INFO_IHM = "info_ihm"
     HISTORIC_IND = "historic_info"
+    HISTORIC_IND_BUILD = "historic_info_build"
     ACTION_PLAN = "action_plan"
+    RAW_MAQUINA_INFO = "raw_maquina_info"
+    RAW_MAQUINA_IHM = "raw_maquina_ihm"
+    RAW_QUALIDADE_IHM = "raw_qualidade_ihm"
+    INGESTION_WATERMARK = "ingestion_watermark"
+    DIM_MAQUINA_CADASTRO = "dim_maquina_cadastro"
+    DIM_MAQUINA_PRODUTO = "dim_maquina_produto"
+    PARTITION_HASH = "partition_hash"
+    TABLE_VERSION = "table_version"
+    CHANGE_LOG = "change_log"
+
+
+# Colunas que identificam as partições das tabelas atualizadas por upsert_partitions
+LOCAL_PARTITION_KEYS = ("data_registro", "turno", "maquina_id")
+
+# Ordem de leitura das tabelas atualizadas por partição (a mesma ordem em que são geradas)
+LOCAL_ORDER_BY = {
+    LocalTables.INFO_IHM.value: ("linha", "data_registro", "hora_registro", "maquina_id"),
+    LocalTables.PRODUCTION.value: ("data_registro", "turno", "linha", "maquina_id"),
+    LocalTables.EFFICIENCY.value: ("data_registro", "turno", "linha", "maquina_id"),
+    LocalTables.PERFORMANCE.value: ("data_registro", "turno", "linha", "maquina_id"),
+    LocalTables.REPAIR.value: ("data_registro", "turno", "linha", "maquina_id"),
+    LocalTables.HISTORIC_IND.value: ("data_registro",),
+}
+
+# Índices das tabelas locais. Colunas que a tabela não possui são ignoradas
+LOCAL_INDEX_COLUMNS = ("data_registro", "linha", "turno", "maquina_id")
+# Filtro por linha (sem período) nas rotas /local
+LOCAL_LINE_INDEX_COLUMNS = ("linha", "data_registro")
+LOCAL_INDEXES = {
+    LocalTables.EFFICIENCY.value: [LOCAL_INDEX_COLUMNS, LOCAL_LINE_INDEX_COLUMNS],
+    LocalTables.PERFORMANCE.value: [LOCAL_INDEX_COLUMNS, LOCAL_LINE_INDEX_COLUMNS],
+    LocalTables.REPAIR.value: [LOCAL_INDEX_COLUMNS, LOCAL_LINE_INDEX_COLUMNS],
+    LocalTables.PRODUCTION.value: [LOCAL_INDEX_COLUMNS, LOCAL_LINE_INDEX_COLUMNS],
+    LocalTables.INFO_IHM.value: [LOCAL_INDEX_COLUMNS, LOCAL_LINE_INDEX_COLUMNS],
+    LocalTables.HISTORIC_IND.value: [LOCAL_INDEX_COLUMNS],
+    LocalTables.RAW_MAQUINA_INFO.value: [
+        LOCAL_INDEX_COLUMNS,
+        ("data_registro", "hora_registro"),
+    ],
+    LocalTables.RAW_MAQUINA_IHM.value: [LOCAL_INDEX_COLUMNS, ("recno",)],
+    LocalTables.RAW_QUALIDADE_IHM.value: [LOCAL_INDEX_COLUMNS, ("recno",)],
+    LocalTables.DIM_MAQUINA_CADASTRO.value: [("maquina_id", "data_registro", "hora_registro")],
+    LocalTables.DIM_MAQUINA_PRODUTO.value: [("maquina_id", "data_registro", "hora_registro")],
+    LocalTables.CHANGE_LOG.value: [("table_name", "version")],
+}
+
+
+class RawSource(Enum):
+    """Tabelas do AUTOMACAO ingeridas de forma incremental no banco local."""
+
+    MAQUINA_INFO = "maquina_info"
+    MAQUINA_IHM = "maquina_ihm"
+    QUALIDADE_IHM = "qualidade_ihm"
+
+
+# Ingestão incremental (watermark) das tabelas do AUTOMACAO
+INCREMENTAL_INGESTION = getenv("INCREMENTAL_INGESTION", "false").lower() == "true"
+RAW_WINDOW_DAYS = 31
+RAW_RECONCILE_DAYS = int(getenv("RAW_RECONCILE_DAYS", "2"))
+RAW_RECONCILE_INTERVAL = int(getenv("RAW_RECONCILE_INTERVAL", "15"))
+
+# União incremental de info/IHM (mantém os grupos fechados entre as execuções)
+INCREMENTAL_INFO_IHM_JOIN = getenv("INCREMENTAL_INFO_IHM_JOIN", "false").lower() == "true"
+
+# Intervalo (segundos) entre as atualizações das dimensões maquina_cadastro/maquina_produto
+DIM_REFRESH_INTERVAL = int(getenv("DIM_REFRESH_INTERVAL", "300"))
+
+# Intervalo (segundos) entre as atualizações da lista de produtos do Protheus (SB1)
+PRODUCTS_REFRESH_INTERVAL = int(getenv("PRODUCTS_REFRESH_INTERVAL", "3600"))
+
+# Cache por dia das consultas por período do AUTOMACAO. Dias anteriores à janela de carência
+# são imutáveis; os arquivos com mais de RAW_CACHE_KEEP_DAYS dias são removidos
+RAW_DAY_CACHE = getenv("RAW_DAY_CACHE", "false").lower() == "true"
+RAW_CACHE_GRACE_DAYS = int(getenv("RAW_CACHE_GRACE_DAYS", "2"))
+RAW_CACHE_KEEP_DAYS = int(getenv("RAW_CACHE_KEEP_DAYS", "70"))
+
+# Meses do histórico de indicadores criados em paralelo no preenchimento retroativo (backfill)
+HISTORY_BACKFILL_WORKERS = int(getenv("HISTORY_BACKFILL_WORKERS", "3"))
+
+# Quantidade de linhas por lote nas leituras em streaming
+STREAM_CHUNK_SIZE = int(getenv("STREAM_CHUNK_SIZE", "50000"))
+
+# Snapshots colunares (Arrow IPC) das tabelas derivadas, servidos pelas rotas /local
+SNAPSHOT_STORE = getenv("SNAPSHOT_STORE", "false").lower() == "true"
+SNAPSHOT_KEEP = int(getenv("SNAPSHOT_KEEP", "3"))
+
+# Horas mantidas no registro de mudanças das tabelas (rotas /local/{tabela}/changes). Clientes
+# com versão mais antiga recebem a indicação de recarregar a tabela completa
+CHANGE_LOG_KEEP_HOURS = int(getenv("CHANGE_LOG_KEEP_HOURS", "24"))
 
 
 class IndicatorType(Enum):
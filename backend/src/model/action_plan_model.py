@@ -13,30 +13,19 @@ class ActionPlanModel:
         self.__table = LocalTables.ACTION_PLAN.value
 
     def create_table(self) -> None:
-        """Cria a tabela de action_plan no banco de dados local"""
-
-        schema = """
-            Data TEXT,
-            Indicador TEXT,
-            Dias_em_Aberto INTEGER,
-            Prioridade INTEGER,
-            Descricao_do_Problema TEXT,
-            Impacto REAL,
-            Causa_Raiz TEXT,
-            Contencao TEXT,
-            Solucao TEXT,
-            Feedback TEXT,
-            Responsavel TEXT,
-            Conclusao BOOLEAN
-        """
-
-        self.__db_automacao_local.create_table(self.__table, schema)
+        """Cria a tabela de action_plan no banco de dados local (schema declarado)"""
+        self.__db_automacao_local.create_table(self.__table)
 
     def get_data(self) -> pd.DataFrame:
         """Consulta o banco de dados e retorna os dados da tabela de action_plan"""
 
         return self.__db_automacao_local.get_data(self.__table)
 
+    def get_version(self) -> int | None:
+        """Retorna a versão do conteúdo da tabela de action_plan do banco de dados local"""
+
+        return self.__db_automacao_local.get_version(self.__table)
+
     def insert_data(self, data: pd.DataFrame) -> None:
         """Insere os dados na tabela de action_plan do banco de dados local"""
         self.__db_automacao_local.insert_data(data, self.__table)
@@ -1,71 +1,789 @@
 """ Modulo que contem a classe de modelo do banco de dados local """
 
+import datetime
+import hashlib
+import json
+import time
+
+import numpy as np
 import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.engine import Connection as SAConnection
+from sqlalchemy.exc import OperationalError
+
+# pylint: disable=import-error
 from src.database.connection_local import ConnectionLocal
+from src.database.query import TableQuery, check_columns, encode_cursor
+from src.helpers.schemas import TABLE_PRIMARY_KEYS, TABLE_SCHEMAS
+from src.helpers.variables import (
+    CHANGE_LOG_KEEP_HOURS,
+    LOCAL_INDEXES,
+    LOCAL_ORDER_BY,
+    LOCAL_PARTITION_KEYS,
+    LocalTables,
+)
+
+# Sufixo da tabela sombra usada na substituição das tabelas
+SHADOW_SUFFIX = "__shadow"
+
+# Hashes do conteúdo das partições usados pelo upsert_partitions
+PARTITION_HASH_TABLE = LocalTables.PARTITION_HASH.value
+
+# Prefixo das colunas auxiliares lidas para montar o cursor da próxima página
+CURSOR_PREFIX = "__cursor_"
+
+# Versão do conteúdo das tabelas (usada nos ETags das rotas /local)
+TABLE_VERSION_TABLE = LocalTables.TABLE_VERSION.value
+
+# Partições alteradas em cada versão das tabelas (usado nas rotas /local/{tabela}/changes)
+CHANGE_LOG_TABLE = LocalTables.CHANGE_LOG.value
+
+# Formato texto gravado pelo to_sql (SQLAlchemy) para datas e horas
+DATE_FORMATS = {
+    "DATETIME": "%Y-%m-%d %H:%M:%S.%f",
+    "DATE": "%Y-%m-%d",
+    "TIME": "%H:%M:%S.%f",
+}
+
+# Tipo SQLite pelo dtype da coluna, testados em ordem (bool antes de inteiro)
+DTYPE_SQLITE_TYPES = (
+    (pd.api.types.is_bool_dtype, "BOOLEAN"),
+    (pd.api.types.is_integer_dtype, "INTEGER"),
+    (pd.api.types.is_timedelta64_dtype, "INTEGER"),
+    (pd.api.types.is_float_dtype, "REAL"),
+    (pd.api.types.is_datetime64_any_dtype, "DATETIME"),
+)
+
+# Tipo SQLite pela classe do valor, nas colunas object (datetime é subclasse de date)
+VALUE_SQLITE_TYPES = (
+    (datetime.datetime, "DATETIME"),
+    (datetime.date, "DATE"),
+    (datetime.time, "TIME"),
+)
+
+
+def sqlite_type(column: pd.Series) -> str:
+    """Retorna o tipo SQLite da coluna a partir do dtype (ou do primeiro valor, se object)."""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return sqlite_type(column.astype(column.cat.categories.dtype))
+
+    for predicate, type_ in DTYPE_SQLITE_TYPES:
+        if predicate(column):
+            return type_
+
+    return _value_type(column)
+
+
+def _value_type(column: pd.Series) -> str:
+    """Tipo SQLite do primeiro valor não nulo da coluna (TEXT se não for data ou hora)."""
+    values = column.dropna()
+    if values.empty:
+        return "TEXT"
+
+    for class_, type_ in VALUE_SQLITE_TYPES:
+        if isinstance(values.iloc[0], class_):
+            return type_
+
+    return "TEXT"
+
+
+def declared_schema(table: str, data: pd.DataFrame | None = None) -> str:
+    """
+    Monta as colunas tipadas do CREATE TABLE a partir do schema declarado da tabela.
+
+    Com `data`, as colunas são as do DataFrame (as não declaradas têm o tipo inferido do dtype);
+    sem, são as colunas declaradas. A chave primária entra se todas as suas colunas existirem.
+    """
+    declared = TABLE_SCHEMAS.get(table, {})
+    columns = (
+        declared
+        if data is None
+        else {name: declared.get(name) or sqlite_type(column) for name, column in data.items()}
+    )
+
+    schema = [f'"{name}" {type_}' for name, type_ in columns.items()]
+
+    primary_key = TABLE_PRIMARY_KEYS.get(table)
+    if primary_key and all(column in columns for column in primary_key):
+        schema.append(f"PRIMARY KEY ({', '.join(primary_key)})")
+
+    return ", ".join(schema)
+
+
+def to_stored(data: pd.DataFrame, table: str | None = None) -> pd.DataFrame:
+    """
+    Converte os dados para a forma em que são gravados no banco local.
+
+    Datas e horas viram texto no mesmo formato usado pelo to_sql (a formatação é feita uma vez
+    por valor distinto, já que datas e horas se repetem muito entre as linhas), no formato do
+    tipo declarado da coluna na tabela, se houver. Categorias são decodificadas e timedeltas
+    viram inteiros (ns).
+    """
+    declared = TABLE_SCHEMAS.get(table, {})
+
+    stored = data.copy()
+    for position, (name, column) in enumerate(data.items()):
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            column = column.astype(column.cat.categories.dtype)
+
+        kind = "TIMEDELTA" if pd.api.types.is_timedelta64_dtype(column) else sqlite_type(column)
+        converter = STORED_CONVERTERS.get(kind)
+
+        if converter is not None:
+            column = converter(column, DATE_FORMATS.get(declared.get(name), DATE_FORMATS.get(kind)))
+
+        stored.isetitem(position, column)
+
+    return stored
+
+
+def _stored_dates(column: pd.Series, date_format: str) -> pd.Series:
+    """Formata as datas ou horas como texto, uma vez por valor distinto."""
+    codes, uniques = pd.factorize(column)
+    formatted = np.array([value.strftime(date_format) for value in uniques] + [None])
+    return pd.Series(formatted[codes], index=column.index)
+
+
+def _stored_timedelta(column: pd.Series, _date_format: None) -> pd.Series:
+    """Converte o timedelta em inteiro (ns)."""
+    return column.astype("int64").where(column.notna())
+
+
+# Conversão de cada tipo de coluna para a forma gravada (as demais são gravadas como estão)
+STORED_CONVERTERS = {
+    "DATETIME": _stored_dates,
+    "DATE": _stored_dates,
+    "TIME": _stored_dates,
+    "TIMEDELTA": _stored_timedelta,
+}
+
+
+def from_stored(data: pd.DataFrame, table: str) -> pd.DataFrame:
+    """
+    Restaura os tipos declarados das colunas lidas do banco local (inverso do to_stored).
+
+    Datas viram datetime64, inteiros viram int64 (Int64 se houver nulos) e booleanos viram
+    bool. Horas continuam no texto ISO (HH:MM:SS.ffffff), o formato consumido pelas rotas e pelo
+    frontend.
+    """
+    declared = TABLE_SCHEMAS.get(table, {})
+
+    for position, (name, column) in enumerate(data.items()):
+        type_ = declared.get(name)
+
+        if type_ in ("DATE", "DATETIME") and not pd.api.types.is_datetime64_any_dtype(column):
+            column = pd.to_datetime(column, format="ISO8601")
+        elif (
+            type_ == "INTEGER"
+            and pd.api.types.is_numeric_dtype(column)
+            and (column.dropna() % 1 == 0).all()
+        ):
+            column = column.astype("Int64" if column.hasnans else "int64")
+        elif type_ == "BOOLEAN" and pd.api.types.is_numeric_dtype(column):
+            column = column.astype(bool if column.notna().all() else "boolean")
+        else:
+            continue
+
+        data.isetitem(position, column)
+
+    return data
 
 
 class DBAutomacaoLocalModel(ConnectionLocal):
-    """Classe para manipulação de dados do banco de dados de automação local."""
+    """Classe para manipulação de dados do banco de dados de automação local.
+
+    As operações emprestam conexões da engine compartilhada do banco local e as escritas são
+    feitas em uma única transação, recriando os índices declarados da tabela ao final e
+    renovando a versão do conteúdo da tabela (table_version).
+    """
 
     # pylint: disable=W0246
     def __init__(self):
         super().__init__()
 
-    def get_data(self, table: str) -> pd.DataFrame | None:
-        """Obtém dados do banco de dados local."""
-        conn = None
+    def get_data(self, table: str, columns: list[str] | None = None) -> pd.DataFrame | None:
+        """Obtém dados do banco de dados local (todas as colunas, ou apenas as informadas)."""
+        select_ = "*" if columns is None else ", ".join(f'"{column}"' for column in columns)
+        order_by = ""
+        if table in LOCAL_ORDER_BY:
+            order_by = f" ORDER BY {', '.join(LOCAL_ORDER_BY[table])}"
+
         try:
-            conn = self.get_session()
-            return pd.read_sql_query(f"SELECT * FROM {table}", conn)
+            data = pd.read_sql_query(f"SELECT {select_} FROM {table}{order_by}", self.get_session())
+            return from_stored(data, table)
 
         # pylint: disable=W0718
         except Exception as error:
             print(f"Erro ao obter os dados: {error}")
             return None
-        finally:
-            if conn:
-                conn.dispose()
+
+    def query_data(
+        self, table: str, query: TableQuery
+    ) -> tuple[pd.DataFrame | None, str | None]:
+        """
+        Obtém do banco de dados local apenas as linhas e colunas pedidas.
+
+        O filtro e a paginação são feitos no SQLite (com os índices de LOCAL_INDEXES). As linhas
+        seguem a ordem de LOCAL_ORDER_BY, desempatada pelo rowid, e o cursor guarda esses valores
+        da última linha da página: a próxima página começa logo depois dela (keyset).
+
+        Args:
+            table (str): Tabela do banco local.
+            query (TableQuery): Filtro, colunas e paginação.
+
+        Returns:
+            tuple[pd.DataFrame | None, str | None]: Dados (None em caso de erro ou se a tabela
+            não existir) e o cursor da próxima página (None se for a última).
+
+        Raises:
+            ValueError: Se uma coluna ou o cursor forem inválidos.
+        """
+        if not self.table_exists(table):
+            return None, None
+
+        with self.get_session().connect() as connection:
+            check_columns([*query.filters, *query.columns], self.__get_columns(connection, table))
+
+        order_by = [f'"{column}"' for column in LOCAL_ORDER_BY.get(table, ())] + ["rowid"]
+        keys = [f"{CURSOR_PREFIX}{position}" for position in range(len(order_by))]
+        statement, params = self.__select_page(table, query, order_by, keys)
+
+        try:
+            data = pd.read_sql_query(text(statement), self.get_session(), params=params)
+
+        # pylint: disable=W0718
+        except Exception as error:
+            print(f"Erro ao obter os dados: {error}")
+            return None, None
+
+        data, cursor = self.__next_page(data, query.limit, keys)
+
+        return from_stored(data.drop(columns=keys), table), cursor
+
+    def get_version(self, table: str) -> int | None:
+        """
+        Retorna a versão do conteúdo da tabela (None se a tabela ainda não foi versionada).
+
+        A versão é renovada, na mesma transação, por toda escrita que altera a tabela.
+        """
+        try:
+            with self.get_session().connect() as connection:
+                row = connection.exec_driver_sql(
+                    f"SELECT version FROM {TABLE_VERSION_TABLE} WHERE table_name = ?", (table,)
+                ).fetchone()
+                return None if row is None else row[0]
+
+        # A tabela de versões só é criada na primeira escrita
+        except OperationalError:
+            return None
+
+    def get_changes(
+        self,
+        table: str,
+        since: int,
+        version: int | None,
+        keys: tuple[str, ...] = LOCAL_PARTITION_KEYS,
+    ) -> dict | None:
+        """
+        Retorna as partições da tabela alteradas e removidas depois da versão `since`.
+
+        Cada partição aparece uma vez, com a última operação registrada no change_log, e as
+        linhas atuais das partições alteradas são lidas da tabela. A tabela completa precisa ser
+        recarregada (full) se foi substituída depois da versão, se a versão é anterior ao período
+        mantido no registro (CHANGE_LOG_KEEP_HOURS) ou posterior à versão atual.
+
+        Args:
+            table (str): Tabela do banco local.
+            since (int): Versão dos dados do cliente (ETag recebido).
+            version (int | None): Versão atual dos dados servidos (None se não houver).
+            keys (tuple[str, ...]): Colunas que identificam a partição.
+
+        Returns:
+            dict | None: Versão, full, chaves, ordem, partições alteradas e removidas (valores das
+            chaves) e linhas alteradas, ou None se não houver versão ou em caso de erro.
+        """
+        if version is None:
+            return None
+
+        changes = {
+            "version": max(since, version),
+            "full": self.__needs_full_reload(since, version),
+            "keys": list(keys),
+            "order_by": list(LOCAL_ORDER_BY.get(table, keys)),
+            "changed": [],
+            "removed": [],
+            "data": None,
+        }
+        if changes["full"]:
+            return changes
+
+        operations, logged_version = self.__read_change_log(table, since)
+        changes["version"] = max(changes["version"], logged_version)
+
+        if "reset" in operations.values():
+            changes["full"] = True
+            return changes
+
+        changes["changed"] = [json.loads(p) for p, op in operations.items() if op == "upsert"]
+        changes["removed"] = [json.loads(p) for p, op in operations.items() if op == "delete"]
+
+        return self.__with_changed_rows(table, changes, keys)
+
+    def get_partitions(
+        self, table: str, partitions: list[list], keys: tuple[str, ...] = LOCAL_PARTITION_KEYS
+    ) -> pd.DataFrame | None:
+        """Obtém as linhas das partições informadas (valores das chaves como gravados)."""
+        join_ = " AND ".join(
+            f"t.\"{key}\" IS json_extract(p.value, '$[{position}]')"
+            for position, key in enumerate(keys)
+        )
+        order_by = ", ".join(f't."{column}"' for column in LOCAL_ORDER_BY.get(table, keys))
+
+        try:
+            data = pd.read_sql_query(
+                text(
+                    f'SELECT t.* FROM "{table}" AS t'
+                    f" JOIN json_each(:partitions) AS p ON {join_} ORDER BY {order_by}"
+                ),
+                self.get_session(),
+                params={"partitions": json.dumps(partitions)},
+            )
+            return from_stored(data, table)
+
+        # pylint: disable=W0718
+        except Exception as error:
+            print(f"Erro ao obter as partições: {error}")
+            return None
+
+    def get_query(self, query: str, params: dict | None = None) -> pd.DataFrame | None:
+        """Obtém dados do banco de dados local a partir de uma query."""
+        try:
+            return pd.read_sql_query(text(query), self.get_session(), params=params)
+
+        # pylint: disable=W0718
+        except Exception as error:
+            print(f"Erro ao obter os dados: {error}")
+            return None
+
+    def table_exists(self, table: str) -> bool:
+        """Verifica se a tabela existe no banco de dados local."""
+        data = self.get_query(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name = :table",
+            {"table": table},
+        )
+        return data is not None and not data.empty
+
+    def execute(self, statement: str, params: dict | list[dict] | None = None) -> None:
+        """Executa um comando (DELETE, UPDATE, DDL...) no banco de dados local."""
+        try:
+            with self.get_session().begin() as connection:
+                connection.execute(text(statement), params or {})
+
+        # pylint: disable=W0718
+        except Exception as error:
+            print(f"Erro ao executar o comando: {error}")
 
     def insert_data(self, data: pd.DataFrame, table: str) -> None:
-        """Insere dados no banco de dados local."""
-        conn = None
+        """Insere dados no banco de dados local (criando a tabela com o schema declarado)."""
         try:
-            conn = self.get_session()
-            data.to_sql(table, conn, if_exists="append", index=False)
+            with self.get_session().begin() as connection:
+                self.__ensure_table(connection, data, table)
+                to_stored(data, table).to_sql(table, connection, if_exists="append", index=False)
+                self.__create_indexes(connection, table)
+                self.__save_version(connection, table)
 
         # pylint: disable=W0718
         except Exception as error:
             print(f"Erro ao inserir os dados: {error}")
 
-        finally:
-            if conn:
-                conn.dispose()
+    def replace_where(
+        self, data: pd.DataFrame, table: str, where: str, params: dict | None = None
+    ) -> None:
+        """Substitui, em uma única transação, as linhas que atendem à condição pelos dados."""
+        try:
+            with self.get_session().begin() as connection:
+                self.__ensure_table(connection, data, table)
+                connection.execute(text(f"DELETE FROM {table} WHERE {where}"), params or {})
+                to_stored(data, table).to_sql(table, connection, if_exists="append", index=False)
+                self.__create_indexes(connection, table)
+                self.__save_version(connection, table)
+
+        # pylint: disable=W0718
+        except Exception as error:
+            print(f"Erro ao substituir os dados: {error}")
 
     def replace_data(self, data: pd.DataFrame, table: str) -> None:
-        """Atualiza dados no banco de dados local."""
-        conn = None
+        """
+        Atualiza dados no banco de dados local.
+
+        Os dados são gravados em uma tabela sombra, com tipos declarados a partir dos dtypes do
+        DataFrame e inserção em lote (executemany), e a tabela sombra substitui a atual por
+        renomeação. Tudo ocorre em uma única transação: os leitores continuam vendo a versão
+        anterior completa da tabela até o commit.
+        """
         try:
-            conn = self.get_session()
-            data.to_sql(table, conn, if_exists="replace", index=False)
+            with self.get_session().begin() as connection:
+                self.__swap(connection, data, table, self.__rows(data, table))
+                self.__save_hashes(connection, table, None)
+                self.__save_version(connection, table)
 
         # pylint: disable=W0718
         except Exception as error:
             print(f"Erro ao atualizar os dados: {error}")
 
-        finally:
-            if conn:
-                conn.dispose()
+    def upsert_partitions(
+        self, data: pd.DataFrame, table: str, keys: tuple[str, ...] = LOCAL_PARTITION_KEYS
+    ) -> dict | None:
+        """
+        Atualiza a tabela substituindo apenas as partições que mudaram.
+
+        Cada partição (por padrão data_registro, turno e maquina_id) tem o hash do seu conteúdo
+        salvo na tabela partition_hash. Partições com o mesmo hash não são regravadas, as
+        alteradas são apagadas e reinseridas e as que deixaram de existir são apagadas. Na
+        primeira execução, ou se as colunas mudarem, a tabela é substituída por completo.
+
+        Args:
+            data (pd.DataFrame): Dados completos da tabela.
+            table (str): Tabela do banco local.
+            keys (tuple[str, ...]): Colunas que identificam a partição.
+
+        Returns:
+            dict | None: Partições e linhas alteradas, ou None em caso de erro.
+        """
+        # A partição é identificada pelos valores das chaves como gravados no banco
+        codes = data.groupby(list(keys), dropna=False, sort=False, observed=True).ngroup()
+        first_rows = data[list(keys)][~codes.duplicated()]
+        partitions = np.array(
+            [json.dumps(list(row)) for row in self.__rows(first_rows, table)]
+        )
+        labels = partitions[codes.to_numpy()] if len(partitions) else np.array([], dtype=str)
+        hashes = self.__partition_hashes(data, labels)
+
+        try:
+            with self.get_session().begin() as connection:
+                stored = self.__get_hashes(connection, table)
+
+                # Substituição completa
+                if not stored or self.__get_columns(connection, table) != list(data.columns):
+                    self.__swap(connection, data, table, self.__rows(data, table))
+                    self.__save_hashes(connection, table, hashes)
+                    self.__save_version(connection, table)
+                    return {
+                        "partitions": len(hashes),
+                        "changed": len(hashes),
+                        "removed": 0,
+                        "rows_inserted": len(data),
+                        "rows_deleted": None,
+                    }
+
+                changed = {
+                    partition
+                    for partition, hash_ in hashes.items()
+                    if stored.get(partition) != hash_
+                }
+                removed = set(stored) - set(hashes)
+
+                # Apaga as partições alteradas ou removidas e insere as novas versões
+                where_ = " AND ".join(f'"{key}" IS ?' for key in keys)
+                rows_deleted = self.__executemany(
+                    connection,
+                    f'DELETE FROM "{table}" WHERE {where_}',
+                    [tuple(json.loads(partition)) for partition in changed | removed],
+                )
 
-    def create_table(self, table: str, schema: str) -> None:
-        """Cria tabela no banco de dados local."""
-        conn = None
+                new_rows = self.__rows(data[np.isin(labels, list(changed))], table)
+                self.__insert_rows(connection, data, table, new_rows)
+
+                self.__save_hashes(
+                    connection,
+                    table,
+                    {partition: hashes[partition] for partition in changed},
+                    removed=removed,
+                )
+
+                # Sem partições alteradas o conteúdo é o mesmo: a versão é mantida
+                if changed or removed:
+                    self.__save_version(connection, table, changed, removed)
+
+                return {
+                    "partitions": len(hashes),
+                    "changed": len(changed),
+                    "removed": len(removed),
+                    "rows_inserted": len(new_rows),
+                    "rows_deleted": rows_deleted,
+                }
+
+        # pylint: disable=W0718
+        except Exception as error:
+            print(f"Erro ao atualizar as partições: {error}")
+            return None
+
+    def create_table(self, table: str, schema: str | None = None) -> None:
+        """Cria tabela no banco de dados local (por padrão, com o schema declarado)."""
+        schema = schema or declared_schema(table)
         try:
-            conn = self.get_session()
-            conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({schema})")
+            with self.get_session().begin() as connection:
+                connection.execute(text(f"CREATE TABLE IF NOT EXISTS {table} ({schema})"))
+                self.__create_indexes(connection, table)
+
         # pylint: disable=W0718
         except Exception as error:
             print(f"Erro ao criar a tabela: {error}")
 
+    # ==================================== Funções Auxiliares ==================================== #
+    @staticmethod
+    def __needs_full_reload(since: int, version: int) -> bool:
+        """
+        Indica se o cliente precisa recarregar a tabela completa: a versão dele é posterior à
+        atual ou anterior ao período mantido no change_log (CHANGE_LOG_KEEP_HOURS).
+        """
+        return since > version or since < time.time_ns() - CHANGE_LOG_KEEP_HOURS * 3_600 * 10**9
+
+    def __read_change_log(self, table: str, since: int) -> tuple[dict[str, str], int]:
+        """
+        Lê as operações registradas no change_log depois da versão `since`.
+
+        Returns:
+            tuple[dict[str, str], int]: Última operação de cada partição (reset sem partição) e
+            a maior versão registrada (0 se não houver registros).
+        """
+        try:
+            with self.get_session().connect() as connection:
+                rows = connection.exec_driver_sql(
+                    f"SELECT version, partition, operation FROM {CHANGE_LOG_TABLE}"
+                    " WHERE table_name = ? AND version > ? ORDER BY version",
+                    (table, since),
+                ).fetchall()
+
+        # O change_log só é criado na primeira escrita: nada mudou desde então
+        except OperationalError:
+            rows = []
+
+        operations = {partition: operation for _, partition, operation in rows}
+        return operations, max((row[0] for row in rows), default=0)
+
+    def __with_changed_rows(self, table: str, changes: dict, keys: tuple[str, ...]) -> dict | None:
+        """Acrescenta às mudanças as linhas atuais das partições alteradas (None se houver erro)."""
+        if not changes["changed"]:
+            return changes
+
+        changes["data"] = self.get_partitions(table, changes["changed"], keys)
+        return None if changes["data"] is None else changes
+
+    @staticmethod
+    def __select_page(
+        table: str, query: TableQuery, order_by: list[str], keys: list[str]
+    ) -> tuple[str, dict]:
+        """
+        Cria o SELECT de uma página: colunas pedidas e as da ordem (com os nomes do cursor),
+        filtro, linhas depois do cursor e uma linha a mais que o limite (indica a próxima página).
+        """
+        columns = ", ".join(f'"{column}"' for column in query.columns) or "*"
+        columns += "".join(f', {column} AS "{key}"' for column, key in zip(order_by, keys))
+
+        clauses, params = query.where()
+        cursor_clauses, cursor_params = query.cursor_filter(order_by, keys)
+        clauses += cursor_clauses
+        params |= cursor_params
+
+        statement = f"SELECT {columns} FROM {table}"
+        if clauses:
+            statement += f" WHERE {' AND '.join(clauses)}"
+        statement += f" ORDER BY {', '.join(order_by)}"
+
+        if query.limit is not None:
+            statement += " LIMIT :limit"
+            params["limit"] = query.limit + 1
+
+        return statement, params
+
+    @staticmethod
+    def __next_page(
+        data: pd.DataFrame, limit: int | None, keys: list[str]
+    ) -> tuple[pd.DataFrame, str | None]:
+        """Separa a linha a mais da página e cria o cursor da próxima (None se for a última)."""
+        if limit is None or len(data) <= limit:
+            return data, None
+
+        data = data.iloc[:limit]
+        return data, encode_cursor(data[keys].iloc[-1].tolist())
+
+    def __swap(
+        self, connection: SAConnection, data: pd.DataFrame, table: str, rows: list[tuple]
+    ) -> None:
+        """Grava os dados em uma tabela sombra tipada e a renomeia sobre a tabela atual."""
+        shadow = f"{table}{SHADOW_SUFFIX}"
+
+        connection.exec_driver_sql(f'DROP TABLE IF EXISTS "{shadow}"')
+        connection.exec_driver_sql(f'CREATE TABLE "{shadow}" ({declared_schema(table, data)})')
+        self.__insert_rows(connection, data, shadow, rows)
+
+        connection.exec_driver_sql(f'DROP TABLE IF EXISTS "{table}"')
+        connection.exec_driver_sql(f'ALTER TABLE "{shadow}" RENAME TO "{table}"')
+        self.__create_indexes(connection, table)
+
+    @staticmethod
+    def __ensure_table(connection: SAConnection, data: pd.DataFrame, table: str) -> None:
+        """Cria a tabela com o schema declarado (e as colunas dos dados), se ela não existir."""
+        connection.exec_driver_sql(
+            f'CREATE TABLE IF NOT EXISTS "{table}" ({declared_schema(table, data)})'
+        )
+
+    def __insert_rows(
+        self, connection: SAConnection, data: pd.DataFrame, table: str, rows: list[tuple]
+    ) -> None:
+        """Insere as linhas (já convertidas) com executemany."""
+        columns = ", ".join(f'"{column}"' for column in data.columns)
+        placeholders = ", ".join("?" * len(data.columns))
+        self.__executemany(
+            connection, f'INSERT INTO "{table}" ({columns}) VALUES ({placeholders})', rows
+        )
+
+    @staticmethod
+    def __executemany(connection: SAConnection, statement: str, params: list[tuple]) -> int:
+        """Executa o comando em lote direto no cursor do driver e retorna as linhas afetadas."""
+        if not params:
+            return 0
+
+        cursor = connection.connection.cursor()
+        try:
+            cursor.executemany(statement, params)
+            return cursor.rowcount
         finally:
-            if conn:
-                conn.dispose()
+            cursor.close()
+
+    @staticmethod
+    def __get_columns(connection: SAConnection, table: str) -> list[str]:
+        """Retorna as colunas da tabela (lista vazia se ela não existir)."""
+        return [row[1] for row in connection.exec_driver_sql(f'PRAGMA table_info("{table}")')]
+
+    @staticmethod
+    def __partition_hashes(data: pd.DataFrame, labels: list[str]) -> dict[str, str]:
+        """Calcula o hash do conteúdo de cada partição (independente da ordem das linhas)."""
+        if data.empty:
+            return {}
+
+        row_hashes = pd.DataFrame(
+            {"partition": labels, "hash": pd.util.hash_pandas_object(data, index=False).values}
+        )
+
+        return {
+            partition: hashlib.sha1(np.sort(group.to_numpy()).tobytes()).hexdigest()
+            for partition, group in row_hashes.groupby("partition", sort=False)["hash"]
+        }
+
+    @staticmethod
+    def __get_hashes(connection: SAConnection, table: str) -> dict[str, str]:
+        """Retorna os hashes salvos das partições da tabela."""
+        connection.exec_driver_sql(
+            f"CREATE TABLE IF NOT EXISTS {PARTITION_HASH_TABLE}"
+            f" ({declared_schema(PARTITION_HASH_TABLE)})"
+        )
+        result = connection.exec_driver_sql(
+            f"SELECT partition, hash FROM {PARTITION_HASH_TABLE} WHERE table_name = ?", (table,)
+        )
+        return dict(result.fetchall())
+
+    def __save_hashes(
+        self,
+        connection: SAConnection,
+        table: str,
+        hashes: dict[str, str] | None,
+        removed: set[str] | None = None,
+    ) -> None:
+        """
+        Salva os hashes das partições da tabela.
+
+        Sem `removed`, os hashes salvos da tabela são substituídos pelos informados (None apenas
+        descarta os hashes, forçando a substituição completa na próxima atualização).
+        """
+        self.__get_hashes(connection, table)
+
+        if removed is None:
+            removed_params = [(table,)]
+            statement = f"DELETE FROM {PARTITION_HASH_TABLE} WHERE table_name = ?"
+        else:
+            removed_params = [(table, partition) for partition in removed]
+            statement = (
+                f"DELETE FROM {PARTITION_HASH_TABLE} WHERE table_name = ? AND partition = ?"
+            )
+        self.__executemany(connection, statement, removed_params)
+
+        self.__executemany(
+            connection,
+            f"INSERT OR REPLACE INTO {PARTITION_HASH_TABLE} VALUES (?, ?, ?)",
+            [(table, partition, hash_) for partition, hash_ in (hashes or {}).items()],
+        )
+
+    @staticmethod
+    def __save_version(
+        connection: SAConnection,
+        table: str,
+        changed: set[str] | None = None,
+        removed: set[str] | None = None,
+    ) -> None:
+        """
+        Renova a versão do conteúdo da tabela (nanossegundos desde a época) e registra as mudanças.
+
+        Com `changed` (upsert_partitions), as partições alteradas e removidas vão para o
+        change_log; sem ele, a tabela foi substituída e é registrado um reset. Os registros com
+        mais de CHANGE_LOG_KEEP_HOURS horas são removidos.
+        """
+        version = time.time_ns()
+
+        connection.exec_driver_sql(
+            f"CREATE TABLE IF NOT EXISTS {TABLE_VERSION_TABLE}"
+            f" ({declared_schema(TABLE_VERSION_TABLE)})"
+        )
+        connection.exec_driver_sql(
+            f"INSERT OR REPLACE INTO {TABLE_VERSION_TABLE} VALUES (?, ?, ?)",
+            (table, version, datetime.datetime.now().isoformat(sep=" ")),
+        )
+
+        connection.exec_driver_sql(
+            f"CREATE TABLE IF NOT EXISTS {CHANGE_LOG_TABLE} ({declared_schema(CHANGE_LOG_TABLE)})"
+        )
+        DBAutomacaoLocalModel.__create_indexes(connection, CHANGE_LOG_TABLE)
+
+        if changed is None:
+            entries = [(table, version, None, "reset")]
+        else:
+            entries = [(table, version, partition, "upsert") for partition in changed] + [
+                (table, version, partition, "delete") for partition in removed or ()
+            ]
+        DBAutomacaoLocalModel.__executemany(
+            connection, f"INSERT INTO {CHANGE_LOG_TABLE} VALUES (?, ?, ?, ?)", entries
+        )
+
+        connection.exec_driver_sql(
+            f"DELETE FROM {CHANGE_LOG_TABLE} WHERE table_name = ? AND version < ?",
+            (table, version - CHANGE_LOG_KEEP_HOURS * 3_600 * 10**9),
+        )
+
+    @staticmethod
+    def __rows(data: pd.DataFrame, table: str) -> list[tuple]:
+        """Converte o DataFrame em tuplas para o executemany."""
+        columns = [
+            column.astype(object).where(column.notna(), None).tolist()
+            for _, column in to_stored(data, table).items()
+        ]
+        return list(zip(*columns))
+
+    @staticmethod
+    def __create_indexes(connection: SAConnection, table: str) -> None:
+        """Cria os índices declarados da tabela (em LOCAL_INDEXES) que ainda não existem."""
+        indexes = LOCAL_INDEXES.get(table)
+        if not indexes:
+            return
+
+        existing = set(DBAutomacaoLocalModel.__get_columns(connection, table))
+
+        for columns in indexes:
+            columns = [column for column in columns if column in existing]
+            if not columns:
+                continue
+
+            name = f"ix_{table}_{'_'.join(columns)}"
+            connection.exec_driver_sql(
+                f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"
+            )
@@ -1,10 +1,14 @@
 """ Este módulo faz a comunicação principal com o banco de dados """
 
+from typing import Iterator
+
 import pandas as pd
 from sqlalchemy.exc import DatabaseError
 
 # pylint: disable=E0401
-from src.database.connection import Connection
+from src.database.arrow_reader import read_sql
+from src.database.connection import Connection, connect
+from src.database.query import Query, timed
 
 
 class DBAutomacaoModel(Connection):
@@ -14,11 +18,13 @@ class DBAutomacaoModel(Connection):
     def __init__(self):
         super().__init__()
 
-    def get_data(self, query: str) -> pd.DataFrame:
+    def get_data(self, query: Query | str, backend: str | None = None) -> pd.DataFrame:
         """Obtém os dados do banco de dados.
 
         Args:
-            query (str): Query SQL.
+            query (Query | str): Query nomeada com parâmetros (ou SQL, registrada como "adhoc").
+            backend (str, optional): Backend de leitura, "pandas" (pd.read_sql) ou "arrow"
+                (lotes Arrow, dtypes pd.ArrowDtype). Padrão: SQL_FETCH_BACKEND do .env.
 
         Returns:
             pd.DataFrame: DataFrame com os dados.
@@ -26,18 +32,42 @@ class DBAutomacaoModel(Connection):
         Usage:
             >>> from DB_automacao_model import DBAutomacaoModel
             >>> db_automacao = DBAutomacaoModel()
-            >>> query = 'SELECT * FROM tabela'
+            >>> query = Query("tabela.get_data", "SELECT * FROM tabela WHERE id = :id", {"id": 1})
             >>> df = db_automacao.get_data(query)
         """
         try:
-            conn = self.get_connection_automacao()
-            return pd.read_sql(query, conn)
+            # Empresta uma conexão do pool compartilhado, devolvendo-a ao final
+            name = query.name if isinstance(query, Query) else "adhoc"
+            with timed(name) as result, connect(self.get_connection_automacao()) as conn:
+                data = read_sql(query, conn, backend)
+                result["rows"] = len(data)
+                return data
         except DatabaseError as error:
             print(f"Erro ao obter os dados: {error}")
             return None
-        finally:
-            if conn:
-                conn.dispose()
+
+    def iter_data(self, query: Query, chunksize: int) -> Iterator[pd.DataFrame]:
+        """Obtém os dados do banco de dados em lotes de tamanho limitado.
+
+        A conexão permanece emprestada do pool enquanto os lotes são consumidos.
+
+        Args:
+            query (Query): Query nomeada com parâmetros.
+            chunksize (int): Quantidade de linhas por lote.
+
+        Yields:
+            pd.DataFrame: Lotes com os dados.
+        """
+        try:
+            with timed(query.name) as result, connect(self.get_connection_automacao()) as conn:
+                conn = conn.execution_options(stream_results=True)
+                for chunk in pd.read_sql(
+                    query.statement, conn, params=query.params, chunksize=chunksize
+                ):
+                    result["rows"] += len(chunk)
+                    yield chunk
+        except DatabaseError as error:
+            print(f"Erro ao obter os dados: {error}")
 
     def insert_data(self, query: str) -> None:
         """Insere dados no banco de dados."""
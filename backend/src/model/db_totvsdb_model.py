@@ -1,11 +1,12 @@
 """Módulo para manipulação de dados do banco de dados Totvs."""
 
 import pandas as pd
-from sqlalchemy.engine import Engine
 from sqlalchemy.exc import DatabaseError
 
 # pylint: disable=E0401
-from src.database.connection import Connection
+from src.database.arrow_reader import read_sql
+from src.database.connection import Connection, connect
+from src.database.query import Query, timed
 
 
 class DBTotvsdbModel(Connection):
@@ -15,24 +16,27 @@ class DBTotvsdbModel(Connection):
     def __init__(self):
         super().__init__()
 
-    def get_data(self, query: str) -> pd.DataFrame:
+    def get_data(self, query: Query | str, backend: str | None = None) -> pd.DataFrame:
         """
         Recupera os dados do banco de dados do Protheus.
 
         Args:
-            query (str): Query SQL.
+            query (Query | str): Query nomeada com parâmetros (ou SQL, registrada como "adhoc").
+            backend (str, optional): Backend de leitura, "pandas" (pd.read_sql) ou "arrow"
+                (lotes Arrow, dtypes pd.ArrowDtype). Padrão: SQL_FETCH_BACKEND do .env.
 
         Returns:
             pd.DataFrame: DataFrame com os dados.
 
         """
 
-        conn: Engine | None = None
         try:
-            conn = self.get_connection_totvsdb()
-            return pd.read_sql(query, conn)
+            # Empresta uma conexão do pool compartilhado, devolvendo-a ao final
+            name = query.name if isinstance(query, Query) else "adhoc"
+            with timed(name) as result, connect(self.get_connection_totvsdb()) as conn:
+                data = read_sql(query, conn, backend)
+                result["rows"] = len(data)
+                return data
         except DatabaseError as error:
             print(f"Erro ao obter os dados: {error}")
-        finally:
-            if conn:
-                conn.dispose()
+            return None
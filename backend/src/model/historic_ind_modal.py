@@ -13,12 +13,33 @@ class HistoricInd:
     def __init__(self) -> None:
         self.__db_automacao_local = DBAutomacaoLocalModel()
         self.__table = LocalTables.HISTORIC_IND.value
+        self.__build_table = LocalTables.HISTORIC_IND_BUILD.value
 
     def get_data(self) -> pd.DataFrame:
         """Consulta o banco de dados e retorna os dados da tabela de indicadores históricos"""
 
         return self.__db_automacao_local.get_data(self.__table)
 
+    def get_months(self) -> set[str]:
+        """Retorna os meses (AAAA-MM) presentes na tabela de indicadores históricos"""
+
+        if not self.__db_automacao_local.table_exists(self.__table):
+            return set()
+
+        data = self.__db_automacao_local.get_query(f"SELECT data_registro FROM {self.__table}")
+
+        if data is None:
+            return set()
+
+        return set(data.data_registro)
+
+    def get_version(self) -> int | None:
+        """
+        Retorna a versão do conteúdo da tabela de indicadores históricos do banco de dados local
+        """
+
+        return self.__db_automacao_local.get_version(self.__table)
+
     def insert_data(self, data: pd.DataFrame) -> None:
         """Insere os dados na tabela de indicadores históricos do banco de dados local"""
 
@@ -28,3 +49,20 @@ class HistoricInd:
         """Substitui os dados na tabela de indicadores históricos do banco de dados local"""
 
         self.__db_automacao_local.replace_data(data, self.__table)
+
+    def replace_month(self, data: pd.DataFrame, month: str) -> None:
+        """Substitui o mês (AAAA-MM) na tabela de indicadores históricos do banco de dados local"""
+
+        self.__db_automacao_local.replace_where(
+            data, self.__table, "data_registro = :month", {"month": month}
+        )
+
+    def get_builds(self) -> pd.DataFrame:
+        """Consulta as execuções da criação do histórico (mês, início, duração e status)"""
+
+        return self.__db_automacao_local.get_data(self.__build_table)
+
+    def insert_build(self, data: pd.DataFrame) -> None:
+        """Registra uma execução da criação do histórico no banco de dados local"""
+
+        self.__db_automacao_local.insert_data(data, self.__build_table)
@@ -0,0 +1,87 @@
+""" Módulo de modelo para as tabelas derivadas do banco de dados local e os seus snapshots """
+
+import pandas as pd
+
+# pylint: disable=import-error
+from src.database.query import TableQuery
+from src.helpers.variables import SNAPSHOT_STORE
+from src.model.db_automacao_local_model import DBAutomacaoLocalModel
+from src.model.snapshot_store_model import SnapshotStoreModel
+
+
+class LocalTableModel:
+    """
+    Classe que modela uma tabela derivada do banco de dados local (info_ihm, produção...).
+
+    Com SNAPSHOT_STORE ativo, as leituras vêm do snapshot Arrow IPC mais recente (se houver) e
+    cada escrita que altera a tabela grava uma nova versão do snapshot.
+    """
+
+    def __init__(self, table: str) -> None:
+        self.__db_automacao_local = DBAutomacaoLocalModel()
+        self.__table = table
+        self.__snapshot = SnapshotStoreModel(table)
+
+    def get_data(self, columns: list[str] | None = None) -> pd.DataFrame:
+        """Retorna os dados da tabela (apenas as colunas pedidas)."""
+        if SNAPSHOT_STORE:
+            data = self.__snapshot.read(columns)
+            if data is not None:
+                return data
+
+        return self.__db_automacao_local.get_data(self.__table, columns)
+
+    def query_data(self, query: TableQuery) -> tuple[pd.DataFrame | None, str | None]:
+        """
+        Retorna os dados filtrados e paginados da tabela.
+
+        Sempre lê do banco local (mesmo com SNAPSHOT_STORE), onde o filtro usa os índices.
+        """
+        return self.__db_automacao_local.query_data(self.__table, query)
+
+    def get_version(self) -> int | None:
+        """
+        Retorna a versão do conteúdo da tabela (a mesma fonte lida pelo get_data).
+
+        Com SNAPSHOT_STORE ativo, é a versão do snapshot mais recente.
+        """
+        if SNAPSHOT_STORE:
+            version = self.__snapshot.get_version()
+            if version is not None:
+                return version
+
+        return self.__db_automacao_local.get_version(self.__table)
+
+    def get_changes(self, since: int) -> dict | None:
+        """
+        Retorna as mudanças da tabela depois da versão `since` (ver get_version).
+
+        As partições alteradas e removidas vêm do change_log e as linhas do banco local.
+        """
+        return self.__db_automacao_local.get_changes(self.__table, since, self.get_version())
+
+    def insert_data(self, data: pd.DataFrame) -> None:
+        """Insere os dados na tabela."""
+        self.__db_automacao_local.insert_data(data, self.__table)
+
+        # O snapshot é regravado a partir da tabela completa
+        if SNAPSHOT_STORE:
+            self.__snapshot.write(self.__db_automacao_local.get_data(self.__table))
+
+    def replace_data(self, data: pd.DataFrame) -> None:
+        """Substitui os dados da tabela."""
+        self.__db_automacao_local.replace_data(data, self.__table)
+
+        if SNAPSHOT_STORE:
+            self.__snapshot.write(data)
+
+    def upsert_data(self, data: pd.DataFrame) -> dict | None:
+        """Atualiza apenas as partições alteradas da tabela."""
+        report = self.__db_automacao_local.upsert_partitions(data, self.__table)
+
+        # O snapshot só é regravado (nova versão) se alguma partição mudou
+        if SNAPSHOT_STORE and report is not None:
+            if report["changed"] or report["removed"] or self.__snapshot.get_version() is None:
+                self.__snapshot.write(data)
+
+        return report
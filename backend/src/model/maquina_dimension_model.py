@@ -0,0 +1,183 @@
+"""
+Módulo que mantém as dimensões maquina_cadastro e maquina_produto do banco de dados automacao.
+
+Cada alteração de cadastro é uma versão, vigente a partir da sua data/hora de registro. As versões
+ficam em cache (memória e banco local) e são atualizadas de forma incremental, permitindo resolver
+linha, fábrica e produto de cada registro com um merge_asof em vez de subconsultas no SQL Server.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# pylint: disable=import-error
+from src.database.query import Query
+from src.helpers.variables import DIM_REFRESH_INTERVAL, LocalTables
+from src.model.db_automacao_local_model import DBAutomacaoLocalModel
+from src.model.db_automacao_model import DBAutomacaoModel
+
+# Colunas resolvidas por cada dimensão
+DIMENSIONS = {
+    "maquina_cadastro": (LocalTables.DIM_MAQUINA_CADASTRO.value, ["linha", "fabrica"]),
+    "maquina_produto": (LocalTables.DIM_MAQUINA_PRODUTO.value, ["produto_id"]),
+}
+
+
+@dataclass
+class _Dimension:
+    """Versões de uma dimensão em cache."""
+
+    data: pd.DataFrame
+    asof: pd.DataFrame
+    refreshed_at: float
+
+
+# Cache compartilhado pelo processo
+_cache: dict[str, _Dimension] = {}
+_cache_lock = threading.Lock()
+
+
+class MaquinaDimensionModel:
+    """Classe que mantém e aplica as dimensões de cadastro e produto das máquinas."""
+
+    def __init__(self) -> None:
+        self.__automacao = DBAutomacaoModel()
+        self.__db_automacao_local = DBAutomacaoLocalModel()
+
+    def get_dimension(self, name: str) -> pd.DataFrame | None:
+        """
+        Retorna as versões da dimensão, atualizando-as caso o cache tenha expirado.
+
+        Args:
+            name (str): maquina_cadastro ou maquina_produto.
+        """
+        return self.__get(name).data
+
+    def resolve(self, df: pd.DataFrame) -> pd.DataFrame | None:
+        """
+        Adiciona linha, fabrica e produto_id vigentes na data de registro de cada linha.
+
+        Equivalente à subconsulta
+            SELECT TOP 1 ... WHERE t2.maquina_id = t1.maquina_id
+            AND t2.data_registro <= t1.data_registro
+            ORDER BY t2.data_registro DESC, t2.hora_registro DESC
+
+        Returns:
+            pd.DataFrame | None: Dados com as colunas resolvidas, na ordem original das linhas.
+            None caso alguma dimensão não esteja disponível.
+        """
+        left = df.assign(
+            _data=pd.to_datetime(df.data_registro), _ordem=np.arange(len(df))
+        ).sort_values(by="_data", kind="stable")
+
+        for name in DIMENSIONS:
+            dimension = self.__get(name)
+
+            if dimension.asof is None:
+                return None
+
+            left = pd.merge_asof(
+                left, dimension.asof, on="_data", by="maquina_id", direction="backward"
+            )
+
+        left = left.sort_values(by="_ordem").drop(columns=["_data", "_ordem"])
+
+        return left.reset_index(drop=True)
+
+    # ==================================== Funções Auxiliares ==================================== #
+    def __get(self, name: str) -> _Dimension:
+        """Retorna a dimensão em cache, atualizando-a quando necessário."""
+        with _cache_lock:
+            dimension = _cache.get(name)
+
+            expired = (
+                dimension is None
+                or time.monotonic() - dimension.refreshed_at > DIM_REFRESH_INTERVAL
+            )
+
+            if expired:
+                dimension = self.__refresh(name, dimension)
+
+                if dimension.data is not None:
+                    _cache[name] = dimension
+
+            return dimension
+
+    def __refresh(self, name: str, dimension: _Dimension | None) -> _Dimension:
+        """Busca no automacao apenas as versões posteriores à última versão conhecida."""
+        table, columns = DIMENSIONS[name]
+
+        # Na primeira chamada do processo, carrega as versões salvas no banco local
+        if dimension is None:
+            data = (
+                self.__db_automacao_local.get_data(table)
+                if self.__db_automacao_local.table_exists(table)
+                else None
+            )
+        else:
+            data = dimension.data
+
+        since = None
+        if data is not None and not data.empty:
+            last = data.sort_values(by=["data_registro", "hora_registro"]).iloc[-1]
+            since = (last.data_registro, last.hora_registro)
+
+        new_data = self.__get_versions(name, columns, since)
+
+        if new_data is not None and not new_data.empty:
+            new_data.data_registro = pd.to_datetime(new_data.data_registro).dt.strftime(
+                "%Y-%m-%d"
+            )
+            new_data.hora_registro = new_data.hora_registro.astype(str)
+            self.__db_automacao_local.insert_data(new_data, table)
+            data = new_data if data is None else pd.concat([data, new_data], ignore_index=True)
+
+        # Em caso de falha, mantém o cache atual e tenta novamente na próxima chamada
+        if new_data is None and dimension is not None:
+            return dimension
+
+        return _Dimension(data, self.__asof(data, columns), time.monotonic())
+
+    def __get_versions(
+        self, name: str, columns: list[str], since: tuple[str, str] | None
+    ) -> pd.DataFrame | None:
+        """Consulta as versões da dimensão no banco de dados automacao."""
+
+        # Select
+        select_ = f"SELECT maquina_id, {', '.join(columns)}, data_registro, hora_registro"
+
+        # From
+        from_ = f"FROM AUTOMACAO.dbo.{name}"
+
+        # Where
+        where_ = ""
+        params = {}
+        if since is not None:
+            where_ = (
+                "WHERE data_registro > :last_day"
+                " OR (data_registro = :last_day AND hora_registro > :last_hour)"
+            )
+            params = {"last_day": since[0], "last_hour": since[1]}
+
+        # Order by
+        order_by = "ORDER BY data_registro, hora_registro"
+
+        # Query
+        query = Query(f"{name}.get_versions", f"{select_} {from_} {where_} {order_by}", params)
+
+        return self.__automacao.get_data(query)
+
+    @staticmethod
+    def __asof(data: pd.DataFrame | None, columns: list[str]) -> pd.DataFrame | None:
+        """Prepara as versões para o merge_asof: a última versão de cada máquina por dia."""
+        if data is None:
+            return None
+
+        asof = data.sort_values(by=["data_registro", "hora_registro"], kind="stable")
+        asof = asof.drop_duplicates(subset=["maquina_id", "data_registro"], keep="last")
+        asof = asof.assign(_data=pd.to_datetime(asof.data_registro))
+
+        return asof[["maquina_id", "_data", *columns]].sort_values(by="_data", kind="stable")
@@ -1,39 +1,67 @@
 """ Módulo responsável por realizar a consulta no banco de dados
 e retornar os dados da tabela maquina_info. """
 
+from typing import Iterator
+
 import pandas as pd
 
 # pylint: disable=import-error
+from src.database.query import Query, period_filter
+from src.helpers.variables import RAW_DAY_CACHE
 from src.model.db_automacao_model import DBAutomacaoModel
+from src.model.maquina_dimension_model import MaquinaDimensionModel
+from src.model.protheus_sb1_produtos_model import ProtheusSB1ProdutosModel
+from src.model.raw_day_cache_model import RawDayCacheModel
+
+# Colunas retornadas pelas consultas de maquina_info
+INFO_COLUMNS = [
+    "maquina_id",
+    "linha",
+    "fabrica",
+    "status",
+    "turno",
+    "ciclo_1_min",
+    "contagem_total_ciclos",
+    "contagem_total_produzido",
+    "data_registro",
+    "hora_registro",
+]
 
 
 class MaquinaInfoModel:
     """
     Classe responsável por realizar a consulta no banco de dados
     e retornar os dados da tabela maquina_info.
+
+    Linha, fábrica e produto_id são resolvidos localmente pelas dimensões de cadastro
+    (MaquinaDimensionModel), de forma que as consultas ao SQL Server são apenas leituras
+    por período.
     """
 
     def __init__(self) -> None:
         self.__automacao = DBAutomacaoModel()
+        self.__dimension = MaquinaDimensionModel()
+        self.__sb1_produtos = ProtheusSB1ProdutosModel()
+        self.__data_cache = RawDayCacheModel("maquina_info")
+        self.__production_cache = RawDayCacheModel("maquina_info_producao")
 
     def get_data(self, period: tuple) -> pd.DataFrame:
         """
         Realiza a consulta no banco de dados e retorna os dados da tabela maquina_info.
+
+        Com RAW_DAY_CACHE ativo, os dias fechados são lidos do cache por dia.
         """
-        first_day, last_day = period
-        first_day = pd.to_datetime(first_day).strftime("%Y-%m-%d")
-        last_day = pd.to_datetime(last_day).strftime("%Y-%m-%d")
+        if RAW_DAY_CACHE:
+            return self.__data_cache.get_data(period, self.__query_data, descending=True)
 
+        return self.__query_data(period)
+
+    def __query_data(self, period: tuple) -> pd.DataFrame:
+        """Consulta os dados da tabela maquina_info no período."""
         # Select
         select_ = (
             "SELECT"
             " t1.maquina_id,"
-            " (SELECT TOP 1 t2.linha FROM AUTOMACAO.dbo.maquina_cadastro t2"
-            " WHERE t2.maquina_id = t1.maquina_id AND t2.data_registro <= t1.data_registro"
-            " ORDER BY t2.data_registro DESC, t2.hora_registro DESC) as linha,"
-            " (SELECT TOP 1 t2.fabrica FROM AUTOMACAO.dbo.maquina_cadastro t2"
-            " WHERE t2.maquina_id = t1.maquina_id AND t2.data_registro <= t1.data_registro"
-            " ORDER BY t2.data_registro DESC, t2.hora_registro DESC) as fabrica,"
             " t1.status,"
             " t1.turno,"
             " t1.ciclo_1_min,"
@@ -47,29 +75,141 @@ class MaquinaInfoModel:
         from_ = "FROM AUTOMACAO.dbo.maquina_info t1"
 
         # Where
-        where_ = (
-            (f"WHERE data_registro between '{first_day}' and '{last_day}'")
-            if first_day != last_day
-            else (f"WHERE data_registro >= '{first_day}'")
-        )
+        where_, params = period_filter("t1.data_registro", period)
 
         # Order by
         order_by = " ORDER BY t1.data_registro DESC, t1.hora_registro DESC"
 
         # Query
-        query = f"{select_} {from_} {where_} {order_by}"
+        query = Query(
+            "maquina_info.get_data", f"{select_} {from_} WHERE {where_} {order_by}", params
+        )
         data = self.__automacao.get_data(query)
 
-        return data
+        # Resolve linha e fábrica vigentes em cada registro
+        data = self.__resolve(data)
+
+        if data is None:
+            return None
+
+        return data[INFO_COLUMNS]
+
+    def iter_data(self, period: tuple, chunksize: int) -> Iterator[pd.DataFrame]:
+        """
+        Realiza a consulta no banco de dados e retorna os dados da tabela maquina_info em lotes.
+
+        Os registros são lidos em ordem crescente de data e hora de registro, e cada lote tem no
+        máximo chunksize linhas.
+        """
+        # Select
+        select_ = (
+            "SELECT"
+            " t1.maquina_id,"
+            " t1.status,"
+            " t1.turno,"
+            " t1.ciclo_1_min,"
+            " t1.contagem_total_ciclos,"
+            " t1.contagem_total_produzido,"
+            " t1.data_registro,"
+            " t1.hora_registro"
+        )
+
+        # From
+        from_ = "FROM AUTOMACAO.dbo.maquina_info t1"
+
+        # Where
+        where_, params = period_filter("t1.data_registro", period)
+
+        # Order by
+        order_by = " ORDER BY t1.data_registro, t1.hora_registro"
+
+        # Query
+        query = Query(
+            "maquina_info.iter_data", f"{select_} {from_} WHERE {where_} {order_by}", params
+        )
+
+        for chunk in self.__automacao.iter_data(query, chunksize):
+            # Resolve linha e fábrica vigentes em cada registro
+            data = self.__resolve(chunk)
+
+            if data is None:
+                return
+
+            yield data[INFO_COLUMNS]
+
+    def get_raw_data(
+        self, period: tuple | None = None, since: tuple[str, str] | None = None
+    ) -> pd.DataFrame:
+        """
+        Consulta os registros brutos da tabela maquina_info para a ingestão incremental.
+
+        Args:
+            period (tuple, optional): Intervalo de datas (início, fim) a ser consultado.
+            since (tuple[str, str], optional): Watermark (data_registro, hora_registro).
+                Retorna os registros a partir dele, inclusive os do mesmo segundo (gravados por
+                outras máquinas depois da última leitura).
+        """
+
+        # Select
+        select_ = (
+            "SELECT"
+            " t1.maquina_id,"
+            " t1.status,"
+            " t1.turno,"
+            " t1.ciclo_1_min,"
+            " t1.contagem_total_ciclos,"
+            " t1.contagem_total_produzido,"
+            " t1.produto,"
+            " t1.data_registro,"
+            " t1.hora_registro"
+        )
+
+        # From
+        from_ = "FROM AUTOMACAO.dbo.maquina_info t1"
+
+        # Where
+        if since is not None:
+            name = "maquina_info.get_raw_data_since"
+            where_ = (
+                "t1.data_registro > :last_day"
+                " OR (t1.data_registro = :last_day AND t1.hora_registro >= :last_hour)"
+            )
+            params = {"last_day": since[0], "last_hour": since[1]}
+        else:
+            name = "maquina_info.get_raw_data"
+            where_, params = period_filter("t1.data_registro", period)
+
+        # Order by
+        order_by = "ORDER BY t1.data_registro, t1.hora_registro"
+
+        # Query
+        query = Query(name, f"{select_} {from_} WHERE {where_} {order_by}", params)
+        data = self.__resolve(self.__automacao.get_data(query))
+
+        if data is None:
+            return None
+
+        return data[
+            [
+                "maquina_id",
+                "linha",
+                "fabrica",
+                "status",
+                "turno",
+                "ciclo_1_min",
+                "contagem_total_ciclos",
+                "contagem_total_produzido",
+                "produto",
+                "produto_id",
+                "data_registro",
+                "hora_registro",
+            ]
+        ]
 
     def get_data_cycle(self, period: tuple) -> pd.DataFrame:
         """
         Realiza a consulta no banco de dados e retorna os dados da tabela maquina_info.
         """
-        first_day, last_day = period
-        first_day = pd.to_datetime(first_day).strftime("%Y-%m-%d")
-        last_day = pd.to_datetime(last_day).strftime("%Y-%m-%d")
-
         # Select
         select_ = """
             SELECT
@@ -84,11 +224,8 @@ class MaquinaInfoModel:
         from_ = "FROM AUTOMACAO.dbo.maquina_info"
 
         # Where
-        where_ = (
-            (f"WHERE data_registro between '{first_day}' and '{last_day}' AND status = 'true'")
-            if first_day != last_day
-            else (f"WHERE data_registro >= '{first_day}' and status = 'true'")
-        )
+        where_, params = period_filter("data_registro", period)
+        where_ = f"WHERE {where_} AND status = 'true'"
 
         # Group by
         group_by = "GROUP BY data_registro, maquina_id, turno, produto"
@@ -97,7 +234,11 @@ class MaquinaInfoModel:
         order_by = " ORDER BY data_registro DESC, maquina_id DESC"
 
         # Query
-        query = f"{select_} {from_} {where_} {group_by} {order_by}"
+        query = Query(
+            "maquina_info.get_data_cycle",
+            f"{select_} {from_} {where_} {group_by} {order_by}",
+            params,
+        )
         data = self.__automacao.get_data(query)
 
         return data
@@ -105,35 +246,25 @@ class MaquinaInfoModel:
     def get_production_data(self, period: tuple) -> pd.DataFrame:
         """
         Realiza a consulta no banco de dados e retorna os dados da tabela maquina_info.
+
+        Com RAW_DAY_CACHE ativo, os dias fechados são lidos do cache por dia.
         """
-        first_day, last_day = period
-        first_day = pd.to_datetime(first_day).strftime("%Y-%m-%d")
-        last_day = pd.to_datetime(last_day).strftime("%Y-%m-%d")
+        if RAW_DAY_CACHE:
+            return self.__production_cache.get_data(
+                period, self.__query_production_data, descending=True
+            )
 
+        return self.__query_production_data(period)
+
+    def __query_production_data(self, period: tuple) -> pd.DataFrame:
+        """Consulta o último registro de cada máquina por data e turno no período."""
         # Where
-        where_date = (
-            f"BETWEEN '{first_day}' and '{last_day}' "
-            if first_day != last_day
-            else f">= '{first_day}'"
-        )
+        where_, params = period_filter("t1.data_registro", period)
 
-        query = f"""
+        # Último registro de cada máquina por data e turno
+        sql = f"""
             SELECT * FROM (
                 SELECT
-                    (
-                        SELECT TOP 1 t2.fabrica
-                        FROM AUTOMACAO.dbo.maquina_cadastro t2
-                        WHERE t2.maquina_id = t1.maquina_id
-                        AND t2.data_registro <= t1.data_registro
-                        ORDER BY t2.data_registro DESC, t2.hora_registro DESC
-                    ) as fabrica,
-                    (
-                        SELECT TOP 1 t2.linha
-                        FROM AUTOMACAO.dbo.maquina_cadastro t2
-                        WHERE t2.maquina_id = t1.maquina_id
-                        AND t2.data_registro <= t1.data_registro
-                        ORDER BY t2.data_registro DESC, t2.hora_registro DESC
-                    ) as linha,
                     t1.maquina_id,
                     t1.turno,
                     t1.status,
@@ -142,26 +273,45 @@ class MaquinaInfoModel:
                     t1.contagem_total_produzido as total_produzido,
                     t1.data_registro,
                     t1.hora_registro,
-                    (
-                        SELECT TOP 1 t2.produto_id
-                        FROM AUTOMACAO.dbo.maquina_produto t2
-                        WHERE t2.maquina_id = t1.maquina_id
-                        AND t2.data_registro <= t1.data_registro
-                        ORDER BY t2.data_registro DESC, t2.hora_registro DESC
-                    ) as produto_id,
                     ROW_NUMBER() OVER (
                         PARTITION BY t1.data_registro, t1.turno, t1.maquina_id
                         ORDER BY t1.data_registro DESC, t1.hora_registro DESC
                     ) AS rn
                 FROM AUTOMACAO.dbo.maquina_info t1
+                WHERE {where_}
             ) AS t
             WHERE rn = 1
-            AND data_registro {where_date}
             AND hora_registro > '00:01'
-            ORDER BY data_registro DESC, linha
         """
-
-        return self.__automacao.get_data(query)
+        query = Query("maquina_info.get_production_data", sql, params)
+
+        # Resolve fábrica, linha e produto vigentes em cada registro
+        data = self.__resolve(self.__automacao.get_data(query))
+
+        if data is None:
+            return None
+
+        # Ordenar os dados
+        data = data.sort_values(
+            by=["data_registro", "linha"], ascending=[False, True], kind="stable"
+        ).reset_index(drop=True)
+
+        return data[
+            [
+                "fabrica",
+                "linha",
+                "maquina_id",
+                "turno",
+                "status",
+                "produto",
+                "total_ciclos",
+                "total_produzido",
+                "data_registro",
+                "hora_registro",
+                "produto_id",
+                "rn",
+            ]
+        ]
 
     def get_production_data_by_period(self, period: str) -> pd.DataFrame:
         """
@@ -170,61 +320,59 @@ class MaquinaInfoModel:
 
         first_day = pd.to_datetime(period).strftime("%Y-%m-%d")
 
-        # Select
-        select_ = """
-            SELECT
-                linha,
-                maquina_id,
-                turno,
-                contagem_total_ciclos as total_ciclos,
-                contagem_total_produzido as total_produzido_sensor,
-                B1_DESC as produto,
-                data_registro
-        """
-
-        # From
-        from_ = """
-            FROM (
+        # Último registro de cada máquina por turno
+        sql = """
+            SELECT * FROM (
                 SELECT
-                    (SELECT TOP 1 t2.fabrica FROM AUTOMACAO.dbo.maquina_cadastro t2
-                    WHERE t2.maquina_id = t1.maquina_id AND t2.data_registro <= t1.data_registro
-                    ORDER BY t2.data_registro DESC, t2.hora_registro DESC) as fabrica,
-                    (SELECT TOP 1 t2.linha FROM AUTOMACAO.dbo.maquina_cadastro t2
-                    WHERE t2.maquina_id = t1.maquina_id AND t2.data_registro <= t1.data_registro
-                    ORDER BY t2.data_registro DESC, t2.hora_registro DESC) as linha,
                     t1.maquina_id,
                     t1.turno,
-                    t1.contagem_total_ciclos,
-                    t1.contagem_total_produzido,
-                    (SELECT TOP 1 t2.produto_id FROM AUTOMACAO.dbo.maquina_produto t2
-                    WHERE t2.maquina_id = t1.maquina_id AND t2.data_registro <= t1.data_registro
-                    ORDER BY t2.data_registro DESC, t2.hora_registro DESC) as produto_id,
+                    t1.contagem_total_ciclos as total_ciclos,
+                    t1.contagem_total_produzido as total_produzido_sensor,
                     t1.data_registro,
                     t1.hora_registro,
                     ROW_NUMBER() OVER (
                         PARTITION BY t1.data_registro, t1.turno, t1.maquina_id
                         ORDER BY t1.data_registro DESC, t1.hora_registro DESC) AS rn
                 FROM AUTOMACAO.dbo.maquina_info t1
+                WHERE t1.data_registro = :first_day
             ) AS t
-        """
-
-        # Join
-        join_ = """
-            INNER JOIN
-                TOTVSDB.dbo.SB1000 SB1 WITH (NOLOCK)
-                ON SB1.B1_FILIAL = '01' AND SB1.B1_COD = t.produto_id AND SB1.D_E_L_E_T_<>'*'
-        """
-
-        # Where
-        where_ = f"""
             WHERE t.rn = 1
                 AND hora_registro > '00:01'
-                AND data_registro = '{first_day}'"""
-
-        # Order by
-        order_by = "ORDER BY data_registro DESC, linha"
-
-        # Query
-        query = f"{select_} {from_} {join_} {where_} {order_by}"
-
-        return self.__automacao.get_data(query)
+        """
+        query = Query("maquina_info.get_production_data_by_period", sql, {"first_day": first_day})
+
+        # Resolve linha e produto vigentes em cada registro
+        data = self.__resolve(self.__automacao.get_data(query))
+        products = self.__sb1_produtos.get_data()
+
+        if data is None or products is None:
+            return None
+
+        # Descrição do produto (SB1), mantendo apenas os registros com produto cadastrado
+        products = products.rename(columns={"descricao": "produto"})
+        products.produto_id = products.produto_id.str.strip()
+        data.produto_id = data.produto_id.astype(str).str.strip()
+        data = data.merge(products, on="produto_id", how="inner")
+
+        # Ordenar os dados
+        data = data.sort_values(by="linha", kind="stable").reset_index(drop=True)
+
+        return data[
+            [
+                "linha",
+                "maquina_id",
+                "turno",
+                "total_ciclos",
+                "total_produzido_sensor",
+                "produto",
+                "data_registro",
+            ]
+        ]
+
+    # ==================================== Funções Auxiliares ==================================== #
+    def __resolve(self, data: pd.DataFrame | None) -> pd.DataFrame | None:
+        """Adiciona linha, fábrica e produto_id vigentes na data de registro."""
+        if data is None:
+            return None
+
+        return self.__dimension.resolve(data)
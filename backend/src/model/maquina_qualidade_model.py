@@ -3,7 +3,10 @@
 import pandas as pd
 
 # pylint: disable=import-error
+from src.database.query import Query, period_filter
+from src.helpers.variables import RAW_DAY_CACHE
 from src.model.db_automacao_model import DBAutomacaoModel
+from src.model.raw_day_cache_model import RawDayCacheModel
 
 
 class MaquinaQualidadeModel:
@@ -11,13 +14,21 @@ class MaquinaQualidadeModel:
 
     def __init__(self) -> None:
         self.__db_automacao = DBAutomacaoModel()
+        self.__cache = RawDayCacheModel("qualidade_ihm")
 
     def get_data(self, period: tuple) -> pd.DataFrame:
-        """Consulta o banco de dados e retorna os dados da tabela qualidade_ihm."""
+        """
+        Consulta o banco de dados e retorna os dados da tabela qualidade_ihm.
 
-        first_day, last_day = period
-        first_day = pd.to_datetime(first_day).strftime("%Y-%m-%d")
-        last_day = pd.to_datetime(last_day).strftime("%Y-%m-%d")
+        Com RAW_DAY_CACHE ativo, os dias fechados são lidos do cache por dia.
+        """
+        if RAW_DAY_CACHE:
+            return self.__cache.get_data(period, self.__query_data)
+
+        return self.__query_data(period)
+
+    def __query_data(self, period: tuple) -> pd.DataFrame:
+        """Consulta os dados da tabela qualidade_ihm no período."""
 
         # Select
         select_ = "SELECT *"
@@ -26,16 +37,23 @@ class MaquinaQualidadeModel:
         from_ = "FROM AUTOMACAO.dbo.qualidade_ihm"
 
         # Where
-        where_ = (
-            (f"WHERE data_registro between '{first_day}' and '{last_day}'")
-            if first_day != last_day
-            else (f"WHERE data_registro >= '{first_day}'")
-        )
+        where_, params = period_filter("data_registro", period)
 
         # Query
-        query = f"{select_} {from_} {where_}"
+        query = Query("qualidade_ihm.get_data", f"{select_} {from_} WHERE {where_}", params)
 
         # Executa a query
         df = self.__db_automacao.get_data(query)
 
         return df
+
+    def get_data_since(self, recno: int) -> pd.DataFrame:
+        """Consulta os registros da tabela qualidade_ihm com recno maior que o watermark."""
+
+        query = Query(
+            "qualidade_ihm.get_data_since",
+            "SELECT * FROM AUTOMACAO.dbo.qualidade_ihm WHERE recno > :recno ORDER BY recno",
+            {"recno": int(recno)},
+        )
+
+        return self.__db_automacao.get_data(query)
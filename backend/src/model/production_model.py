@@ -3,27 +3,41 @@
 import pandas as pd
 
 # pylint: disable=import-error
+from src.database.query import TableQuery
 from src.helpers.variables import LocalTables
-from src.model.db_automacao_local_model import DBAutomacaoLocalModel
+from src.model.local_table_model import LocalTableModel
 
 
 class ProductionModel:
     """Classe que modela a tabela de produção do banco de dados local"""
 
     def __init__(self) -> None:
-        self.__db_automacao_local = DBAutomacaoLocalModel()
-        self.__table = LocalTables.PRODUCTION.value
+        self.__local_table = LocalTableModel(LocalTables.PRODUCTION.value)
 
-    def get_data(self) -> pd.DataFrame:
+    def get_data(self, columns: list[str] | None = None) -> pd.DataFrame:
         """Consulta o banco de dados e retorna os dados da tabela de produção"""
-        return self.__db_automacao_local.get_data(self.__table)
+        return self.__local_table.get_data(columns)
+
+    def query_data(self, query: TableQuery) -> tuple[pd.DataFrame | None, str | None]:
+        """Consulta os dados filtrados e paginados da tabela de produção"""
+        return self.__local_table.query_data(query)
+
+    def get_version(self) -> int | None:
+        """Retorna a versão do conteúdo da tabela de produção"""
+        return self.__local_table.get_version()
+
+    def get_changes(self, since: int) -> dict | None:
+        """Retorna as mudanças da tabela de produção depois da versão `since`"""
+        return self.__local_table.get_changes(since)
 
     def insert_data(self, data: pd.DataFrame) -> None:
         """Insere os dados na tabela de produção do banco de dados local"""
-
-        self.__db_automacao_local.insert_data(data, self.__table)
+        self.__local_table.insert_data(data)
 
     def replace_data(self, data: pd.DataFrame) -> None:
         """Atualiza os dados na tabela de produção do banco de dados local"""
+        self.__local_table.replace_data(data)
 
-        self.__db_automacao_local.replace_data(data, self.__table)
+    def upsert_data(self, data: pd.DataFrame) -> dict | None:
+        """Atualiza apenas as partições alteradas na tabela de produção do banco de dados local"""
+        return self.__local_table.upsert_data(data)
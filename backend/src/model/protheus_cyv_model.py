@@ -3,6 +3,7 @@
 import pandas as pd
 
 # pylint: disable=import-error
+from src.database.query import Query
 from src.model.db_totvsdb_model import DBTotvsdbModel
 
 
@@ -56,13 +57,17 @@ class ProtheusCYVModel:
 
         where_ = (
             "WHERE T1.D_E_L_E_T_ <> '*' AND T1.CYV_FILIAL = '0101' AND T1.CYV_CDMQ LIKE 'AMS%' "
-            f"AND T1.CYV_DTRPBG >= '{first_day}'"
+            "AND T1.CYV_DTRPBG >= :first_day"
         )
 
         order_by_ = "ORDER BY T1.CYV_DTRPBG, T1.CYV_CDMQ, T1.CYV_HRRPBG"
 
         # Cria a query
-        query = f"{select_} {from_} {join_} {where_} {order_by_}"
+        query = Query(
+            "protheus_cyv.get_massa_data",
+            f"{select_} {from_} {join_} {where_} {order_by_}",
+            {"first_day": first_day},
+        )
 
         # Executa a query
         data = self.__totvsdb.get_data(query)
@@ -111,13 +116,17 @@ class ProtheusCYVModel:
 
         where_ = (
             "WHERE T1.CYV_FILIAL = '0101' AND T1.CYV_CDMQ LIKE 'RET%' "
-            f"AND T1.CYV_DTRPBG >= '{first_day}' AND T1.D_E_L_E_T_ <> '*'"
+            "AND T1.CYV_DTRPBG >= :first_day AND T1.D_E_L_E_T_ <> '*'"
         )
 
         order_by_ = "ORDER BY T1.CYV_DTRPBG, T1.CYV_CDMQ, T1.CYV_HRRPBG"
 
         # Cria a query
-        query = f"{select_} {from_} {join_} {where_} {order_by_}"
+        query = Query(
+            "protheus_cyv.get_pasta_data",
+            f"{select_} {from_} {join_} {where_} {order_by_}",
+            {"first_day": first_day},
+        )
 
         # Executa a query
         data = self.__totvsdb.get_data(query)
@@ -156,10 +165,10 @@ class ProtheusCYVModel:
 
         from_ = "FROM CYV000 (NOLOCK)"
 
-        where_ = f"""
+        where_ = """
             WHERE
             CYV_FILIAL='0101' AND
-            CYV_DTRPBG >= '{first_day_month}' AND
+            CYV_DTRPBG >= :first_day AND
             CYV000.CYV_CDMQ like 'ESF%' AND
             CYV000.D_E_L_E_T_<>'*'
             """
@@ -167,7 +176,11 @@ class ProtheusCYVModel:
         order_by_ = "ORDER BY Data_apontamento DESC, Hora_apontamento ASC"
 
         # Cria a query
-        query = f"{select_} {from_} {where_} {order_by_}"
+        query = Query(
+            "protheus_cyv.get_cart_entering_greenhouse",
+            f"{select_} {from_} {where_} {order_by_}",
+            {"first_day": first_day_month},
+        )
 
         # Executa a query
         data = self.__totvsdb.get_data(query)
@@ -1,10 +1,19 @@
 """ Módulo que consulta produtos do banco de dados SB1000 do Protheus. """
 
+import threading
+import time
+
 import pandas as pd
 
 # pylint: disable=import-error
+from src.database.query import Query
+from src.helpers.variables import PRODUCTS_REFRESH_INTERVAL
 from src.model.db_totvsdb_model import DBTotvsdbModel
 
+# Lista de produtos em cache, compartilhada pelo processo
+_cache: dict = {}
+_cache_lock = threading.Lock()
+
 
 class ProtheusSB1ProdutosModel:
     """
@@ -18,7 +27,27 @@ class ProtheusSB1ProdutosModel:
     def get_data(self) -> pd.DataFrame:
         """
         Realiza a consulta no banco de dados e retorna os dados da tabela PROTHEUS_SB1_PRODUTOS.
+
+        A lista é mantida em cache e consultada novamente a cada PRODUCTS_REFRESH_INTERVAL
+        segundos. Cada chamada recebe uma cópia, que pode ser alterada livremente.
         """
+        with _cache_lock:
+            expired = (
+                not _cache
+                or time.monotonic() - _cache["refreshed_at"] > PRODUCTS_REFRESH_INTERVAL
+            )
+
+            if expired:
+                data = self.__query_data()
+
+                # Em caso de falha, mantém a lista atual e tenta novamente na próxima chamada
+                if data is not None:
+                    _cache.update(data=data, refreshed_at=time.monotonic())
+
+            return _cache["data"].copy() if _cache else None
+
+    def __query_data(self) -> pd.DataFrame:
+        """Consulta a lista de produtos no banco de dados SB1000."""
         # Select
         select_ = "SELECT B1_COD as produto_id, B1_DESC as descricao"
 
@@ -29,6 +58,6 @@ class ProtheusSB1ProdutosModel:
         where_ = "WHERE SB1.B1_FILIAL = '01' AND SB1.D_E_L_E_T_ <> '*'"
 
         # query
-        query = f"{select_} {from_} {where_}"
+        query = Query("protheus_sb1_produtos.get_data", f"{select_} {from_} {where_}")
         data = self.__totvsdb.get_data(query)
         return data
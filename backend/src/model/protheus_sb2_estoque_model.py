@@ -3,6 +3,7 @@
 import pandas as pd
 
 # pylint: disable=import-error
+from src.database.query import Query
 from src.model.db_totvsdb_model import DBTotvsdbModel
 
 
@@ -41,6 +42,8 @@ class ProtheusSB2EstoqueModel:
         order_by_ = "ORDER BY SB2.B2_COD"
 
         # query
-        query = f"{select_} {from_} {join_} {where_} {order_by_}"
+        query = Query(
+            "protheus_sb2_estoque.get_data", f"{select_} {from_} {join_} {where_} {order_by_}"
+        )
         data = self.__totvsdb.get_data(query)
         return data
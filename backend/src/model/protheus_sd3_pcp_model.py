@@ -3,6 +3,7 @@
 import pandas as pd
 
 # pylint: disable=import-error
+from src.database.query import Query
 from src.model.db_totvsdb_model import DBTotvsdbModel
 
 
@@ -41,11 +42,15 @@ class ProtheusSD3PCPModel:
 
         # Where
         where_ = (
-            f"WHERE SD3.D_E_L_E_T_ <> '*' AND SD3.D3_EMISSAO BETWEEN '{begin}' AND '{end}'"
+            "WHERE SD3.D_E_L_E_T_ <> '*' AND SD3.D3_EMISSAO BETWEEN :begin AND :end "
             "AND SD3.D3_DOC = 'INVENT' AND SD3.D3_GRUPO != 6"
         )
 
-        query = f"{select_} {from_} {join_} {where_}"
+        query = Query(
+            "protheus_sd3_pcp.get_data",
+            f"{select_} {from_} {join_} {where_}",
+            {"begin": begin, "end": end},
+        )
 
         data = self.__totvsdb.get_data(query)
 
@@ -3,6 +3,7 @@
 import pandas as pd
 
 # pylint: disable=import-error
+from src.database.query import Query
 from src.model.db_totvsdb_model import DBTotvsdbModel
 
 
@@ -66,17 +67,21 @@ class ProtheusSD3ProductionModel:
         """
 
         # Where
-        where_ = f"""
+        where_ = """
         WHERE
             SD3.D3_FILIAL = '0101' AND SD3.D3_LOCAL = 'CF'
             AND SB1.B1_TIPO = 'PA' AND SD3.D3_CF = 'PR0' AND SD3.D3_ESTORNO <> 'S'
-            AND SD3.D3_EMISSAO >= '{first_day}' AND SD3.D_E_L_E_T_ <> '*'
+            AND SD3.D3_EMISSAO >= :first_day AND SD3.D_E_L_E_T_ <> '*'
         """
 
         # Order by
         order_by_ = "ORDER BY SD3.D3_EMISSAO DESC, CYV.CYV_HRRPBG DESC"
 
         # Criando a query
-        query = f"{select_} {from_} {join_} {where_} {order_by_}"
+        query = Query(
+            "protheus_sd3_production.get_data",
+            f"{select_} {from_} {join_} {where_} {order_by_}",
+            {"first_day": first_day},
+        )
         data = self.__totvsdb.get_data(query)
         return data
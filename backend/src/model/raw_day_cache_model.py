@@ -0,0 +1,219 @@
+"""
+Módulo de modelo para o cache em disco dos dados brutos do AUTOMACAO, particionado por dia.
+
+Cada dia de uma consulta por período (maquina_info, maquina_ihm, qualidade_ihm...) é gravado em
+Arrow IPC, em RAW_CACHE_DIR/<origem>/<AAAA-MM-DD>.arrow. Os dias fechados, anteriores à janela
+de carência (RAW_CACHE_GRACE_DAYS, em que ainda pode haver correções no AUTOMACAO), são imutáveis:
+uma vez gravados, passam a ser lidos do disco, e apenas os dias que faltam e os ainda abertos são
+consultados no SQL Server. Assim os jobs de produção (últimos 31 dias) e o do histórico (mês
+anterior) compartilham as mesmas leituras.
+"""
+
+import os
+import threading
+from typing import Callable
+
+import pandas as pd
+import pyarrow as pa
+
+# pylint: disable=import-error
+from src.helpers.paths import RAW_CACHE_DIR
+from src.helpers.variables import RAW_CACHE_GRACE_DAYS, RAW_CACHE_KEEP_DAYS
+
+CACHE_EXTENSION = ".arrow"
+DAY_FORMAT = "%Y-%m-%d"
+
+
+class RawDayCacheModel:
+    """Classe que lê e grava os dias em cache de uma consulta por período do AUTOMACAO."""
+
+    def __init__(self, source: str) -> None:
+        self.__dir = os.path.join(RAW_CACHE_DIR, source)
+
+    def get_data(
+        self,
+        period: tuple,
+        fetch: Callable[[tuple], pd.DataFrame | None],
+        descending: bool = False,
+    ) -> pd.DataFrame | None:
+        """
+        Retorna os dados do período, montados a partir dos dias em cache e dos consultados.
+
+        Args:
+            period (tuple): Data de início e de fim (mesma regra do period_filter).
+            fetch (Callable): Consulta os dados de um período no SQL Server.
+            descending (bool): Dias do mais recente para o mais antigo (ordem da consulta).
+
+        Returns:
+            pd.DataFrame | None: Dados do período, ou None em caso de erro na consulta.
+        """
+        first_day, last_day = (pd.Timestamp(day).normalize() for day in period)
+
+        # Com a mesma data, o period_filter retorna tudo a partir dela (período aberto)
+        if first_day == last_day:
+            return fetch(period)
+
+        closed = pd.Timestamp("today").normalize() - pd.Timedelta(days=RAW_CACHE_GRACE_DAYS)
+        days = pd.date_range(first_day, last_day, freq="D")
+
+        parts = self.__read_closed(days[days <= closed])
+        missing = days[~days.isin(list(parts))]
+
+        for start, end in self.__ranges(missing):
+            fetched = self.__fetch_days(fetch, start, end, closed)
+            if fetched is None:
+                return None
+            parts.update(fetched)
+
+        if not missing.empty:
+            self.__prune()
+
+        frames = [parts[day] for day in sorted(parts, reverse=descending)]
+        frames = [frame for frame in frames if not frame.empty] or frames[:1]
+
+        # Dias consultados separadamente podem ter tipos diferentes (ex.: coluna toda nula)
+        return pd.concat(frames, ignore_index=True).infer_objects()
+
+    # ==================================== Funções Auxiliares ==================================== #
+    def __path(self, day: pd.Timestamp) -> str:
+        """Caminho do arquivo do dia."""
+        return os.path.join(self.__dir, f"{day.strftime(DAY_FORMAT)}{CACHE_EXTENSION}")
+
+    @staticmethod
+    def __ranges(days: pd.DatetimeIndex) -> list[tuple[pd.Timestamp, pd.Timestamp]]:
+        """Agrupa os dias em intervalos contínuos (início, fim)."""
+        if days.empty:
+            return []
+
+        breaks = (days[1:] - days[:-1]) != pd.Timedelta(days=1)
+        starts = [days[0], *days[1:][breaks]]
+        ends = [*days[:-1][breaks], days[-1]]
+
+        return list(zip(starts, ends))
+
+    @staticmethod
+    def __fetch(
+        fetch: Callable[[tuple], pd.DataFrame | None], start: pd.Timestamp, end: pd.Timestamp
+    ) -> pd.DataFrame | None:
+        """
+        Consulta o intervalo de dias no SQL Server.
+
+        Um único dia é consultado junto com o seguinte (o period_filter trata a mesma data como
+        período aberto); os dias a mais são descartados na separação por dia.
+        """
+        if start == end:
+            end = start + pd.Timedelta(days=1)
+
+        return fetch((start.strftime(DAY_FORMAT), end.strftime(DAY_FORMAT)))
+
+    def __read_closed(self, days: pd.DatetimeIndex) -> dict[pd.Timestamp, pd.DataFrame]:
+        """Lê os dias fechados já gravados (os que faltam ficam de fora)."""
+        parts = {}
+        for day in days:
+            part = self.__read(day)
+            if part is not None:
+                parts[day] = part
+
+        return parts
+
+    def __fetch_days(
+        self,
+        fetch: Callable[[tuple], pd.DataFrame | None],
+        start: pd.Timestamp,
+        end: pd.Timestamp,
+        closed: pd.Timestamp,
+    ) -> dict[pd.Timestamp, pd.DataFrame] | None:
+        """
+        Consulta um intervalo contínuo de dias e o separa por dia, gravando os dias fechados.
+
+        Os dias anteriores à janela de RAW_CACHE_KEEP_DAYS dias (ex.: backfill do histórico) não
+        são gravados, já que seriam removidos logo em seguida pelo __prune.
+
+        Returns:
+            dict | None: Dados de cada dia do intervalo, ou None em caso de erro na consulta.
+        """
+        data = self.__fetch(fetch, start, end)
+        if data is None:
+            return None
+
+        groups = dict(list(data.groupby(pd.to_datetime(data.data_registro).dt.normalize())))
+        oldest = self.__oldest()
+
+        parts = {}
+        for day in pd.date_range(start, end, freq="D"):
+            parts[day] = groups.get(day, data.iloc[:0])
+
+            if oldest <= day <= closed:
+                self.__write(day, parts[day])
+
+        return parts
+
+    def __read(self, day: pd.Timestamp) -> pd.DataFrame | None:
+        """Lê o dia em cache (None se não houver)."""
+        path = self.__path(day)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with pa.memory_map(path) as source:
+                return pa.ipc.open_file(source).read_all().to_pandas()
+
+        # pylint: disable=W0718
+        except Exception as error:
+            print(f"Erro ao ler o cache do dia {day.strftime(DAY_FORMAT)}: {error}")
+            return None
+
+    def __write(self, day: pd.Timestamp, data: pd.DataFrame) -> None:
+        """Grava o dia em cache (escrito com outro nome e renomeado ao final)."""
+        path = self.__path(day)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        try:
+            os.makedirs(self.__dir, exist_ok=True)
+            table = pa.Table.from_pandas(data, preserve_index=False)
+
+            with pa.OSFile(temp_path, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+
+            os.replace(temp_path, path)
+
+        # pylint: disable=W0718
+        except Exception as error:
+            print(f"Erro ao gravar o cache do dia {day.strftime(DAY_FORMAT)}: {error}")
+
+    def __prune(self) -> None:
+        """Remove os dias com mais de RAW_CACHE_KEEP_DAYS dias."""
+        if not os.path.isdir(self.__dir):
+            return
+
+        oldest = self.__oldest()
+
+        expired = [name for name in os.listdir(self.__dir) if self.__expired(name, oldest)]
+
+        for name in expired:
+            try:
+                os.remove(os.path.join(self.__dir, name))
+            # No Windows, um dia ainda aberto por um leitor não pode ser removido
+            except OSError:
+                continue
+
+    @staticmethod
+    def __oldest() -> pd.Timestamp:
+        """Primeiro dia mantido em cache (os anteriores, com mais de RAW_CACHE_KEEP_DAYS dias)."""
+        return pd.Timestamp("today").normalize() - pd.Timedelta(days=RAW_CACHE_KEEP_DAYS)
+
+    @staticmethod
+    def __expired(name: str, oldest: pd.Timestamp) -> bool:
+        """
+        Indica se o arquivo é de um dia anterior a oldest.
+
+        Arquivos que não seguem o nome <AAAA-MM-DD>.arrow nunca são removidos.
+        """
+        if not name.endswith(CACHE_EXTENSION):
+            return False
+
+        try:
+            return pd.Timestamp(name.removesuffix(CACHE_EXTENSION)) < oldest
+        except ValueError:
+            return False
@@ -0,0 +1,176 @@
+"""Módulo de modelo para as tabelas brutas (raw) do AUTOMACAO no banco de dados local"""
+
+import pandas as pd
+
+# pylint: disable=import-error
+from src.database.query import period_filter
+from src.helpers.variables import LocalTables, RawSource
+from src.model.db_automacao_local_model import DBAutomacaoLocalModel
+
+# Chave de um registro de maquina_info (usada para descartar os já ingeridos)
+RAW_INFO_KEYS = ["maquina_id", "data_registro", "hora_registro"]
+
+
+class RawStoreModel:
+    """
+    Classe que modela as cópias locais das tabelas maquina_info, maquina_ihm e qualidade_ihm.
+
+    Os registros são acrescentados de forma incremental (watermark) e lidos com os mesmos
+    tipos e colunas que as consultas feitas diretamente ao SQL Server.
+    """
+
+    def __init__(self) -> None:
+        self.__db_automacao_local = DBAutomacaoLocalModel()
+        self.__watermark_table = LocalTables.INGESTION_WATERMARK.value
+        self.__tables = {
+            RawSource.MAQUINA_INFO: LocalTables.RAW_MAQUINA_INFO.value,
+            RawSource.MAQUINA_IHM: LocalTables.RAW_MAQUINA_IHM.value,
+            RawSource.QUALIDADE_IHM: LocalTables.RAW_QUALIDADE_IHM.value,
+        }
+
+    # ======================================================================== Funções Auxiliares #
+    @staticmethod
+    def __restore_types(df: pd.DataFrame | None) -> pd.DataFrame | None:
+        """Restaura os tipos de data e hora, armazenados como texto ISO no SQLite."""
+        if df is None:
+            return None
+
+        df.data_registro = pd.to_datetime(df.data_registro).dt.date
+        df.hora_registro = (pd.Timestamp(0) + pd.to_timedelta(df.hora_registro)).dt.time
+
+        return df
+
+    @staticmethod
+    def normalize(data: pd.DataFrame) -> pd.DataFrame:
+        """Converte data e hora de registro para texto ISO, garantindo a ordenação no SQLite."""
+        data = data.copy()
+        data.data_registro = pd.to_datetime(data.data_registro).dt.strftime("%Y-%m-%d")
+        data.hora_registro = data.hora_registro.astype(str)
+        return data
+
+    # ================================================================================ Watermark #
+    def get_watermark(self, source: RawSource) -> dict | None:
+        """Retorna o watermark atual da tabela, ou None caso ainda não exista."""
+        self.__db_automacao_local.create_table(self.__watermark_table)
+        df = self.__db_automacao_local.get_query(
+            f"SELECT * FROM {self.__watermark_table} WHERE tabela = :tabela",
+            {"tabela": source.value},
+        )
+
+        if df is None or df.empty:
+            return None
+
+        return df.iloc[0].to_dict()
+
+    def set_watermark(self, source: RawSource, watermark: dict) -> None:
+        """Grava o watermark da tabela."""
+        self.__db_automacao_local.execute(
+            f"INSERT INTO {self.__watermark_table}"
+            " (tabela, data_registro, hora_registro, recno, atualizado_em)"
+            " VALUES (:tabela, :data_registro, :hora_registro, :recno,"
+            " datetime('now', 'localtime'))"
+            " ON CONFLICT(tabela) DO UPDATE SET"
+            " data_registro = excluded.data_registro,"
+            " hora_registro = excluded.hora_registro,"
+            " recno = excluded.recno,"
+            " atualizado_em = excluded.atualizado_em",
+            {"tabela": source.value, **watermark},
+        )
+
+    # ================================================================================== Escrita #
+    def append_data(self, source: RawSource, data: pd.DataFrame) -> None:
+        """Acrescenta os novos registros na tabela bruta."""
+        self.__db_automacao_local.insert_data(self.normalize(data), self.__tables[source])
+
+    def replace_from(self, source: RawSource, first_day: str, data: pd.DataFrame) -> None:
+        """Substitui os registros a partir da data informada (reconciliação)."""
+        table = self.__tables[source]
+
+        # Na primeira carga a tabela ainda não existe
+        if not self.__db_automacao_local.table_exists(table):
+            self.__db_automacao_local.insert_data(self.normalize(data), table)
+            return
+
+        self.__db_automacao_local.replace_where(
+            self.normalize(data), table, "data_registro >= :first_day", {"first_day": first_day}
+        )
+
+    def delete_before(self, source: RawSource, first_day: str) -> None:
+        """Remove os registros anteriores à data informada."""
+        self.__db_automacao_local.execute(
+            f"DELETE FROM {self.__tables[source]} WHERE data_registro < :first_day",
+            {"first_day": first_day},
+        )
+
+    # =================================================================================== Leitura #
+    def get_maquina_info(self, period: tuple) -> pd.DataFrame | None:
+        """Retorna os dados de maquina_info no mesmo formato de MaquinaInfoModel.get_data."""
+        where_, params = period_filter("data_registro", period)
+
+        query = (
+            "SELECT maquina_id, linha, fabrica, status, turno, ciclo_1_min,"
+            " contagem_total_ciclos, contagem_total_produzido, data_registro, hora_registro"
+            f" FROM {self.__tables[RawSource.MAQUINA_INFO]}"
+            f" WHERE {where_}"
+            " ORDER BY data_registro DESC, hora_registro DESC"
+        )
+
+        return self.__restore_types(self.__db_automacao_local.get_query(query, params))
+
+    def get_maquina_info_keys(self, data_registro: str, hora_registro: str) -> pd.DataFrame:
+        """
+        Retorna as chaves (maquina_id, data_registro, hora_registro) dos registros de maquina_info
+        já gravados na data e hora informadas (texto ISO, como no watermark).
+        """
+        df = self.__db_automacao_local.get_query(
+            "SELECT maquina_id, data_registro, hora_registro"
+            f" FROM {self.__tables[RawSource.MAQUINA_INFO]}"
+            " WHERE data_registro = :data_registro AND hora_registro = :hora_registro",
+            {"data_registro": data_registro, "hora_registro": hora_registro},
+        )
+
+        return df if df is not None else pd.DataFrame(columns=RAW_INFO_KEYS)
+
+    def get_production_data(self, period: tuple) -> pd.DataFrame | None:
+        """
+        Retorna os dados de produção no mesmo formato de MaquinaInfoModel.get_production_data.
+
+        Último registro de cada máquina por data e turno.
+        """
+        where_, params = period_filter("data_registro", period)
+
+        query = f"""
+            SELECT * FROM (
+                SELECT
+                    fabrica,
+                    linha,
+                    maquina_id,
+                    turno,
+                    status,
+                    produto,
+                    contagem_total_ciclos as total_ciclos,
+                    contagem_total_produzido as total_produzido,
+                    data_registro,
+                    hora_registro,
+                    produto_id,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY data_registro, turno, maquina_id
+                        ORDER BY data_registro DESC, hora_registro DESC
+                    ) AS rn
+                FROM {self.__tables[RawSource.MAQUINA_INFO]}
+            ) AS t
+            WHERE rn = 1
+            AND {where_}
+            AND hora_registro > '00:01:00'
+            ORDER BY data_registro DESC, linha
+        """
+
+        return self.__restore_types(self.__db_automacao_local.get_query(query, params))
+
+    def get_data(self, source: RawSource, period: tuple) -> pd.DataFrame | None:
+        """Retorna todos os registros brutos da tabela no período (maquina_ihm/qualidade_ihm)."""
+        where_, params = period_filter("data_registro", period)
+
+        query = f"SELECT * FROM {self.__tables[source]} WHERE {where_}"
+
+        return self.__restore_types(self.__db_automacao_local.get_query(query, params))
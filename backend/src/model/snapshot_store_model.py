@@ -0,0 +1,134 @@
+"""
+Módulo de modelo para os snapshots colunares das tabelas derivadas do banco de dados local.
+
+A cada atualização de uma tabela (info_ihm, producao, eficiencia...) é gravada uma nova versão
+completa em Arrow IPC, em SNAPSHOT_DIR/<tabela>/<versão>.arrow. O arquivo é escrito com outro nome
+e renomeado ao final, de forma que os leitores só encontram versões completas. A leitura abre a
+versão mais recente por memory-map (sem cópia) e converte para pandas apenas as colunas pedidas.
+
+A versão do snapshot é a versão da tabela no banco local (table_version) no momento da gravação,
+a mesma registrada no change_log: o ETag de uma rota é o mesmo com ou sem snapshot e as mudanças
+desde ele podem ser lidas do change_log.
+"""
+
+import os
+import time
+
+import pandas as pd
+import pyarrow as pa
+
+# pylint: disable=import-error
+from src.helpers.paths import SNAPSHOT_DIR
+from src.helpers.variables import LOCAL_ORDER_BY, SNAPSHOT_KEEP
+from src.model.db_automacao_local_model import DBAutomacaoLocalModel, from_stored, to_stored
+
+SNAPSHOT_EXTENSION = ".arrow"
+
+
+class SnapshotStoreModel:
+    """Classe que grava e lê os snapshots Arrow IPC de uma tabela do banco de dados local."""
+
+    def __init__(self, table: str) -> None:
+        self.__table = table
+        self.__dir = os.path.join(SNAPSHOT_DIR, table)
+        self.__db_automacao_local = DBAutomacaoLocalModel()
+
+    def write(self, data: pd.DataFrame) -> int | None:
+        """
+        Grava uma nova versão do snapshot da tabela.
+
+        Os dados são gravados na mesma forma e ordem em que são lidos do banco local, para que
+        as rotas retornem o mesmo conteúdo com ou sem snapshot.
+
+        Returns:
+            int | None: Versão gravada (a versão atual da tabela no banco local), ou None em caso
+            de erro.
+        """
+        try:
+            os.makedirs(self.__dir, exist_ok=True)
+
+            data = to_stored(data, self.__table)
+            if self.__table in LOCAL_ORDER_BY:
+                data = data.sort_values(by=list(LOCAL_ORDER_BY[self.__table]), kind="stable")
+
+            table = pa.Table.from_pandas(data, preserve_index=False)
+
+            version = self.__db_automacao_local.get_version(self.__table)
+            if version is None:
+                version = time.time_ns()
+
+            path = self.__path(version)
+            temp_path = f"{path}.tmp"
+
+            with pa.OSFile(temp_path, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+
+            os.replace(temp_path, path)
+            self.__prune()
+
+            return version
+
+        # pylint: disable=W0718
+        except Exception as error:
+            print(f"Erro ao gravar o snapshot: {error}")
+            return None
+
+    def read(self, columns: list[str] | None = None) -> pd.DataFrame | None:
+        """
+        Lê a versão mais recente do snapshot.
+
+        Args:
+            columns (list[str], optional): Colunas a serem lidas. Padrão: todas.
+
+        Returns:
+            pd.DataFrame | None: Dados do snapshot, ou None se não houver snapshot.
+        """
+        version = self.get_version()
+        if version is None:
+            return None
+
+        try:
+            with pa.memory_map(self.__path(version)) as source:
+                table = pa.ipc.open_file(source).read_all()
+
+                if columns is not None:
+                    table = table.select(columns)
+
+                # Sem os metadados do pandas, os tipos são os mesmos da leitura do banco local
+                return from_stored(table.to_pandas(ignore_metadata=True), self.__table)
+
+        # pylint: disable=W0718
+        except Exception as error:
+            print(f"Erro ao ler o snapshot: {error}")
+            return None
+
+    def get_version(self) -> int | None:
+        """Retorna a versão mais recente do snapshot (None se não houver)."""
+        versions = self.__versions()
+        return versions[-1] if versions else None
+
+    # ==================================== Funções Auxiliares ==================================== #
+    def __path(self, version: int) -> str:
+        """Caminho do arquivo da versão."""
+        return os.path.join(self.__dir, f"{version}{SNAPSHOT_EXTENSION}")
+
+    def __versions(self) -> list[int]:
+        """Versões gravadas, em ordem crescente."""
+        if not os.path.isdir(self.__dir):
+            return []
+
+        return sorted(
+            int(name.removesuffix(SNAPSHOT_EXTENSION))
+            for name in os.listdir(self.__dir)
+            if name.endswith(SNAPSHOT_EXTENSION)
+        )
+
+    def __prune(self) -> None:
+        """Remove as versões antigas, mantendo as SNAPSHOT_KEEP mais recentes."""
+        for version in self.__versions()[:-SNAPSHOT_KEEP]:
+            try:
+                os.remove(self.__path(version))
+            # No Windows, uma versão ainda aberta por um leitor não pode ser removida
+            except OSError:
+                continue
@@ -4,7 +4,7 @@
 from typing import List
 
 import pandas as pd
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, ValidationError
 from src.controller.action_plan_controller import ActionPlanController
@@ -16,7 +16,10 @@ from src.controller.info_ihm_controller import InfoIHMController
 from src.controller.performance_controller import PerformanceController
 from src.controller.production_controller import ProductionController
 from src.controller.reparo_controller import ReparoController
+from src.database.query import TableQuery
+from src.helpers.scheduler_tasks import backfill_history
 from src.model.error_response import ErrorResponse
+from src.router.query_params import table_query
 
 # ===================================================================================== Instâncias #
 local_router = APIRouter()
@@ -29,6 +32,15 @@ reparo_controller = ReparoController()
 historic_ind_controller = HistoricIndController()
 action_plan_controller = ActionPlanController()
 
+# Tabelas atualizadas por partição, com as mudanças disponíveis em /{table}/changes
+changes_controllers = {
+    "production": production_controller,
+    "info_ihm": info_ihm_controller,
+    "efficiency": efficiency_controller,
+    "performance": performance_controller,
+    "reparo": reparo_controller,
+}
+
 # =========================================================================== Documentação De Erro #
 description_500 = dict(
     {
@@ -102,6 +114,13 @@ class ActionPlanDelete(BaseModel):
     index: list[int]
 
 
+class HistoricIndBackfill(BaseModel):
+    """Modelo de dados para o preenchimento retroativo do histórico de indicadores."""
+
+    months: list[str]
+    force: bool = False
+
+
 # ========================================================================================== Rotas #
 
 
@@ -109,18 +128,31 @@ class ActionPlanDelete(BaseModel):
     "/production",
     summary="Retorna os dados de produção do DB local - mês corrente.",
     responses={
+        304: {"description": "Not Modified (If-None-Match com o ETag da versão atual)"},
+        400: {"description": "Bad Request", **description_400},
         404: {"description": "Data not found", **description_404},
         500: {"description": "Internal Server Error", **description_500},
     },
 )
-def get_production() -> JSONResponse:
+def get_production(query: TableQuery = Depends(table_query)) -> JSONResponse:
     """Retorna os dados de produção do DB local - mês corrente.
 
+    Os filtros, as colunas e a paginação são aplicados na consulta ao DB local. Com limit, o
+    cursor da próxima página vem no cabeçalho X-Next-Cursor.
+
+    Args:
+    query (TableQuery): Período, linhas, turnos, fábricas, máquinas, colunas e paginação.
+
     Returns:
     JSONResponse: Dados de produção do DB local - mês corrente.
     """
     try:
-        return production_controller.get_data()
+        return production_controller.get_data(query)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=[{"loc": ["query"], "msg": str(e), "type": "value_error"}],
+        ) from e
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -132,18 +164,31 @@ def get_production() -> JSONResponse:
     "/info_ihm",
     summary="Retorna os dados de info_ihm do DB local - mês corrente.",
     responses={
+        304: {"description": "Not Modified (If-None-Match com o ETag da versão atual)"},
+        400: {"description": "Bad Request", **description_400},
         404: {"description": "Data not found", **description_404},
         500: {"description": "Internal Server Error", **description_500},
     },
 )
-def get_info_ihm() -> JSONResponse:
+def get_info_ihm(query: TableQuery = Depends(table_query)) -> JSONResponse:
     """Retorna os dados de info_ihm do DB local - mês corrente.
 
+    Os filtros, as colunas e a paginação são aplicados na consulta ao DB local. Com limit, o
+    cursor da próxima página vem no cabeçalho X-Next-Cursor.
+
+    Args:
+    query (TableQuery): Período, linhas, turnos, fábricas, máquinas, colunas e paginação.
+
     Returns:
     JSONResponse: Dados de info_ihm do DB local - mês corrente.
     """
     try:
-        return info_ihm_controller.get_data()
+        return info_ihm_controller.get_data(query)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=[{"loc": ["query"], "msg": str(e), "type": "value_error"}],
+        ) from e
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -155,18 +200,31 @@ def get_info_ihm() -> JSONResponse:
     "/efficiency",
     summary="Retorna os dados de eficiência do DB local - mês corrente.",
     responses={
+        304: {"description": "Not Modified (If-None-Match com o ETag da versão atual)"},
+        400: {"description": "Bad Request", **description_400},
         404: {"description": "Data not found", **description_404},
         500: {"description": "Internal Server Error", **description_500},
     },
 )
-def get_efficiency() -> JSONResponse:
+def get_efficiency(query: TableQuery = Depends(table_query)) -> JSONResponse:
     """Retorna os dados de eficiência do DB local - mês corrente.
 
+    Os filtros, as colunas e a paginação são aplicados na consulta ao DB local. Com limit, o
+    cursor da próxima página vem no cabeçalho X-Next-Cursor.
+
+    Args:
+    query (TableQuery): Período, linhas, turnos, fábricas, máquinas, colunas e paginação.
+
     Returns:
     JSONResponse: Dados de eficiência do DB local - mês corrente.
     """
     try:
-        return efficiency_controller.get_data()
+        return efficiency_controller.get_data(query)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=[{"loc": ["query"], "msg": str(e), "type": "value_error"}],
+        ) from e
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -178,18 +236,31 @@ def get_efficiency() -> JSONResponse:
     "/performance",
     summary="Retorna os dados de performance do DB local - mês corrente.",
     responses={
+        304: {"description": "Not Modified (If-None-Match com o ETag da versão atual)"},
+        400: {"description": "Bad Request", **description_400},
         404: {"description": "Data not found", **description_404},
         500: {"description": "Internal Server Error", **description_500},
     },
 )
-def get_performance() -> JSONResponse:
+def get_performance(query: TableQuery = Depends(table_query)) -> JSONResponse:
     """Retorna os dados de performance do DB local - mês corrente.
 
+    Os filtros, as colunas e a paginação são aplicados na consulta ao DB local. Com limit, o
+    cursor da próxima página vem no cabeçalho X-Next-Cursor.
+
+    Args:
+    query (TableQuery): Período, linhas, turnos, fábricas, máquinas, colunas e paginação.
+
     Returns:
     JSONResponse: Dados de performance do DB local - mês corrente.
     """
     try:
-        return performance_controller.get_data()
+        return performance_controller.get_data(query)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=[{"loc": ["query"], "msg": str(e), "type": "value_error"}],
+        ) from e
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -201,18 +272,31 @@ def get_performance() -> JSONResponse:
     "/reparo",
     summary="Retorna os dados de reparo do DB local - mês corrente.",
     responses={
+        304: {"description": "Not Modified (If-None-Match com o ETag da versão atual)"},
+        400: {"description": "Bad Request", **description_400},
         404: {"description": "Data not found", **description_404},
         500: {"description": "Internal Server Error", **description_500},
     },
 )
-def get_reparo() -> JSONResponse:
+def get_reparo(query: TableQuery = Depends(table_query)) -> JSONResponse:
     """Retorna os dados de reparo do DB local - mês corrente.
 
+    Os filtros, as colunas e a paginação são aplicados na consulta ao DB local. Com limit, o
+    cursor da próxima página vem no cabeçalho X-Next-Cursor.
+
+    Args:
+    query (TableQuery): Período, linhas, turnos, fábricas, máquinas, colunas e paginação.
+
     Returns:
     JSONResponse: Dados de reparo do DB local - mês corrente.
     """
     try:
-        return reparo_controller.get_data()
+        return reparo_controller.get_data(query)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=[{"loc": ["query"], "msg": str(e), "type": "value_error"}],
+        ) from e
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -220,10 +304,48 @@ def get_reparo() -> JSONResponse:
         ) from e
 
 
+@local_router.get(
+    "/{table}/changes",
+    summary="Retorna as mudanças de uma tabela do DB local desde uma versão.",
+    responses={
+        404: {"description": "Data not found", **description_404},
+        500: {"description": "Internal Server Error", **description_500},
+    },
+)
+def get_changes(
+    table: str,
+    since: int = Query(..., ge=0, description="Versão dos dados em cache (ETag recebido)"),
+) -> JSONResponse:
+    """Retorna as mudanças de uma tabela do DB local desde uma versão.
+
+    Tabelas: production, info_ihm, efficiency, performance e reparo. Com full verdadeiro, o
+    cliente deve recarregar a tabela completa pela rota da tabela.
+
+    Args:
+    table (str): Rota da tabela.
+    since (int): Versão dos dados em cache (ETag recebido, sem W/ e aspas).
+
+    Returns:
+    JSONResponse: Versão atual, partições alteradas e removidas e linhas das alteradas.
+    """
+    controller = changes_controllers.get(table)
+    if controller is None:
+        return JSONResponse(status_code=404, content={"message": "Data not found."})
+
+    try:
+        return controller.get_changes(since)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=[{"loc": ["query", "since"], "msg": str(e), "type": "server_error"}],
+        ) from e
+
+
 @local_router.get(
     "/historic_ind",
     summary="Retorna os dados de historic_ind do DB local - mês corrente.",
     responses={
+        304: {"description": "Not Modified (If-None-Match com o ETag da versão atual)"},
         404: {"description": "Data not found", **description_404},
         500: {"description": "Internal Server Error", **description_500},
     },
@@ -243,10 +365,73 @@ def get_historic_ind() -> JSONResponse:
         ) from e
 
 
+@local_router.get(
+    "/historic_ind/builds",
+    summary="Retorna as execuções da criação do histórico de indicadores (duração e status).",
+    responses={
+        404: {"description": "Data not found", **description_404},
+        500: {"description": "Internal Server Error", **description_500},
+    },
+)
+def get_historic_ind_builds() -> JSONResponse:
+    """Retorna as execuções da criação do histórico de indicadores.
+
+    Returns:
+    JSONResponse: Mês, início, duração (s) e status de cada execução.
+    """
+    try:
+        return historic_ind_controller.get_builds()
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=[{"loc": ["query", "start"], "msg": str(e), "type": "server_error"}],
+        ) from e
+
+
+@local_router.post(
+    "/historic_ind/backfill",
+    status_code=202,
+    summary="Cria em segundo plano o histórico de indicadores de meses anteriores.",
+    responses={
+        400: {"description": "Bad Request", **description_400},
+        500: {"description": "Internal Server Error", **description_500},
+    },
+)
+def backfill_historic_ind(data: HistoricIndBackfill) -> JSONResponse:
+    """Cria em segundo plano o histórico de indicadores dos meses informados.
+
+    Os meses já presentes no histórico são ignorados, a menos que force seja verdadeiro. O
+    andamento pode ser acompanhado em /historic_ind/builds.
+
+    Args:
+        data (HistoricIndBackfill): Meses (AAAA-MM) e se os meses existentes devem ser recriados.
+
+    Returns:
+        JSONResponse: Meses agendados.
+    """
+    try:
+        months = sorted({str(pd.Period(month, "M")) for month in data.months})
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=[{"loc": ["body", "months"], "msg": str(e), "type": "value_error"}],
+        ) from e
+
+    try:
+        backfill_history(months, data.force)
+        return JSONResponse(status_code=202, content={"months": months, "force": data.force})
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=[{"loc": ["body", "months"], "msg": str(e), "type": "server_error"}],
+        ) from e
+
+
 @local_router.get(
     "/action_plan",
     summary="Retorna os dados de action_plan do DB local.",
     responses={
+        304: {"description": "Not Modified (If-None-Match com o ETag da versão atual)"},
         404: {"description": "Data not found", **description_404},
         500: {"description": "Internal Server Error", **description_500},
     },
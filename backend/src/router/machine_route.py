@@ -1,14 +1,16 @@
 """Rotas de dados vindos das máquinas."""
 
 # ==================================================================================== Importações #
-from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse, StreamingResponse
 
 # pylint: disable=import-error
 from src.controller.maquina_ihm_controller import MaquinaIHMController
 from src.controller.maquina_info_controller import MaquinaInfoController
 from src.controller.maquina_qualidade_controller import MaquinaQualidadeController
+from src.database.query import TableQuery
 from src.model.error_response import ErrorResponse
+from src.router.query_params import frame_filter
 
 # ===================================================================================== Instâncias #
 machine_router = APIRouter()
@@ -44,11 +46,31 @@ description_404 = dict(
     },
 )
 
+description_400 = dict(
+    {
+        "model": ErrorResponse,
+        "content": {
+            "application/json": {
+                "example": {
+                    "detail": [
+                        {
+                            "loc": ["query"],
+                            "msg": "Colunas inexistentes: coluna",
+                            "type": "value_error",
+                        }
+                    ]
+                }
+            }
+        },
+    },
+)
+
 
 # ========================================================================================== Rotas #
 @machine_router.get(
     "/maquina_ihm",
     responses={
+        400: {"description": "Bad Request", **description_400},
         404: {"description": "Data not found", **description_404},
         500: {"description": "Internal Server Error", **description_500},
     },
@@ -57,18 +79,25 @@ description_404 = dict(
 def get_maquina_ihm(
     start: str = Query(..., description="Data de início no formato %Y-%m-%d"),
     end: str = Query(..., description="Data de fim no formato %Y-%m-%d"),
+    query: TableQuery = Depends(frame_filter),
 ) -> JSONResponse:
     """Retorna os dados da máquina IHM no intervalo de datas especificado.
 
     Args:
     start (str): Data de início no formato %Y-%m-%d.
     end (str): Data de fim no formato %Y-%m-%d.
+    query (TableQuery): Linhas, turnos, fábricas, máquinas e colunas retornadas.
 
     Returns:
     JSONResponse: Dados da máquina IHM no intervalo de datas especificado.
     """
     try:
-        return maquina_ihm_controller.get_data((start, end))
+        return maquina_ihm_controller.get_data((start, end), query)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=[{"loc": ["query"], "msg": str(e), "type": "value_error"}],
+        ) from e
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -81,6 +110,7 @@ def get_maquina_ihm(
     "/maquina_info",
     summary="Retorna os dados da máquina info no intervalo de datas especificado.",
     responses={
+        400: {"description": "Bad Request", **description_400},
         404: {"description": "Data not found", **description_404},
         500: {"description": "Internal Server Error", **description_500},
     },
@@ -88,18 +118,59 @@ def get_maquina_ihm(
 def get_maquina_info(
     start: str = Query(..., description="Data de início no formato %Y-%m-%d"),
     end: str = Query(..., description="Data de fim no formato %Y-%m-%d"),
+    query: TableQuery = Depends(frame_filter),
 ) -> JSONResponse:
     """Retorna os dados da máquina info no intervalo de datas especificado.
 
     Args:
     start (str): Data de início no formato %Y-%m-%d.
     end (str): Data de fim no formato %Y-%m-%d.
+    query (TableQuery): Linhas, turnos, fábricas, máquinas e colunas retornadas.
 
     Returns:
     JSONResponse: Dados da máquina info no intervalo de datas especificado.
     """
     try:
-        return maquina_info_controller.get_data((start, end))
+        return maquina_info_controller.get_data((start, end), query)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=[{"loc": ["query"], "msg": str(e), "type": "value_error"}],
+        ) from e
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=[{"loc": ["query", "start"], "msg": str(e), "type": "server_error"}],
+        ) from e
+
+
+# ========================================================================= Maquina Info Streaming #
+@machine_router.get(
+    "/maquina_info/stream",
+    summary="Retorna os dados da máquina info em streaming (NDJSON), para intervalos longos.",
+    responses={
+        404: {"description": "Data not found", **description_404},
+        500: {"description": "Internal Server Error", **description_500},
+    },
+)
+def get_maquina_info_stream(
+    start: str = Query(..., description="Data de início no formato %Y-%m-%d"),
+    end: str = Query(..., description="Data de fim no formato %Y-%m-%d"),
+) -> StreamingResponse:
+    """Retorna os dados da máquina info em streaming, um registro JSON por linha.
+
+    Os dados são lidos e tratados em lotes, mantendo o uso de memória constante
+    independentemente do tamanho do intervalo.
+
+    Args:
+    start (str): Data de início no formato %Y-%m-%d.
+    end (str): Data de fim no formato %Y-%m-%d.
+
+    Returns:
+    StreamingResponse: Dados da máquina info no formato NDJSON.
+    """
+    try:
+        return maquina_info_controller.stream_data((start, end))
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -174,6 +245,7 @@ def get_maquina_info_pure(
     "/maquina_qualidade",
     summary="Retorna os dados da máquina qualidade no intervalo de datas especificado.",
     responses={
+        400: {"description": "Bad Request", **description_400},
         404: {"description": "Data not found", **description_404},
         500: {"description": "Internal Server Error", **description_500},
     },
@@ -181,18 +253,25 @@ def get_maquina_info_pure(
 def get_maquina_qualidade(
     start: str = Query(..., description="Data de início no formato %Y-%m-%d"),
     end: str = Query(..., description="Data de fim no formato %Y-%m-%d"),
+    query: TableQuery = Depends(frame_filter),
 ) -> JSONResponse:
     """Retorna os dados da máquina qualidade no intervalo de datas especificado.
 
     Args:
     start (str): Data de início no formato %Y-%m-%d.
     end (str): Data de fim no formato %Y-%m-%d.
+    query (TableQuery): Linhas, turnos, fábricas, máquinas e colunas retornadas.
 
     Returns:
     JSONResponse: Dados da máquina qualidade no intervalo de datas especificado.
     """
     try:
-        return maquina_qualidade_controller.get_data((start, end))
+        return maquina_qualidade_controller.get_data((start, end), query)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=[{"loc": ["query"], "msg": str(e), "type": "value_error"}],
+        ) from e
     except Exception as e:
         raise HTTPException(
             status_code=500,
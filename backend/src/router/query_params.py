@@ -0,0 +1,36 @@
+"""Parâmetros de consulta comuns às rotas de dados (filtro, projeção e paginação)."""
+
+from dataclasses import replace
+
+from fastapi import Depends, Query
+
+# pylint: disable=import-error
+from src.database.query import TableQuery
+
+
+def frame_filter(
+    linha: list[int] | None = Query(None, description="Linhas (repetir o parâmetro)"),
+    turno: list[str] | None = Query(None, description="Turnos (repetir o parâmetro)"),
+    fabrica: list[int] | None = Query(None, description="Fábricas (repetir o parâmetro)"),
+    maquina_id: list[str] | None = Query(None, description="Máquinas (repetir o parâmetro)"),
+    columns: list[str] | None = Query(None, description="Colunas retornadas. Padrão: todas"),
+) -> TableQuery:
+    """Filtro por linha, turno, fábrica e máquina e a projeção das colunas."""
+    return TableQuery(
+        linha=tuple(linha or ()),
+        turno=tuple(turno or ()),
+        fabrica=tuple(fabrica or ()),
+        maquina_id=tuple(maquina_id or ()),
+        columns=tuple(columns or ()),
+    )
+
+
+def table_query(
+    filters: TableQuery = Depends(frame_filter),
+    start: str | None = Query(None, description="Data de início (inclusiva), %Y-%m-%d"),
+    end: str | None = Query(None, description="Data de fim (inclusiva), %Y-%m-%d"),
+    limit: int | None = Query(None, ge=1, description="Linhas por página. Padrão: todas"),
+    cursor: str | None = Query(None, description="Cursor da página (cabeçalho X-Next-Cursor)"),
+) -> TableQuery:
+    """Filtro, projeção, período e paginação das rotas das tabelas locais."""
+    return replace(filters, start=start, end=end, limit=limit, cursor=cursor)
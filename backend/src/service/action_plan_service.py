@@ -17,6 +17,10 @@ class ActionPlanService:
         """Obtém dados do banco de dados local de action plan."""
         return self.__action_plan_model.get_data()
 
+    def get_version(self) -> int | None:
+        """Obtém a versão do conteúdo do banco de dados local de action plan."""
+        return self.__action_plan_model.get_version()
+
     def insert_data(self, data: pd.DataFrame):
         """Insere dados no banco de dados local de action plan."""
         self.__action_plan_model.insert_data(data)
@@ -3,6 +3,8 @@
 import pandas as pd
 
 # pylint: disable=import-error
+from src.database.query import TableQuery
+from src.helpers import schemas
 from src.model.efficiency_model import EfficiencyModel
 
 
@@ -12,9 +14,26 @@ class EfficiencyService:
     def __init__(self) -> None:
         self.__efficiency_model = EfficiencyModel()
 
-    def get_data(self) -> pd.DataFrame:
+    def get_data(self, columns: list[str] | None = None) -> pd.DataFrame:
         """Obtém dados do banco de dados local de eficiência."""
-        return self.__efficiency_model.get_data()
+        return schemas.apply_schema(self.__efficiency_model.get_data(columns))
+
+    def query_data(self, query: TableQuery) -> tuple[pd.DataFrame | None, str | None]:
+        """Obtém os dados filtrados de eficiência (uma página) e o cursor da próxima."""
+        data, cursor = self.__efficiency_model.query_data(query)
+        return schemas.apply_schema(data), cursor
+
+    def get_version(self) -> int | None:
+        """Obtém a versão do conteúdo do banco de dados local de eficiência."""
+        return self.__efficiency_model.get_version()
+
+    def get_changes(self, since: int) -> dict | None:
+        """Obtém as mudanças dos dados de eficiência depois da versão informada."""
+        changes = self.__efficiency_model.get_changes(since)
+        if changes is not None:
+            changes["data"] = schemas.apply_schema(changes["data"])
+
+        return changes
 
     def insert_data(self, data: pd.DataFrame) -> None:
         """Insere dados no banco de dados local de eficiência."""
@@ -23,3 +42,7 @@ class EfficiencyService:
     def replace_data(self, data: pd.DataFrame) -> None:
         """Substitui dados no banco de dados local de eficiência."""
         self.__efficiency_model.replace_data(data)
+
+    def upsert_data(self, data: pd.DataFrame) -> dict | None:
+        """Substitui apenas as partições alteradas no banco de dados local de eficiência."""
+        return self.__efficiency_model.upsert_data(data)
@@ -2,6 +2,9 @@
 
 import pandas as pd
 
+# pylint: disable=import-error
+from src.functions import date_f
+
 
 class CleanData:
     """Helper class for data cleaning."""
@@ -36,11 +39,11 @@ class CleanData:
         df = df.dropna(subset=["maquina_id", "data_registro", "hora_registro"])
 
         # Remover os milissegundos da coluna hora_registro
-        df.hora_registro = df.hora_registro.astype(str).str.split(".").str[0]
+        hora = date_f.time_to_timedelta(df.hora_registro).dt.floor("s")
 
         # Garantir que as colunas de data e hora sejam do tipo correto
         df.data_registro = pd.to_datetime(df.data_registro)
-        df.hora_registro = pd.to_datetime(df.hora_registro, format="%H:%M:%S").dt.time
+        df.hora_registro = date_f.timedelta_to_time(hora)
 
         # Substitui os valores NaN por 0 e depois converte para inteiro
         df.linha = df.linha.fillna(0).astype(int)
@@ -1,9 +1,12 @@
 """Módulo que gera indicadores de eficiência, performance e reparos."""
 
+from datetime import datetime
+
 import numpy as np
 import pandas as pd
 
 # pylint: disable=import-error
+from src.helpers import schemas
 from src.helpers.variables import (
     AF_REP,
     CICLOS_BOLINHA,
@@ -17,6 +20,12 @@ from src.helpers.variables import (
 )
 from src.service.functions.production_times import ProductionTimes
 
+# Chaves do agrupamento das paradas e da junção com a produção
+KEYS = ["maquina_id", "linha", "data_registro", "turno"]
+
+# Valores calculados para cada indicador
+VALUE_COLUMNS = ["tempo", "desconto", "excedente"]
+
 
 class IndProd:
     """Classe responsável por gerar indicadores de eficiência, performance e reparos."""
@@ -38,6 +47,37 @@ class IndProd:
         """
         Calcula os indicadores de eficiência, performance e reparos.
         """
+        return self.get_all_indicators(df_info, df_prod, [indicator])[indicator]
+
+    def get_all_indicators(
+        self,
+        df_info: pd.DataFrame,
+        df_prod: pd.DataFrame,
+        indicators: list[IndicatorType] | None = None,
+        now: datetime | None = None,
+    ) -> dict[IndicatorType, pd.DataFrame]:
+        """
+        Calcula os indicadores de eficiência, performance e reparos em uma única passagem.
+
+        A filtragem das paradas, o agrupamento e a junção com a produção são feitos uma única
+        vez; o tempo, o desconto e o excedente de cada indicador são calculados lado a lado.
+
+        Args:
+            df_info (pd.DataFrame): Dados de info/IHM.
+            df_prod (pd.DataFrame): Dados de produção.
+            indicators (list[IndicatorType], optional): Indicadores a calcular. Padrão:
+                eficiência, performance e reparos.
+            now (datetime, optional): Momento de referência do tempo esperado. Padrão: agora.
+
+        Returns:
+            dict[IndicatorType, pd.DataFrame]: Dados de cada indicador.
+        """
+        indicators = indicators or [
+            IndicatorType.EFFICIENCY,
+            IndicatorType.PERFORMANCE,
+            IndicatorType.REPAIR,
+        ]
+        now = now or datetime.now()
 
         # Pega apenas as paradas
         df_stops = df_info[df_info.status == "parada"]
@@ -58,47 +98,65 @@ class IndProd:
         }
 
         # Ajuste de parada programada para perf e reparos para ser np.nan - Feito nos ajustes
-        paradas_programadas = pd.Series()
-        if indicator != IndicatorType.EFFICIENCY:
-            mask = (df_stops.causa.isin(["Sem Produção", "Backup", "Programação"])) & (
-                df_stops.tempo >= 478
-            )
-            paradas_programadas = df_stops[mask][["data_registro", "turno", "linha"]]
-
-        # ================================== Calcula O Indicador ================================= #
-        # Calcula o tempo de desconto
-        df_stops = self.__production_times.get_discount_time(
-            df_stops, desc_dict[indicator], skip_dict[indicator], indicator
+        mask = (df_stops.causa.isin(["Sem Produção", "Backup", "Programação"])) & (
+            df_stops.tempo >= 478
         )
+        paradas_programadas = df_stops[mask][["data_registro", "turno", "linha"]]
+
+        # ================================== Calcula Os Descontos ================================ #
+        # Tempo, desconto e excedente de cada indicador lado a lado. As paradas que não são
+        # consideradas no indicador entram com 0
+        df_stops_ind = df_stops[KEYS].copy()
+        for indicator in indicators:
+            df_discount, included = self.__production_times.get_discount(
+                df_stops, desc_dict[indicator], skip_dict[indicator], indicator
+            )
+            for column in VALUE_COLUMNS:
+                df_stops_ind[f"{column}_{indicator.value}"] = df_discount[column].where(
+                    included, 0
+                )
 
         # Agrupa para ter o valor total de tempo e de desconto
-        df_stops = (
-            df_stops.groupby(["maquina_id", "linha", "data_registro", "turno"], observed=False)
-            .agg(
-                tempo=("tempo", "sum"),
-                desconto=("desconto", "sum"),
-                excedente=("excedente", "sum"),
-            )
-            .reset_index()
-        )
+        df_stops_ind = df_stops_ind.groupby(KEYS, observed=True).sum().reset_index()
 
         # Ajusta a data por garantia
-        df_stops.data_registro = pd.to_datetime(df_stops.data_registro)
+        df_stops_ind.data_registro = pd.to_datetime(df_stops_ind.data_registro)
         df_prod.data_registro = pd.to_datetime(df_prod.data_registro)
 
         # Une os dois dataframes
-        df = pd.merge(
-            df_prod,
-            df_stops,
-            how="left",
-            on=["maquina_id", "linha", "data_registro", "turno"],
-        )
+        df_merged = pd.merge(df_prod, df_stops_ind, how="left", on=KEYS)
 
         # Preenche os valores nulos
-        df = df.fillna(0)
+        df_merged = schemas.fill_missing(df_merged, 0)
+
+        # ================================= Calcula Os Indicadores =============================== #
+        indicator_columns = [
+            f"{column}_{indicator.value}" for indicator in indicators for column in VALUE_COLUMNS
+        ]
+
+        result = {}
+        for indicator in indicators:
+            df = df_merged.drop(columns=indicator_columns).assign(
+                **{column: df_merged[f"{column}_{indicator.value}"] for column in VALUE_COLUMNS}
+            )
+            # Restaura os tipos perdidos nas junções
+            result[indicator] = schemas.apply_schema(
+                self.__get_indicator(df, indicator, paradas_programadas.copy(), now)
+            )
+
+        return result
+
+    def __get_indicator(
+        self,
+        df: pd.DataFrame,
+        indicator: IndicatorType,
+        paradas_programadas: pd.DataFrame,
+        now: datetime,
+    ) -> pd.DataFrame:
+        """Calcula um indicador a partir da produção unida ao tempo, desconto e excedente."""
 
         # Nova coluna para o tempo esperado de produção
-        df = self.__production_times.get_expected_production_time(df)
+        df = self.__production_times.get_expected_production_time(df, now)
 
         # Dict de funções para ajustes dos indicadores
         adjust_dict = {
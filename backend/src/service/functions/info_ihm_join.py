@@ -1,46 +1,61 @@
 """Módulo responsável por unir as tabelas info e ihm."""
 
+import hashlib
+
 import numpy as np
 import pandas as pd
 
+# pylint: disable=import-error
+from src.functions import date_f
+from src.helpers import schemas
+
+# Tolerância da união dos registros de info com os de ihm
+TOLERANCE = pd.Timedelta("3m30sec")
+
 
 class InfoIHMJoin:
     """Classe responsável por unir as tabelas info e ihm.
 
+    Além da união completa (join_data), a classe tem um modo incremental (update), em que os
+    grupos de status já fechados são mantidos entre as execuções e apenas o final de cada linha é
+    reprocessado junto com os novos registros. O resultado é o mesmo da união completa.
+
     Args:
-        df_ihm (pd.DataFrame): DataFrame contendo os dados da IHM.
-        df_info (pd.DataFrame): DataFrame contendo os dados de informações.
+        df_ihm (pd.DataFrame, optional): DataFrame contendo os dados da IHM.
+        df_info (pd.DataFrame, optional): DataFrame contendo os dados de informações.
     """
 
-    def __init__(self, df_ihm: pd.DataFrame, df_info: pd.DataFrame) -> None:
+    def __init__(
+        self, df_ihm: pd.DataFrame | None = None, df_info: pd.DataFrame | None = None
+    ) -> None:
         self.df_ihm = df_ihm
         self.df_info = df_info
+        self.__reset()
 
-    def __df_join(self) -> pd.DataFrame:
-        """Une os DataFrames de info e ihm."""
-        # Define os DataFrames
-        df_ihm = self.df_ihm.copy()
-        df_info = self.df_info.copy()
+    @staticmethod
+    def __parse_dates(df: pd.DataFrame) -> pd.DataFrame:
+        """Ajusta a data e a hora de registro e cria a coluna de data e hora (data_hora)."""
+        df = df.copy()
 
         # Ajustar os dados - Data de registro
-        df_ihm.data_registro = pd.to_datetime(df_ihm.data_registro)
-        df_info.data_registro = pd.to_datetime(df_info.data_registro)
+        df.data_registro = pd.to_datetime(df.data_registro)
 
         # Ajustar os dados - Hora de registro
-        df_ihm.hora_registro = pd.to_datetime(df_ihm.hora_registro, format="%H:%M:%S").dt.time
-        df_info.hora_registro = pd.to_datetime(df_info.hora_registro, format="%H:%M:%S").dt.time
+        hora = date_f.time_to_timedelta(df.hora_registro)
+        df.hora_registro = date_f.timedelta_to_time(hora)
 
         # Criar dados - Coluna de Data e Hora de registro
-        df_ihm["data_hora"] = pd.to_datetime(
-            df_ihm.data_registro.astype(str) + " " + df_ihm.hora_registro.astype(str)
-        )
-        df_info["data_hora"] = pd.to_datetime(
-            df_info.data_registro.astype(str) + " " + df_info.hora_registro.astype(str)
-        )
+        df["data_hora"] = df.data_registro + hora
+
+        return df
+
+    @staticmethod
+    def __df_join(df_ihm: pd.DataFrame, df_info: pd.DataFrame) -> pd.DataFrame:
+        """Une os DataFrames de info e ihm (já com a coluna data_hora)."""
 
         # Classificar os dados - Data e Hora de registro
-        df_ihm = df_ihm.sort_values(by="data_hora")
-        df_info = df_info.sort_values(by="data_hora")
+        df_ihm = df_ihm.sort_values(by="data_hora", kind="stable")
+        df_info = df_info.sort_values(by="data_hora", kind="stable")
 
         # Juntar os DataFrames
         df = pd.merge_asof(
@@ -49,7 +64,7 @@ class InfoIHMJoin:
             on="data_hora",
             by="maquina_id",
             direction="nearest",
-            tolerance=pd.Timedelta("3m30sec"),
+            tolerance=TOLERANCE,
         )
 
         return df
@@ -89,14 +104,49 @@ class InfoIHMJoin:
             "hora_registro_ihm",
         ]
 
-        # Preencher os valores
-        df[fill_cols] = df.groupby("group")[fill_cols].ffill()
-        df[fill_cols] = df.groupby("group")[fill_cols].bfill()
-
-        # Se os dado de uma coluna for '' ou ' ', substituir por NaN
-        df = df.replace(r"^s*$", None, regex=True)
-        # O ^ indica o início de uma string, o $ indica o fim de uma string,
-        # e s* zero ou mais espaços em branco
+        # Colunas de texto da IHM, que podem vir em branco
+        text_cols = fill_cols[:7]
+
+        # Posição de cada registro e do primeiro e último registro do seu grupo
+        size = len(df)
+        position = np.arange(size)
+        group = df.group.to_numpy()
+        start = np.flatnonzero(np.r_[True, group[1:] != group[:-1]][:size])
+        length = np.diff(np.r_[start, size])
+        first = np.repeat(start, length)
+        last = np.repeat(start + length - 1, length)
+
+        for col in fill_cols:
+            # Cada valor distinto vira um código inteiro (-1 para nulo)
+            codes, uniques = df[col].factorize()
+            valid = codes >= 0
+
+            # Preencher os valores - último valor anterior do grupo (ffill) ou, se não houver,
+            # o próximo valor do grupo (bfill)
+            previous = np.maximum.accumulate(np.where(valid, position, -1))
+            following = np.minimum.accumulate(np.where(valid, position, size)[::-1])[::-1]
+            source = np.where(
+                previous >= first, previous, np.where(following <= last, following, -1)
+            )
+            codes = np.where(source >= 0, codes[source], -1)
+
+            values = uniques.array.take(codes, allow_fill=True)
+
+            # Se os dado de uma coluna for '' ou ' ', substituir por None
+            # O ^ indica o início de uma string, o $ indica o fim de uma string,
+            # e \s* zero ou mais espaços em branco
+            if col in text_cols and (
+                uniques.dtype == object or isinstance(uniques.dtype, pd.CategoricalDtype)
+            ):
+                blank = pd.Series(uniques.astype(object)).str.contains(r"^\s*$", na=False)
+                if blank.any():
+                    if uniques.dtype == object:
+                        values = np.asarray(values, dtype=object)
+                    else:
+                        values = values.copy()
+                    values[np.isin(codes, np.flatnonzero(blank.to_numpy()))] = None
+
+            df[col] = values
 
         # Ajuste de valores - caso maquina esteja rodando, não há motivo de parada
         mask = df.status == "rodando"
@@ -124,14 +174,9 @@ class InfoIHMJoin:
         return df
 
     @staticmethod
-    def __calculate_time_difference(df):
+    def __group_data(df):
 
-        # Cria coluna para data e hora de registro
-        df["data_hora"] = pd.to_datetime(
-            df.data_registro.astype(str) + " " + df.hora_registro.astype(str)
-        )
-
-        # Agrupa por grupo e calcula a diferença de tempo
+        # Agrupa por grupo
         df = (
             df.groupby(["group"])
             .agg(
@@ -159,11 +204,16 @@ class InfoIHMJoin:
             .reset_index()
         )
 
-        # Coluna com a data e hora 'final'
+        # Coluna com a data e hora 'final' (nula no último grupo de cada máquina)
         df["data_hora_final"] = df.data_hora.shift(-1).where((~df.maquina_id_change).shift(-1))
 
+        return df
+
+    @staticmethod
+    def __calculate_time_difference(df, now: pd.Timestamp | None = None):
+
         # Se a data hora final for nula (último registro), preencher com a data e hora atual
-        now = pd.to_datetime("now").floor("s")
+        now = pd.to_datetime("now").floor("s") if now is None else now
         df.data_hora_final = df.data_hora_final.fillna(now)
 
         # Calcula a diferença de tempo entre data e hora final e inicial
@@ -180,15 +230,12 @@ class InfoIHMJoin:
 
         return df
 
-    # ============================================================================================ #
-    #                                       MÉTODO PRINCIPAL                                       #
-    # ============================================================================================ #
-    def join_data(self) -> pd.DataFrame:
-        """Método principal para unir e limpar os dados."""
+    def __prepare(self, df_ihm: pd.DataFrame, df_info: pd.DataFrame) -> pd.DataFrame:
+        """Une os dados e identifica os grupos de status e de motivo de cada registro."""
 
         # ================================================================================== União #
         # Juntar os DataFrames
-        df = self.__df_join()
+        df = self.__df_join(df_ihm, df_info)
 
         # Ajustar Tipo - Ciclos e Produção
         df.contagem_total_ciclos = df.contagem_total_ciclos.astype("Int64")
@@ -215,6 +262,7 @@ class InfoIHMJoin:
                 "os_numero",
                 "operador_id",
                 "s_backup",
+                "data_hora",
             ]
         ]
 
@@ -230,7 +278,7 @@ class InfoIHMJoin:
         )
 
         # Reordenar
-        df = df.sort_values(by=["linha", "data_registro", "hora_registro"])
+        df = df.sort_values(by=["linha", "data_hora"], kind="stable")
 
         # Reiniciar o index
         df = df.reset_index(drop=True)
@@ -246,10 +294,11 @@ class InfoIHMJoin:
         # Verificar mudança de motivo
         df = self.__handle_reason_changes(df)
 
-        # ======================================================================== Calcula O Tempo #
-        df = self.__calculate_time_difference(df)
+        return df
 
-        # ========================================================================= Ajustes Finais #
+    @staticmethod
+    def __final_adjustments(df: pd.DataFrame) -> pd.DataFrame:
+        """Remove as colunas auxiliares e ajusta a saída para backup."""
         df = df.drop(
             columns=[
                 "maquina_id_change",
@@ -267,4 +316,199 @@ class InfoIHMJoin:
         df.problema = np.where(mask, "Parada Planejada", df.problema)
         df.causa = np.where(mask, "Backup", df.causa)
 
-        return df
+        # Restaura os tipos perdidos nas junções
+        return schemas.apply_schema(df)
+
+    # ============================================================================================ #
+    #                                       MÉTODO PRINCIPAL                                       #
+    # ============================================================================================ #
+    def join_data(self, now: pd.Timestamp | None = None) -> pd.DataFrame:
+        """Método principal para unir e limpar os dados."""
+
+        # Une os dados e identifica os grupos
+        df = self.__prepare(self.__parse_dates(self.df_ihm), self.__parse_dates(self.df_info))
+
+        # ======================================================================== Calcula O Tempo #
+        df = self.__group_data(df)
+        df = self.__calculate_time_difference(df, now)
+
+        # ========================================================================= Ajustes Finais #
+        return self.__final_adjustments(df)
+
+    # ============================================================================================ #
+    #                                       MODO INCREMENTAL                                       #
+    # ============================================================================================ #
+    def update(
+        self, df_ihm: pd.DataFrame, df_info: pd.DataFrame, now: pd.Timestamp | None = None
+    ) -> pd.DataFrame:
+        """
+        Une os dados de forma incremental.
+
+        Recebe os dados completos da janela (como join_data), mas processa apenas os registros
+        posteriores à última execução, junto com o final de cada linha que ainda pode mudar. Os
+        grupos de status anteriores são mantidos da execução anterior.
+
+        Tudo é reprocessado na primeira execução e quando os registros já processados mudam
+        (reconciliação, registros atrasados ou mudança do início da janela). Não há estado
+        incremental se alguma máquina aparecer em mais de uma linha.
+
+        Returns:
+            pd.DataFrame: O mesmo resultado de InfoIHMJoin(df_ihm, df_info).join_data().
+        """
+        self.df_ihm = df_ihm
+        self.df_info = df_info
+        sources = {"ihm": df_ihm, "info": df_info}
+
+        # Hash de cada registro, para verificar se os registros já processados não mudaram
+        hashes = {
+            name: pd.util.hash_pandas_object(df, index=False).to_numpy()
+            for name, df in sources.items()
+        }
+
+        new_rows = self.__get_new_rows(sources, hashes)
+
+        if new_rows is None:
+            # Primeira execução ou registros já processados alterados: reprocessa tudo
+            self.__reset()
+            tail = {name: self.__parse_dates(df) for name, df in sources.items()}
+        else:
+            tail = {
+                name: pd.concat([self.__tail[name], new_rows[name]], ignore_index=True)
+                for name in sources
+            }
+
+        # ======================================================================= Processa O Final #
+        rows = self.__prepare(tail["ihm"], tail["info"])
+        df = self.__group_data(rows)
+
+        # ======================================================================== Guarda O Estado #
+        if self.__check_lines(tail["info"]):
+            self.__digest = {name: self.__get_digest(hashes[name]) for name in sources}
+            self.__watermark = {
+                name: pd.Series(
+                    [self.__watermark.get(name), tail[name].data_hora.max()], dtype="datetime64[ns]"
+                ).max()
+                for name in sources
+            }
+
+            df = self.__close_groups(rows, df, tail)
+
+            # Grupos fechados seguidos dos grupos em aberto de cada linha
+            df = pd.concat([self.__closed, df], ignore_index=True)
+            df = df.sort_values(by="linha", kind="stable").reset_index(drop=True)
+        else:
+            self.__reset()
+
+        # ======================================================================== Calcula O Tempo #
+        df = self.__calculate_time_difference(df, now)
+
+        # ========================================================================= Ajustes Finais #
+        return self.__final_adjustments(df)
+
+    # ==================================== Funções Auxiliares ==================================== #
+    def __reset(self) -> None:
+        """Descarta o estado do modo incremental."""
+        self.__closed: pd.DataFrame | None = None
+        self.__tail: dict[str, pd.DataFrame] = {}
+        self.__watermark: dict[str, pd.Timestamp] = {}
+        self.__digest: dict[str, str] = {}
+        self.__lines = pd.DataFrame(columns=["maquina_id", "linha"])
+
+    @staticmethod
+    def __get_digest(hashes: np.ndarray) -> str:
+        """Assinatura de um conjunto de registros (na ordem em que foram recebidos)."""
+        return hashlib.sha1(hashes.tobytes()).hexdigest()
+
+    def __get_new_rows(
+        self, sources: dict[str, pd.DataFrame], hashes: dict[str, np.ndarray]
+    ) -> dict[str, pd.DataFrame] | None:
+        """
+        Separa os registros posteriores ao watermark da última execução.
+
+        Returns:
+            dict[str, pd.DataFrame] | None: Novos registros de cada tabela, ou None se não houver
+            estado ou se os registros até o watermark não forem os mesmos já processados.
+        """
+        if self.__closed is None:
+            return None
+
+        new_rows = {}
+
+        for name, df in sources.items():
+            watermark = self.__watermark[name]
+
+            # Apenas os registros a partir do dia do watermark têm a hora convertida
+            recent = (pd.to_datetime(df.data_registro) >= watermark.normalize()).to_numpy()
+            df_recent = self.__parse_dates(df[recent])
+
+            new = np.zeros(len(df), dtype=bool)
+            new[recent] = (df_recent.data_hora > watermark).to_numpy()
+
+            if self.__get_digest(hashes[name][~new]) != self.__digest[name]:
+                return None
+
+            new_rows[name] = df_recent[new[recent]]
+
+        return new_rows
+
+    def __check_lines(self, df_info: pd.DataFrame) -> bool:
+        """
+        Verifica se o estado incremental pode ser mantido.
+
+        As linhas são processadas de forma independente, o que exige que cada máquina apareça em
+        uma única linha (na união completa, duas linhas seguidas da mesma máquina se misturam).
+        """
+        self.__lines = pd.concat(
+            [self.__lines, df_info[["maquina_id", "linha"]]], ignore_index=True
+        ).drop_duplicates()
+
+        return (
+            not df_info.empty
+            and self.__lines.notna().all().all()
+            and not self.__lines.maquina_id.duplicated().any()
+        )
+
+    def __close_groups(
+        self, rows: pd.DataFrame, df: pd.DataFrame, tail: dict[str, pd.DataFrame]
+    ) -> pd.DataFrame:
+        """
+        Fecha os grupos que não podem mais mudar e guarda o final de cada linha.
+
+        Em cada linha, o final começa no início do grupo de status que contém o primeiro registro
+        próximo do watermark da IHM (um novo registro da IHM ainda pode ser unido a ele) ou no
+        início do último grupo de status, o que vier antes. Os grupos anteriores são fechados.
+
+        Returns:
+            pd.DataFrame: Grupos em aberto.
+        """
+        line = rows.linha
+        position = pd.Series(np.arange(len(rows)), index=rows.index)
+
+        # Início de grupo de status com data e hora maior que a do registro anterior
+        start = rows[["status_change", "maquina_id_change", "turno_change"]].any(axis=1)
+        start &= rows.data_hora.gt(rows.data_hora.shift()) | line.ne(line.shift())
+
+        # Primeiro registro próximo do watermark da IHM ou último registro de cada linha
+        near_end = rows.data_hora >= self.__watermark["ihm"] - TOLERANCE
+        limit = position.where(near_end).groupby(line).transform("min")
+        limit = limit.fillna(position.groupby(line).transform("max"))
+
+        # Primeiro registro do final de cada linha
+        cut = position.where(start & (position <= limit)).groupby(line).transform("max")
+        closed = position < cut
+
+        closed_groups = df.group.isin(rows.group[closed])
+        self.__closed = pd.concat([self.__closed, df[closed_groups]], ignore_index=True)
+
+        # Registros do final de cada linha, reprocessados na próxima execução
+        first_row = cut.groupby(line).first().astype(int)
+        cut_time = pd.Series(rows.data_hora.to_numpy()[first_row.to_numpy()], index=first_row.index)
+
+        info = tail["info"]
+        ihm = tail["ihm"]
+        self.__tail = {
+            "info": info[info.data_hora >= info.linha.map(cut_time)],
+            "ihm": ihm[ihm.data_hora >= cut_time.min() - TOLERANCE],
+        }
+
+        return df[~closed_groups]
@@ -3,6 +3,9 @@
 import numpy as np
 import pandas as pd
 
+# pylint: disable=import-error
+from src.helpers import schemas
+
 
 class ProdQualidJoin:
     """
@@ -58,7 +61,7 @@ class ProdQualidJoin:
         df = df.rename(columns={"total_produzido": "total_produzido_sensor"})
 
         # Preencher valores nulos
-        df = df.fillna(0)
+        df = schemas.fill_missing(df, 0)
 
         # Calcula produção - caso haja uma diferença maior que 5% entre os valores de produção
         mask = (df.total_ciclos - df.total_produzido_sensor) / df.total_ciclos < 0.05
@@ -93,4 +96,5 @@ class ProdQualidJoin:
         df.bdj_vazias = df.bdj_vazias.astype(int)
         df.bdj_retrabalho = df.bdj_retrabalho.astype(int)
 
-        return df
+        # Restaurar os tipos perdidos na junção
+        return schemas.apply_schema(df)
@@ -8,6 +8,13 @@ import pandas as pd
 # pylint: disable=import-error
 from src.helpers.variables import IndicatorType
 
+# Colunas de texto usadas para identificar os descontos
+TEXT_COLUMNS = ["motivo", "problema", "causa"]
+
+# Hora de início e duração (min) dos turnos
+SHIFT_START = {"NOT": 0, "MAT": 8, "VES": 16}
+SHIFT_DURATION = 480
+
 
 class ProductionTimes:
     """Classe para cálculo de tempo de desconto."""
@@ -25,35 +32,49 @@ class ProductionTimes:
         """
         Calcula o tempo de desconto.
         """
+        df, mask = self.get_discount(df, desc_dict, skip_list, indicator)
+
+        return df[mask].reset_index(drop=True)
+
+    def get_discount(
+        self,
+        df: pd.DataFrame,
+        desc_dict: dict[str, int],
+        skip_list: list[str],
+        indicator: IndicatorType,
+    ) -> tuple[pd.DataFrame, pd.Series]:
+        """
+        Calcula o desconto e o excedente de todas as paradas.
+
+        Returns:
+            tuple[pd.DataFrame, pd.Series]: Paradas com desconto e excedente, e a máscara das
+            paradas consideradas no indicador.
+        """
 
         # Cria uma coluna com o tempo de desconto padrão
         df = df.copy()
         df["desconto"] = 0
 
         # Caso o motivo, problema ou causa não afete o indicador, o desconto é igual a tempo
-        mask = df[["motivo", "problema", "causa"]].apply(lambda x: x.isin(skip_list).any(), axis=1)
-        df.loc[mask, "desconto"] = 0 if indicator == IndicatorType.REPAIR else df.tempo
+        mask = df[TEXT_COLUMNS].isin(skip_list).any(axis=1)
+        if indicator != IndicatorType.REPAIR:
+            df["desconto"] = df.tempo.where(mask, 0)
         # Ajuste para manutenção preventiva
-        if indicator == IndicatorType.REPAIR:
-            df.loc[df["problema"] == "Manutenção Preventiva", "desconto"] = df.tempo
+        else:
+            df["desconto"] = df.tempo.where(df["problema"] == "Manutenção Preventiva", 0)
 
         # Cria um dict para indicadores
         indicator_dict = {
-            IndicatorType.EFFICIENCY: df,
-            IndicatorType.PERFORMANCE: df[~mask],
-            IndicatorType.REPAIR: df[mask],
+            IndicatorType.EFFICIENCY: pd.Series(True, index=df.index),
+            IndicatorType.PERFORMANCE: ~mask,
+            IndicatorType.REPAIR: mask,
         }
 
-        df = indicator_dict[indicator].reset_index(drop=True)
-
         # Aplica o desconto de acordo com as colunas "motivo" ou "problema" ou "causa"
-        for key, value in desc_dict.items():
-            mask = (
-                df[["motivo", "problema", "causa"]]
-                .apply(lambda x, key=key: x.str.contains(key, case=False, na=False))
-                .any(axis=1)
-            )
-            df.loc[mask, "desconto"] = value
+        # (se mais de uma chave for encontrada, vale a última do dicionário)
+        match = self.__match_keys(df, list(desc_dict))
+        discounts = np.array(list(desc_dict.values()) or [0])
+        df["desconto"] = np.where(match >= 0, discounts[np.maximum(match, 0)], df.desconto)
 
         # Caso o desconto seja maior que o tempo, o desconto deve ser igual ao tempo
         df.loc[:, "desconto"] = df[["desconto", "tempo"]].min(axis=1)
@@ -61,42 +82,62 @@ class ProductionTimes:
         # Calcula o excedente, sendo o valor mínimo 0
         df.loc[:, "excedente"] = (df.tempo - df.desconto).clip(lower=0)
 
-        return df
+        return df, indicator_dict[indicator]
 
     @staticmethod
-    def __get_elapsed_time(turno: str) -> int:
+    def __match_keys(df: pd.DataFrame, keys: list[str]) -> np.ndarray:
         """
-        Calcula o tempo decorrido.
+        Retorna, para cada linha, a posição da última chave contida (sem diferenciar maiúsculas)
+        em motivo, problema ou causa, ou -1 se nenhuma chave for encontrada.
 
+        As chaves são procuradas apenas uma vez em cada texto distinto das três colunas, e o
+        resultado é distribuído para as linhas pelos códigos do factorize.
         """
-        # Agora
-        now = datetime.now()
-
-        if turno == "MAT" and 8 <= now.hour < 16:
-            elapsed_time = now - datetime(now.year, now.month, now.day, 8, 0, 0)
-        elif turno == "VES" and 16 <= now.hour < 24:
-            elapsed_time = now - datetime(now.year, now.month, now.day, 16, 0, 0)
-        elif turno == "NOT" and 0 <= now.hour < 8:
-            elapsed_time = now - datetime(now.year, now.month, now.day, 0, 0, 0)
-        else:
-            return 480
+        codes, uniques = pd.factorize(df[TEXT_COLUMNS].to_numpy().ravel())
+        uniques = pd.Series(uniques, dtype=object)
+
+        # A última posição corresponde aos valores nulos (código -1)
+        last_key = np.full(len(uniques) + 1, -1)
+        for position, key in enumerate(keys):
+            contains = uniques.str.contains(key, case=False, na=False).to_numpy(dtype=bool)
+            last_key[:-1][contains] = position
+
+        return last_key[codes].reshape(len(df), len(TEXT_COLUMNS)).max(axis=1, initial=-1)
+
+    @staticmethod
+    def __get_elapsed_time(turno: pd.Series, now: datetime) -> np.ndarray:
+        """
+        Calcula o tempo decorrido (min) do turno em andamento.
+
+        Para os turnos que não estão em andamento, o tempo é o turno completo (480 min).
+        """
+        # Início de cada turno (h), NaN para turnos desconhecidos
+        start = turno.map(SHIFT_START).to_numpy(dtype=float)
+
+        minutes = now.hour * 60 + now.minute + now.second / 60 + now.microsecond / 60_000_000
+        in_shift = (now.hour >= start) & (now.hour < start + SHIFT_DURATION / 60)
 
-        return elapsed_time.total_seconds() / 60
+        return np.where(in_shift, minutes - start * 60, SHIFT_DURATION)
 
-    def get_expected_production_time(self, df: pd.DataFrame) -> pd.DataFrame:
+    def get_expected_production_time(
+        self, df: pd.DataFrame, now: datetime | None = None
+    ) -> pd.DataFrame:
         """
         Calcula o tempo esperado de produção.
+
+        Args:
+            df (pd.DataFrame): Dados com turno, data_registro e desconto.
+            now (datetime, optional): Momento de referência. Padrão: agora (lido uma única vez,
+                de forma que todas as linhas usam o mesmo instante).
         """
-        df["tempo_esperado"] = df.apply(
-            lambda row: max(
-                1,
-                (
-                    np.floor(self.__get_elapsed_time(row.turno) - row.desconto)
-                    if row.data_registro.date() == pd.to_datetime("today").date()
-                    else 480 - row.desconto
-                ),
-            ),
-            axis=1,
-        )
+        now = now or datetime.now()
+
+        # No dia corrente o tempo esperado é o tempo decorrido do turno, nos demais o turno todo
+        today = (pd.to_datetime(df.data_registro).dt.date == now.date()).to_numpy()
+        elapsed = self.__get_elapsed_time(df.turno, now)
+
+        expected = np.where(today, np.floor(elapsed - df.desconto), SHIFT_DURATION - df.desconto)
+
+        df["tempo_esperado"] = np.maximum(1, expected)
 
         return df
@@ -30,6 +30,14 @@ class HistoricIndService:
 
         return data
 
+    def get_months(self) -> set[str]:
+        """Obtém os meses (AAAA-MM) já presentes no Histórico de Indicadores."""
+        return self.__historic_ind_model.get_months()
+
+    def get_version(self) -> int | None:
+        """Obtém a versão do conteúdo do banco de dados local de Histórico de Indicadores."""
+        return self.__historic_ind_model.get_version()
+
     def insert_data(self, data: pd.DataFrame) -> None:
         """Insere dados no banco de dados local de Histórico de Indicadores."""
         self.__historic_ind_model.insert_data(data)
@@ -37,3 +45,20 @@ class HistoricIndService:
     def replace_data(self, data: pd.DataFrame) -> None:
         """Substitui dados no banco de dados local de Histórico de Indicadores."""
         self.__historic_ind_model.replace_data(data)
+
+    def replace_month(self, data: pd.DataFrame, month: str) -> None:
+        """Substitui um mês (AAAA-MM) no banco de dados local de Histórico de Indicadores."""
+        self.__historic_ind_model.replace_month(data, month)
+
+    def get_builds(self) -> pd.DataFrame:
+        """Obtém as execuções da criação do Histórico de Indicadores."""
+        data = self.__historic_ind_model.get_builds()
+
+        if data is None:
+            return pd.DataFrame(columns=["data_registro", "iniciado_em", "duracao", "status"])
+
+        return data
+
+    def insert_build(self, data: pd.DataFrame) -> None:
+        """Registra uma execução da criação do Histórico de Indicadores."""
+        self.__historic_ind_model.insert_build(data)
@@ -3,6 +3,8 @@
 import pandas as pd
 
 # pylint: disable=import-error
+from src.database.query import TableQuery
+from src.helpers import schemas
 from src.model.info_ihm_model import InfoIHMModel
 
 
@@ -12,9 +14,26 @@ class InfoIHMService:
     def __init__(self) -> None:
         self.__info_ihm_model = InfoIHMModel()
 
-    def get_data(self) -> pd.DataFrame:
+    def get_data(self, columns: list[str] | None = None) -> pd.DataFrame:
         """Obtém os dados da tabela local Info/IHM."""
-        return self.__info_ihm_model.get_data()
+        return schemas.apply_schema(self.__info_ihm_model.get_data(columns))
+
+    def query_data(self, query: TableQuery) -> tuple[pd.DataFrame | None, str | None]:
+        """Obtém os dados filtrados da tabela local Info/IHM (uma página) e o cursor da próxima."""
+        data, cursor = self.__info_ihm_model.query_data(query)
+        return schemas.apply_schema(data), cursor
+
+    def get_version(self) -> int | None:
+        """Obtém a versão do conteúdo da tabela local Info/IHM."""
+        return self.__info_ihm_model.get_version()
+
+    def get_changes(self, since: int) -> dict | None:
+        """Obtém as mudanças dos dados da tabela local Info/IHM depois da versão informada."""
+        changes = self.__info_ihm_model.get_changes(since)
+        if changes is not None:
+            changes["data"] = schemas.apply_schema(changes["data"])
+
+        return changes
 
     def insert_data(self, data: pd.DataFrame) -> None:
         """Insere dados na tabela local Info/IHM."""
@@ -23,3 +42,7 @@ class InfoIHMService:
     def replace_data(self, data: pd.DataFrame) -> None:
         """Substitui dados na tabela local Info/IHM."""
         self.__info_ihm_model.replace_data(data)
+
+    def upsert_data(self, data: pd.DataFrame) -> dict | None:
+        """Substitui apenas as partições alteradas na tabela local Info/IHM."""
+        return self.__info_ihm_model.upsert_data(data)
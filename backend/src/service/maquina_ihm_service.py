@@ -3,7 +3,10 @@
 import numpy as np
 
 # pylint: disable=import-error
+from src.helpers import schemas
+from src.helpers.variables import RawSource
 from src.model.maquina_ihm_model import MaquinaIHMModel
+from src.model.raw_store_model import RawStoreModel
 from src.service.functions.clean_data import CleanData
 
 
@@ -12,12 +15,21 @@ class MaquinaIHMService:
 
     def __init__(self) -> None:
         self.__maquina_ihm = MaquinaIHMModel()
+        self.__raw_store = RawStoreModel()
         self.__clean_data = CleanData()
 
-    def get_data(self, period: tuple):
-        """Método responsável por tratar os dados da máquina info e IHM."""
+    def get_data(self, period: tuple, local: bool = False):
+        """
+        Método responsável por tratar os dados da máquina info e IHM.
+
+        Se local for True, os dados são lidos da cópia local (ingestão incremental).
+        """
         # Consulta os dados da máquina
-        data = self.__maquina_ihm.get_data(period)
+        data = (
+            self.__raw_store.get_data(RawSource.MAQUINA_IHM, period)
+            if local
+            else self.__maquina_ihm.get_data(period)
+        )
 
         # Verifica se a consulta retornou dados
         if data is not None:
@@ -35,4 +47,4 @@ class MaquinaIHMService:
                 data.equipamento.astype(str).str.isdigit(), None, data.equipamento
             )
 
-        return data
+        return schemas.apply_schema(data)
@@ -1,12 +1,16 @@
 """Módulo responsável por tratar os dados da máquina"""
 
 from datetime import time
+from typing import Iterator
 
 import numpy as np
 import pandas as pd
 
 # pylint: disable=import-error
+from src.helpers import schemas
+from src.helpers.variables import STREAM_CHUNK_SIZE
 from src.model.maquina_info_model import MaquinaInfoModel
+from src.model.raw_store_model import RawStoreModel
 from src.service.functions.clean_data import CleanData
 from src.service.maquina_qualidade_service import MaquinaQualidadeService
 
@@ -16,14 +20,23 @@ class MaquinaInfoService:
 
     def __init__(self) -> None:
         self.__maquina_info = MaquinaInfoModel()
+        self.__raw_store = RawStoreModel()
         self.__clean_data = CleanData()
         self.__maquina_qualidade = MaquinaQualidadeService()
 
-    def get_data(self, period: tuple):
-        """Método responsável por tratar os dados da máquina"""
+    def get_data(self, period: tuple, local: bool = False):
+        """
+        Método responsável por tratar os dados da máquina
+
+        Se local for True, os dados são lidos da cópia local (ingestão incremental).
+        """
 
         # Consulta os dados da máquina
-        data = self.__maquina_info.get_data(period)
+        data = (
+            self.__raw_store.get_maquina_info(period)
+            if local
+            else self.__maquina_info.get_data(period)
+        )
 
         if data is not None:
 
@@ -33,7 +46,29 @@ class MaquinaInfoService:
             # Faz ajustes nos dados
             data = self.__data_adjustment(data)
 
-        return data
+        return schemas.apply_schema(data)
+
+    def iter_data(
+        self, period: tuple, chunksize: int = STREAM_CHUNK_SIZE
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Método responsável por tratar os dados da máquina em lotes de tamanho limitado.
+
+        Cada lote é limpo e ajustado separadamente. O último instante (data e hora) de cada lote
+        fica retido e é processado junto do lote seguinte, para que duplicatas não fiquem
+        divididas entre lotes, e as máquinas já vistas são mantidas para o ajuste da primeira
+        entrada de cada máquina. Os lotes saem em ordem de data e hora, ordenados por linha
+        dentro de cada lote.
+        """
+        seen = set()
+        buffer = None
+
+        for chunk in self.__maquina_info.iter_data(period, chunksize):
+            chunk, buffer = self.__hold_last_instant(buffer, chunk)
+            yield from self.__adjusted_chunk(chunk, seen)
+
+        if buffer is not None:
+            yield from self.__adjusted_chunk(buffer, seen)
 
     def get_data_cycle(self, period: tuple):
         """Método responsável por tratar os dados da máquina"""
@@ -51,11 +86,19 @@ class MaquinaInfoService:
 
         return data
 
-    def get_production_data(self, period: tuple):
-        """Método responsável por tratar os dados da máquina"""
+    def get_production_data(self, period: tuple, local: bool = False):
+        """
+        Método responsável por tratar os dados da máquina
+
+        Se local for True, os dados são lidos da cópia local (ingestão incremental).
+        """
 
         # Consulta os dados da máquina
-        data = self.__maquina_info.get_production_data(period)
+        data = (
+            self.__raw_store.get_production_data(period)
+            if local
+            else self.__maquina_info.get_production_data(period)
+        )
 
         # Verifica se a consulta retornou dados
         if data is not None:
@@ -66,7 +109,7 @@ class MaquinaInfoService:
             # Faz ajustes nos dados
             data = self.__data_adjustment_production(data)
 
-        return data
+        return schemas.apply_schema(data)
 
     def get_production_data_by_period(self, period: str):
         """Método responsável por tratar os dados da máquina"""
@@ -87,7 +130,7 @@ class MaquinaInfoService:
         df = pd.merge(data, qual, on=["linha", "maquina_id", "data_registro", "turno"], how="left")
 
         # Preenche os dados faltantes
-        df = df.fillna(0)
+        df = schemas.fill_missing(df, 0)
 
         # Calcula produção caso haja diferença no sensor
         mask = (df.total_ciclos - df.total_produzido_sensor) / df.total_ciclos < 0.05
@@ -114,8 +157,51 @@ class MaquinaInfoService:
 
     # ==================================== Funções Auxiliares ==================================== #
     @staticmethod
-    def __data_adjustment(df: pd.DataFrame):
-        """Método responsável por ajustar os dados da máquina"""
+    def __hold_last_instant(
+        buffer: pd.DataFrame | None, chunk: pd.DataFrame
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Junta ao lote o instante retido do lote anterior e retém o último instante do lote.
+
+        Returns:
+            tuple[pd.DataFrame, pd.DataFrame]: Linhas a processar e linhas retidas.
+        """
+        if buffer is not None:
+            chunk = pd.concat([buffer, chunk], ignore_index=True)
+
+        # O último instante do lote pode continuar no próximo
+        last = (chunk.data_registro == chunk.data_registro.iloc[-1]) & (
+            chunk.hora_registro == chunk.hora_registro.iloc[-1]
+        )
+        return chunk[~last], chunk[last]
+
+    def __adjusted_chunk(self, df: pd.DataFrame, seen: set) -> Iterator[pd.DataFrame]:
+        """Limpa e ajusta o lote, gerando-o apenas se restarem linhas."""
+        data = self.__chunk_adjustment(df, seen)
+        if not data.empty:
+            yield data
+
+    def __chunk_adjustment(self, df: pd.DataFrame, seen: set) -> pd.DataFrame:
+        """Método responsável por limpar e ajustar um lote dos dados da máquina"""
+        if df.empty:
+            return df
+
+        # Limpa os dados de forma básica
+        df = self.__clean_data.clean_data(df)
+
+        # Faz ajustes nos dados
+        return schemas.apply_schema(self.__data_adjustment(df, seen))
+
+    @staticmethod
+    def __data_adjustment(df: pd.DataFrame, seen: set | None = None):
+        """
+        Método responsável por ajustar os dados da máquina
+
+        Args:
+            df (pd.DataFrame): Dados da máquina.
+            seen (set, optional): Máquinas já processadas em lotes anteriores (streaming).
+                É atualizado com as máquinas do lote.
+        """
         # Ajusta a nomenclatura do status
         df.status = np.where(df.status == "true", "rodando", "parada")
 
@@ -123,8 +209,7 @@ class MaquinaInfoService:
         df = df.sort_values(by=["maquina_id", "data_registro", "hora_registro"])
 
         # Correção caso a primeira entrada seja do turno 'VES'
-        mask = (df.turno == "VES") & (df.maquina_id != df.maquina_id.shift())
-        df = df[~mask]
+        df = df[~MaquinaInfoService.__first_ves(df, seen)]
 
         # Ajustar caso o turno "VES" passe de 00:00, para o dia anterior 23:59
         mask = (
@@ -144,6 +229,22 @@ class MaquinaInfoService:
 
         return df
 
+    @staticmethod
+    def __first_ves(df: pd.DataFrame, seen: set | None) -> pd.Series:
+        """
+        Marca a primeira entrada de cada máquina quando ela é do turno 'VES'.
+
+        Em lotes (seen), a primeira entrada só é a da máquina se ela não apareceu antes; seen é
+        atualizado com as máquinas do lote.
+        """
+        mask = (df.turno == "VES") & (df.maquina_id != df.maquina_id.shift())
+
+        if seen is not None:
+            mask = mask & ~df.maquina_id.isin(seen)
+            seen.update(df.maquina_id.unique())
+
+        return mask
+
     @staticmethod
     def __data_adjustment_production(df: pd.DataFrame):
         """Método responsável por ajustar os dados da máquina"""
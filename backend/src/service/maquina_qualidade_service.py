@@ -3,8 +3,11 @@
 import pandas as pd
 
 # pylint: disable=import-error
-from src.helpers.variables import PESO_BANDEJAS, PESO_SACO
+from src.helpers import schemas
+from src.functions import date_f
+from src.helpers.variables import PESO_BANDEJAS, PESO_SACO, RawSource
 from src.model.maquina_qualidade_model import MaquinaQualidadeModel
+from src.model.raw_store_model import RawStoreModel
 
 
 class MaquinaQualidadeService:
@@ -12,18 +15,27 @@ class MaquinaQualidadeService:
 
     def __init__(self) -> None:
         self.__maquina_qualidade = MaquinaQualidadeModel()
+        self.__raw_store = RawStoreModel()
 
-    def get_data(self, period: tuple) -> pd.DataFrame:
-        """Método responsável por tratar os dados da qualidade IHM."""
+    def get_data(self, period: tuple, local: bool = False) -> pd.DataFrame:
+        """
+        Método responsável por tratar os dados da qualidade IHM.
+
+        Se local for True, os dados são lidos da cópia local (ingestão incremental).
+        """
         # Consulta os dados da qualidade IHM
-        data = self.__maquina_qualidade.get_data(period)
+        data = (
+            self.__raw_store.get_data(RawSource.QUALIDADE_IHM, period)
+            if local
+            else self.__maquina_qualidade.get_data(period)
+        )
 
         # Verifica se a consulta retornou dados
         if data is not None:
             # Ajusta os dados da qualidade IHM
             data = self.__maquina_qualidade_data_adjustment(data)
 
-        return data
+        return schemas.apply_schema(data)
 
     # ====================================== Função Auxiliar ===================================== #
     @staticmethod
@@ -57,7 +69,7 @@ class MaquinaQualidadeService:
         df.loc[df.bdj_retrabalho < 0, "bdj_retrabalho"] = 0
 
         # Definir cria coluna auxiliar com o turno (MAT, VES, NOT) muda a cada 8 horas (8, 16, 0)
-        df["turno"] = df.hora_registro.apply(lambda x: x.hour) // 8
+        df["turno"] = date_f.get_hour(df.hora_registro) // 8
         df.turno = df.turno.map({0: "NOT", 1: "MAT", 2: "VES"})
         df = df.drop(columns=["hora_registro"])
 
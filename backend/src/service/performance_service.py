@@ -3,6 +3,8 @@
 import pandas as pd
 
 # pylint: disable=import-error
+from src.database.query import TableQuery
+from src.helpers import schemas
 from src.model.performance_model import PerformanceModel
 
 
@@ -12,9 +14,26 @@ class PerformanceService:
     def __init__(self) -> None:
         self.__performance_model = PerformanceModel()
 
-    def get_data(self) -> pd.DataFrame:
+    def get_data(self, columns: list[str] | None = None) -> pd.DataFrame:
         """Obtém dados do banco de dados local de performance."""
-        return self.__performance_model.get_data()
+        return schemas.apply_schema(self.__performance_model.get_data(columns))
+
+    def query_data(self, query: TableQuery) -> tuple[pd.DataFrame | None, str | None]:
+        """Obtém os dados filtrados de performance (uma página) e o cursor da próxima."""
+        data, cursor = self.__performance_model.query_data(query)
+        return schemas.apply_schema(data), cursor
+
+    def get_version(self) -> int | None:
+        """Obtém a versão do conteúdo do banco de dados local de performance."""
+        return self.__performance_model.get_version()
+
+    def get_changes(self, since: int) -> dict | None:
+        """Obtém as mudanças dos dados de performance depois da versão informada."""
+        changes = self.__performance_model.get_changes(since)
+        if changes is not None:
+            changes["data"] = schemas.apply_schema(changes["data"])
+
+        return changes
 
     def insert_data(self, data: pd.DataFrame) -> None:
         """Insere dados no banco de dados local de performance."""
@@ -23,3 +42,7 @@ class PerformanceService:
     def replace_data(self, data: pd.DataFrame) -> None:
         """Substitui dados no banco de dados local de performance."""
         self.__performance_model.replace_data(data)
+
+    def upsert_data(self, data: pd.DataFrame) -> dict | None:
+        """Substitui apenas as partições alteradas no banco de dados local de performance."""
+        return self.__performance_model.upsert_data(data)
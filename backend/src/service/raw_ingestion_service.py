@@ -0,0 +1,149 @@
+"""
+Módulo responsável pela ingestão incremental das tabelas do AUTOMACAO no banco de dados local.
+
+Em vez de consultar 31 dias de maquina_info, maquina_ihm e qualidade_ihm a cada minuto, apenas os
+registros posteriores ao último watermark são buscados e acrescentados nas cópias locais. Uma
+reconciliação periódica substitui os últimos dias, cobrindo registros corrigidos ou atrasados.
+"""
+
+import pandas as pd
+
+# pylint: disable=import-error
+from src.functions import date_f
+from src.helpers.variables import RAW_RECONCILE_DAYS, RAW_WINDOW_DAYS, RawSource
+from src.model.maquina_ihm_model import MaquinaIHMModel
+from src.model.maquina_info_model import MaquinaInfoModel
+from src.model.maquina_qualidade_model import MaquinaQualidadeModel
+from src.model.raw_store_model import RAW_INFO_KEYS, RawStoreModel
+
+
+class RawIngestionService:
+    """Classe responsável por manter as cópias locais das tabelas do AUTOMACAO."""
+
+    def __init__(self) -> None:
+        self.__raw_store = RawStoreModel()
+        self.__maquina_info = MaquinaInfoModel()
+        self.__maquina_ihm = MaquinaIHMModel()
+        self.__maquina_qualidade = MaquinaQualidadeModel()
+
+    def sync(self, source: RawSource) -> int:
+        """
+        Busca os registros posteriores ao watermark e acrescenta na cópia local.
+
+        Na primeira execução (sem watermark) carrega a janela completa de RAW_WINDOW_DAYS dias.
+
+        Returns:
+            int: Quantidade de registros ingeridos.
+        """
+        watermark = self.__raw_store.get_watermark(source)
+
+        if watermark is None:
+            return self.reconcile(source, RAW_WINDOW_DAYS)
+
+        data = self.__get_data_since(source, watermark)
+
+        if data is None or data.empty:
+            return 0
+
+        self.__raw_store.append_data(source, data)
+        self.__raw_store.set_watermark(source, self.__get_watermark(source, data, watermark))
+
+        return len(data)
+
+    def reconcile(self, source: RawSource, days: int = RAW_RECONCILE_DAYS) -> int:
+        """
+        Substitui os últimos dias da cópia local pelos dados do AUTOMACAO e descarta os registros
+        fora da janela de RAW_WINDOW_DAYS dias.
+
+        Returns:
+            int: Quantidade de registros reconciliados.
+        """
+        today = date_f.get_date()
+        first_day = (today - pd.DateOffset(days=days)).strftime("%Y-%m-%d")
+        last_day = today.strftime("%Y-%m-%d")
+
+        data = self.__get_data_period(source, (first_day, last_day))
+
+        # Em caso de erro na consulta mantém a cópia local como está
+        if data is None:
+            return 0
+
+        self.__raw_store.replace_from(source, first_day, data)
+
+        # Remove os registros fora da janela
+        first_window_day = (today - pd.DateOffset(days=RAW_WINDOW_DAYS + 1)).strftime("%Y-%m-%d")
+        self.__raw_store.delete_before(source, first_window_day)
+
+        if not data.empty:
+            watermark = self.__raw_store.get_watermark(source)
+            self.__raw_store.set_watermark(source, self.__get_watermark(source, data, watermark))
+
+        return len(data)
+
+    # ==================================== Funções Auxiliares ==================================== #
+    def __get_data_period(self, source: RawSource, period: tuple) -> pd.DataFrame | None:
+        """Consulta os registros do AUTOMACAO no período."""
+        if source == RawSource.MAQUINA_INFO:
+            return self.__maquina_info.get_raw_data(period=period)
+        if source == RawSource.MAQUINA_IHM:
+            return self.__maquina_ihm.get_data(period)
+        return self.__maquina_qualidade.get_data(period)
+
+    def __get_data_since(self, source: RawSource, watermark: dict) -> pd.DataFrame | None:
+        """Consulta os registros do AUTOMACAO posteriores ao watermark."""
+        if source == RawSource.MAQUINA_INFO:
+            since = (watermark["data_registro"], watermark["hora_registro"])
+            return self.__drop_ingested(self.__maquina_info.get_raw_data(since=since), since)
+        if source == RawSource.MAQUINA_IHM:
+            return self.__maquina_ihm.get_data_since(watermark["recno"])
+        return self.__maquina_qualidade.get_data_since(watermark["recno"])
+
+    def __drop_ingested(
+        self, data: pd.DataFrame | None, since: tuple[str, str]
+    ) -> pd.DataFrame | None:
+        """
+        Descarta os registros de maquina_info repetidos ou já gravados na cópia local.
+
+        A consulta inclui o segundo do watermark, onde ficam tanto os registros já ingeridos
+        quanto os gravados depois da última leitura por outras máquinas.
+        """
+        if data is None or data.empty:
+            return data
+
+        data = data.drop_duplicates(subset=RAW_INFO_KEYS)
+        keys = pd.MultiIndex.from_frame(RawStoreModel.normalize(data[RAW_INFO_KEYS]))
+        stored = pd.MultiIndex.from_frame(self.__raw_store.get_maquina_info_keys(*since))
+
+        return data[~keys.isin(stored)]
+
+    @staticmethod
+    def __get_watermark(source: RawSource, data: pd.DataFrame, current: dict | None) -> dict:
+        """
+        Calcula o novo watermark a partir dos registros ingeridos.
+
+        maquina_info é controlada pela data e hora de registro, as tabelas da IHM pelo recno.
+        """
+        data = RawStoreModel.normalize(data)
+        last = data.sort_values(by=["data_registro", "hora_registro"]).iloc[-1]
+
+        watermark = {
+            "data_registro": last.data_registro,
+            "hora_registro": last.hora_registro,
+            "recno": int(data.recno.max()) if "recno" in data.columns else None,
+        }
+
+        if current is None:
+            return watermark
+
+        # O watermark nunca retrocede (a reconciliação pode trazer uma janela anterior a ele)
+        if (current["data_registro"], current["hora_registro"]) > (
+            watermark["data_registro"],
+            watermark["hora_registro"],
+        ):
+            watermark["data_registro"] = current["data_registro"]
+            watermark["hora_registro"] = current["hora_registro"]
+
+        if source != RawSource.MAQUINA_INFO and pd.notna(current["recno"]):
+            watermark["recno"] = max(watermark["recno"], int(current["recno"]))
+
+        return watermark
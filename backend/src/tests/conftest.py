@@ -0,0 +1,20 @@
+"""Fixtures compartilhadas pelos testes."""
+
+import pytest
+
+# pylint: disable=import-error
+from src.database import connection, connection_local
+
+
+@pytest.fixture
+def local_db(tmp_path, monkeypatch):
+    """Banco de dados local em um arquivo temporário, com uma engine própria para o teste."""
+    monkeypatch.setattr(connection_local, "DB_LOCAL", str(tmp_path / "automacao_local.db"))
+    # pylint: disable=protected-access
+    monkeypatch.delitem(connection._engines, "local", raising=False)
+
+    yield tmp_path
+
+    engine = connection._engines.get("local")
+    if engine is not None:
+        engine.dispose()
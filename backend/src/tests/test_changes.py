@@ -0,0 +1,159 @@
+"""Testes das mudanças por partição (/local/{tabela}/changes) aplicadas pelo cliente."""
+
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# pylint: disable=import-error
+from src.helpers import responses
+from src.helpers.responses import ARROW_STREAM_MEDIA_TYPE, changes_response, data_response
+from src.helpers.variables import CHANGE_LOG_KEEP_HOURS, LocalTables
+from src.model.db_automacao_local_model import DBAutomacaoLocalModel
+from src.service.info_ihm import InfoIHMService
+
+# O cliente (frontend) é importado com as suas dependências
+pytest.importorskip("aiohttp")
+pytest.importorskip("streamlit")
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "frontend"))
+
+# pylint: disable=wrong-import-position,wrong-import-order
+from app.api.requests_ import _apply_changes, read_columnar_data  # noqa: E402
+
+
+def info_ihm_data(days: int = 4) -> pd.DataFrame:
+    """Dados de Info/IHM com operadores e OS só com dígitos (zeros à esquerda)."""
+    rows = []
+    for day in range(days):
+        for shift in ("NOT", "MAT", "VES"):
+            for machine, line in (("TMF001", 1), ("TMF002", 2)):
+                rows.append(
+                    {
+                        "fabrica": 1,
+                        "linha": line,
+                        "maquina_id": machine,
+                        "turno": shift,
+                        "status": "parada",
+                        "data_registro": pd.Timestamp("2024-03-01") + pd.Timedelta(days=day),
+                        "hora_registro": "08:00:00",
+                        "motivo": "Ajustes",
+                        "equipamento": "Forno",
+                        "problema": "Ajuste de Molde",
+                        "causa": "",
+                        "os_numero": f"{day:06d}",
+                        "operador_id": f"000{line}{day:02d}",
+                        "tempo": 10 * (day + 1),
+                    }
+                )
+
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def service(local_db, monkeypatch):
+    """Serviço de Info/IHM com o banco local e os snapshots em diretórios temporários."""
+    monkeypatch.setattr("src.model.snapshot_store_model.SNAPSHOT_DIR", str(local_db / "snapshots"))
+    # pylint: disable=protected-access
+    token = responses._accept.set(ARROW_STREAM_MEDIA_TYPE)
+    yield InfoIHMService()
+    responses._accept.reset(token)
+
+
+def full_reload(service: InfoIHMService, categories: bool = False) -> tuple[pd.DataFrame, int]:
+    """Dados completos como o cliente os recebe (Arrow IPC) e a versão (ETag)."""
+    response = data_response(service.get_data())
+    return read_columnar_data(response.body, ARROW_STREAM_MEDIA_TYPE, categories), int(
+        service.get_version()
+    )
+
+
+def sorted_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Linhas em uma ordem total (a ordem das rotas não desempata a mesma linha e hora em turnos
+    diferentes: no banco o empate segue o rowid e no cliente as linhas recebidas vão ao final).
+    """
+    keys = ["linha", "data_registro", "hora_registro", "maquina_id", "turno"]
+    return df.sort_values(keys, kind="stable", ignore_index=True)
+
+
+def changes_since(service: InfoIHMService, since: int) -> dict:
+    """Mudanças como o cliente as recebe da rota /changes."""
+    return json.loads(changes_response(service.get_changes(since)).body)
+
+
+@pytest.mark.parametrize("snapshot", [False, True])
+@pytest.mark.parametrize("categories", [False, True])
+def test_applied_changes_match_full_reload(service, monkeypatch, snapshot, categories):
+    """Test that applying the changes (changed and removed partitions) equals a full reload."""
+    monkeypatch.setattr("src.model.local_table_model.SNAPSHOT_STORE", snapshot)
+    data = info_ihm_data()
+    service.upsert_data(data)
+    cached, since = full_reload(service, categories)
+
+    # Partição alterada (com um valor de categoria novo), partição removida e partição nova
+    changed = (data.turno == "MAT") & (data.data_registro == "2024-03-02")
+    removed = (data.turno == "VES") & (data.data_registro == "2024-03-03")
+    data.loc[changed, ["operador_id", "motivo"]] = ["000999", "Limpeza"]
+    new = data[data.data_registro == "2024-03-04"].assign(data_registro=pd.Timestamp("2024-03-05"))
+    report = service.upsert_data(pd.concat([data[~removed], new], ignore_index=True))
+
+    assert report["changed"] and report["removed"]
+
+    changes = changes_since(service, since)
+    expected, version = full_reload(service, categories)
+    result = _apply_changes(cached, changes)
+
+    assert not changes["full"]
+    # Com ou sem snapshot, a versão é a do banco local (a mesma do change_log)
+    assert changes["version"] == version == DBAutomacaoLocalModel().get_version(
+        LocalTables.INFO_IHM.value
+    )
+    assert result.operador_id.map(type).eq(str).all()
+    pd.testing.assert_frame_equal(
+        sorted_rows(result), sorted_rows(expected), check_categorical=False
+    )
+    assert result.dtypes.equals(expected.dtypes)
+
+
+@pytest.mark.parametrize("snapshot", [False, True])
+def test_replaced_table_needs_full_reload(service, monkeypatch, snapshot):
+    """Test that a table replaced after the client version (reset) asks for a full reload."""
+    monkeypatch.setattr("src.model.local_table_model.SNAPSHOT_STORE", snapshot)
+    data = info_ihm_data()
+    service.upsert_data(data)
+    _, since = full_reload(service)
+
+    service.upsert_data(data.assign(tempo=data.tempo + 1))
+    service.replace_data(data)
+
+    changes = changes_since(service, since)
+
+    assert changes["full"]
+    assert changes["version"] == service.get_version()
+
+
+def test_expired_version_needs_full_reload(service):
+    """Test that a version older than the kept change log asks for a full reload."""
+    service.replace_data(info_ihm_data())
+    _, version = full_reload(service)
+
+    changes = changes_since(service, version - (CHANGE_LOG_KEEP_HOURS + 1) * 3_600 * 10**9)
+
+    assert changes["full"]
+    assert changes["data"] is None
+
+
+def test_unchanged_table_has_no_changes(service):
+    """Test that an upsert without changes returns no partitions for the current version."""
+    data = info_ihm_data()
+    service.upsert_data(data)
+    _, since = full_reload(service)
+
+    service.upsert_data(data)
+    changes = changes_since(service, since)
+
+    assert not changes["full"]
+    assert changes["version"] == since
+    assert not changes["changed"] and not changes["removed"]
@@ -0,0 +1,136 @@
+"""Testes do modo incremental (update) da união das tabelas info e ihm."""
+
+import pandas as pd
+import pytest
+
+# pylint: disable=import-error
+from src.service.functions.info_ihm_join import InfoIHMJoin
+
+DAY = "2024-03-01"
+NOW = pd.Timestamp(f"{DAY} 19:00:00")
+
+# Paradas de cada máquina (início, fim)
+STOPS = {
+    # Atravessa o limite entre os lotes de 12:00
+    "TMF001": [("09:10", "09:40"), ("11:30", "12:40")],
+    # Atravessa a troca de turno das 16:00 (e o lote de 16:10)
+    "TMF002": [("07:55", "08:05"), ("15:50", "16:20")],
+}
+LINES = {"TMF001": 1, "TMF002": 2}
+
+
+def shift(hour: pd.Timedelta) -> str:
+    """Turno da hora (NOT até 08:00, MAT até 16:00, VES depois)."""
+    if hour < pd.Timedelta(hours=8):
+        return "NOT"
+    return "MAT" if hour < pd.Timedelta(hours=16) else "VES"
+
+
+def info_data() -> pd.DataFrame:
+    """Registros da maquina_info a cada minuto, das 06:00 às 18:00."""
+    hours = pd.timedelta_range("06:00:00", "18:00:00", freq="min")
+    frames = []
+
+    for machine, line in LINES.items():
+        stopped = pd.Series(False, index=hours)
+        for start, end in STOPS[machine]:
+            stopped |= (hours >= pd.Timedelta(f"{start}:00")) & (hours < pd.Timedelta(f"{end}:00"))
+
+        frames.append(
+            pd.DataFrame(
+                {
+                    "fabrica": 1,
+                    "linha": line,
+                    "maquina_id": machine,
+                    "turno": [shift(hour) for hour in hours],
+                    "status": stopped.map({True: "parada", False: "rodando"}).to_numpy(),
+                    "contagem_total_ciclos": range(len(hours)),
+                    "contagem_total_produzido": range(len(hours)),
+                    "data_registro": DAY,
+                    "hora_registro": [str(hour).split(" ")[-1] for hour in hours],
+                }
+            )
+        )
+
+    data = pd.concat(frames, ignore_index=True)
+    return data.sort_values(["data_registro", "hora_registro"], kind="stable", ignore_index=True)
+
+
+def ihm_data() -> pd.DataFrame:
+    """Apontamentos da IHM logo após o início das paradas (com troca de motivo e backup)."""
+    rows = [
+        ("TMF001", "09:11:00", "Ajustes", "Ajuste de Molde", "", "000123"),
+        ("TMF001", "11:31:00", "Manutenção", "Quebra", "Rolamento", "000123"),
+        ("TMF001", "12:20:00", "Limpeza", "Limpeza", " ", "000456"),
+        ("TMF002", "07:56:00", "Saída para Backup", "Backup", "Backup", "000789"),
+        ("TMF002", "15:51:00", "Ajustes", "Ajuste de Temperatura", "Forno", "000789"),
+        ("TMF002", "16:05:00", "Troca de Produto", "Setup", "Produto", "000999"),
+    ]
+    data = pd.DataFrame(
+        rows,
+        columns=["maquina_id", "hora_registro", "motivo", "problema", "causa", "operador_id"],
+    )
+    return data.assign(
+        linha=data.maquina_id.map(LINES),
+        data_registro=DAY,
+        equipamento="Forno",
+        os_numero=None,
+        s_backup=data.motivo.where(data.motivo == "Saída para Backup"),
+    )
+
+
+def window(data: pd.DataFrame, end: str) -> pd.DataFrame:
+    """Registros até a hora informada (os dados recebidos em cada execução)."""
+    return data[data.hora_registro <= end].reset_index(drop=True)
+
+
+def normalized(df: pd.DataFrame) -> pd.DataFrame:
+    """Converte as colunas category para texto (as categorias dependem dos dados de cada lote)."""
+    return df.astype({column: object for column in df.select_dtypes("category").columns})
+
+
+@pytest.mark.parametrize(
+    "batches",
+    [
+        ["12:00:00", "18:00:00"],
+        ["10:00:00", "12:00:00", "16:10:00", "18:00:00"],
+        ["11:45:00", "11:46:00", "18:00:00"],
+    ],
+)
+def test_update_matches_join_data(batches):
+    """Test that update() fed in batches gives the same result as a single join_data()."""
+    info, ihm = info_data(), ihm_data()
+    join = InfoIHMJoin()
+
+    for end in batches:
+        incremental = join.update(window(ihm, end), window(info, end), NOW)
+        expected = InfoIHMJoin(window(ihm, end), window(info, end)).join_data(NOW)
+
+        pd.testing.assert_frame_equal(normalized(incremental), normalized(expected))
+
+
+def test_update_reprocesses_when_past_rows_change():
+    """Test that a change in already processed rows still gives the join_data() result."""
+    info, ihm = info_data(), ihm_data()
+    join = InfoIHMJoin()
+    join.update(window(ihm, "12:00:00"), window(info, "12:00:00"), NOW)
+
+    # Registro atrasado da IHM, anterior à última execução
+    late = ihm.iloc[[0]].assign(hora_registro="09:30:00", motivo="Limpeza")
+    ihm = pd.concat([ihm, late], ignore_index=True)
+
+    incremental = join.update(ihm, info, NOW)
+    expected = InfoIHMJoin(ihm, info).join_data(NOW)
+
+    pd.testing.assert_frame_equal(normalized(incremental), normalized(expected))
+
+
+def test_blank_text_values_become_null():
+    """Test that empty and whitespace-only text values are replaced by None."""
+    info, ihm = info_data(), ihm_data()
+
+    result = normalized(InfoIHMJoin(ihm, info).join_data(NOW))
+
+    causa = result.causa.dropna()
+    assert not causa.empty
+    assert not causa.str.fullmatch(r"\s*").any()
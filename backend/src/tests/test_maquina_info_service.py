@@ -0,0 +1,64 @@
+"""Testes do processamento em lotes (streaming) dos dados da maquina_info."""
+
+import pandas as pd
+import pytest
+
+# pylint: disable=import-error
+from src.service.maquina_info_service import MaquinaInfoService
+
+
+def _rows() -> pd.DataFrame:
+    """Registros em ordem de data e hora, com um instante repetido em várias máquinas."""
+    rows = [
+        # Primeira entrada da máquina 2 é do turno VES (removida)
+        ("2", 2, "VES", "2024-03-01", "07:00:00"),
+        ("1", 1, "MAT", "2024-03-01", "08:00:00"),
+        ("1", 1, "MAT", "2024-03-01", "08:01:00"),
+        # Mesmo instante em três máquinas (atravessa o limite dos lotes) e uma duplicata
+        ("1", 1, "MAT", "2024-03-01", "09:00:00"),
+        ("2", 2, "MAT", "2024-03-01", "09:00:00"),
+        ("3", 3, "MAT", "2024-03-01", "09:00:00"),
+        ("3", 3, "MAT", "2024-03-01", "09:00:00"),
+        # Troca de turno e VES depois da meia-noite (passa para o dia anterior)
+        ("1", 1, "VES", "2024-03-01", "16:00:00"),
+        ("3", 3, "VES", "2024-03-01", "23:30:00"),
+        ("1", 1, "VES", "2024-03-02", "00:02:00"),
+        ("2", 2, "VES", "2024-03-02", "00:03:00"),
+        ("1", 1, "NOT", "2024-03-02", "01:00:00"),
+    ]
+    df = pd.DataFrame(
+        rows, columns=["maquina_id", "linha", "turno", "data_registro", "hora_registro"]
+    )
+    return df.assign(fabrica=1, status="true", contagem_total_ciclos=range(len(df)))
+
+
+def _normalized(df: pd.DataFrame) -> pd.DataFrame:
+    """Ordena as linhas e converte as colunas category para texto."""
+    df = df.astype({column: object for column in df.select_dtypes("category").columns})
+    keys = ["linha", "maquina_id", "data_registro", "hora_registro", "contagem_total_ciclos"]
+    return df.sort_values(keys).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("chunksize", [1, 3, 4, 5, 100])
+def test_iter_data_matches_get_data(mocker, chunksize):
+    """Test that the concatenated chunks equal get_data, with an instant split across chunks."""
+    model = mocker.patch("src.service.maquina_info_service.MaquinaInfoModel").return_value
+    mocker.patch("src.service.maquina_info_service.RawStoreModel")
+    mocker.patch("src.service.maquina_info_service.MaquinaQualidadeService")
+
+    model.get_data.side_effect = lambda period: _rows()
+    model.iter_data.side_effect = lambda period, size: (
+        chunk.reset_index(drop=True)
+        for _, chunk in _rows().groupby(_rows().index // size, sort=True)
+    )
+
+    service = MaquinaInfoService()
+    period = ("2024-03-01", "2024-03-02")
+
+    chunks = list(service.iter_data(period, chunksize))
+    expected = service.get_data(period)
+
+    assert all(not chunk.empty for chunk in chunks)
+    pd.testing.assert_frame_equal(
+        _normalized(pd.concat(chunks, ignore_index=True)), _normalized(expected)
+    )
@@ -0,0 +1,73 @@
+"""Testes da consulta filtrada e paginada (query_data) das tabelas do banco local."""
+
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# pylint: disable=import-error
+from src.database.query import TableQuery
+from src.helpers.variables import LocalTables
+from src.model.db_automacao_local_model import DBAutomacaoLocalModel
+
+TABLE = LocalTables.PRODUCTION.value
+
+
+def production_data(rows: int = 60, seed: int = 0) -> pd.DataFrame:
+    """Dados de produção com nulos e empates nas colunas da ordem de leitura."""
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame(
+        {
+            "fabrica": rng.integers(1, 3, rows),
+            "linha": rng.integers(1, 4, rows),
+            "maquina_id": rng.choice(["TMF001", "TMF002", None], rows),
+            "turno": rng.choice(["MAT", "VES", None], rows),
+            "produto": rng.choice(["ROSQUINHA", "BOLO"], rows),
+            "total_produzido": np.arange(rows),
+            "data_registro": pd.Timestamp("2024-03-01")
+            + pd.to_timedelta(rng.integers(0, 3, rows), "D"),
+        }
+    )
+    # Datas nulas: a primeira coluna da ordem
+    data.loc[rng.choice(rows, 5, replace=False), "data_registro"] = pd.NaT
+    return data
+
+
+def read_pages(model: DBAutomacaoLocalModel, query: TableQuery) -> list[pd.DataFrame]:
+    """Lê todas as páginas da consulta, seguindo o cursor de cada uma."""
+    pages = []
+    while True:
+        page, cursor = model.query_data(TABLE, query)
+        pages.append(page)
+        if cursor is None:
+            return pages
+        query = replace(query, cursor=cursor)
+
+
+@pytest.mark.parametrize("limit", [1, 4, 7, 59, 60, 100])
+def test_pages_match_unpaginated_query(local_db, limit):  # pylint: disable=unused-argument
+    """Test that the concatenated pages equal the unpaginated result, including NULL keys."""
+    model = DBAutomacaoLocalModel()
+    model.replace_data(production_data(), TABLE)
+
+    expected, cursor = model.query_data(TABLE, TableQuery())
+    pages = read_pages(model, TableQuery(limit=limit))
+
+    assert cursor is None
+    assert all(len(page) <= limit for page in pages)
+    pd.testing.assert_frame_equal(pd.concat(pages, ignore_index=True), expected)
+    assert sorted(expected.total_produzido) == list(range(60))
+
+
+def test_pages_with_filter_and_columns(local_db):  # pylint: disable=unused-argument
+    """Test that paging a filtered projection returns the filtered rows once each."""
+    model = DBAutomacaoLocalModel()
+    model.replace_data(production_data(), TABLE)
+
+    query = TableQuery(linha=(1, 3), columns=("linha", "turno", "total_produzido"))
+    expected, _ = model.query_data(TABLE, query)
+    pages = read_pages(model, replace(query, limit=3))
+
+    pd.testing.assert_frame_equal(pd.concat(pages, ignore_index=True), expected)
+    assert set(expected.linha) == {1, 3}
@@ -0,0 +1,68 @@
+"""Testes da ingestão incremental (watermark) das tabelas do AUTOMACAO no banco local."""
+
+import datetime
+
+import pandas as pd
+
+# pylint: disable=import-error
+from src.helpers.variables import RawSource
+from src.model.maquina_info_model import MaquinaInfoModel
+from src.model.raw_store_model import RawStoreModel
+from src.service.raw_ingestion_service import RawIngestionService
+
+
+def maquina_info(rows: list[tuple[str, str]]) -> pd.DataFrame:
+    """Registros brutos de maquina_info (máquina e hora) no mesmo dia."""
+    return pd.DataFrame(
+        [
+            {
+                "maquina_id": machine,
+                "linha": 1,
+                "fabrica": 1,
+                "status": "true",
+                "turno": "MAT",
+                "ciclo_1_min": 1.0,
+                "contagem_total_ciclos": 10,
+                "contagem_total_produzido": 9,
+                "produto": "ROSQUINHA",
+                "produto_id": "1",
+                "data_registro": datetime.date(2024, 3, 1),
+                "hora_registro": datetime.time.fromisoformat(hour),
+            }
+            for machine, hour in rows
+        ]
+    )
+
+
+def test_sync_rereads_watermark_second(local_db, mocker):  # pylint: disable=unused-argument
+    """Test that rows committed later in the watermark second are ingested once each."""
+    store = RawStoreModel()
+    # A tabela do watermark é criada na primeira leitura (sem watermark)
+    assert store.get_watermark(RawSource.MAQUINA_INFO) is None
+    store.append_data(RawSource.MAQUINA_INFO, maquina_info([("TMF001", "08:00:00")]))
+    watermark = {"data_registro": "2024-03-01", "hora_registro": "08:00:00", "recno": None}
+    store.set_watermark(RawSource.MAQUINA_INFO, watermark)
+
+    # O segundo do watermark volta com o registro já ingerido, um novo (repetido) e um posterior
+    fetched = maquina_info(
+        [
+            ("TMF001", "08:00:00"),
+            ("TMF002", "08:00:00"),
+            ("TMF002", "08:00:00"),
+            ("TMF003", "08:00:01"),
+        ]
+    )
+    get_raw_data = mocker.patch.object(MaquinaInfoModel, "get_raw_data", return_value=fetched)
+
+    ingested = RawIngestionService().sync(RawSource.MAQUINA_INFO)
+
+    get_raw_data.assert_called_once_with(since=("2024-03-01", "08:00:00"))
+    assert ingested == 2
+
+    stored = store.get_maquina_info(("2024-03-01", "2024-03-01"))
+    assert sorted(zip(stored.maquina_id, stored.hora_registro.astype(str))) == [
+        ("TMF001", "08:00:00"),
+        ("TMF002", "08:00:00"),
+        ("TMF003", "08:00:01"),
+    ]
+    assert store.get_watermark(RawSource.MAQUINA_INFO)["hora_registro"] == "08:00:01"
@@ -0,0 +1,49 @@
+"""Testes das respostas colunares (Arrow) das rotas de dados."""
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+# pylint: disable=import-error
+from src.helpers import responses
+from src.helpers.responses import ARROW_STREAM_MEDIA_TYPE, data_response
+
+
+@pytest.fixture
+def accept_arrow():
+    """Requisição com Accept de Arrow IPC."""
+    # pylint: disable=protected-access
+    token = responses._accept.set(ARROW_STREAM_MEDIA_TYPE)
+    yield
+    responses._accept.reset(token)
+
+
+def read_arrow(body: bytes) -> pd.DataFrame:
+    """Lê o corpo de uma resposta Arrow IPC."""
+    return pa.ipc.open_stream(body).read_all().to_pandas()
+
+
+def test_mixed_column_stays_columnar(accept_arrow):  # pylint: disable=unused-argument
+    """Test that an object column with mixed types is sent as text instead of falling back."""
+    data = pd.DataFrame(
+        {
+            "operador_id": ["000123", 456, None],
+            "linha": [1, 2, 3],
+            "turno": pd.Categorical(["MAT", "VES", "MAT"]),
+        }
+    )
+
+    response = data_response(data)
+    result = read_arrow(response.body)
+
+    assert response.media_type == ARROW_STREAM_MEDIA_TYPE
+    assert result.operador_id.tolist() == ["000123", "456", None]
+    assert result.linha.dtype == "int64"
+    assert isinstance(result.turno.dtype, pd.CategoricalDtype)
+
+
+def test_unconvertible_data_is_not_acceptable(accept_arrow):  # pylint: disable=unused-argument
+    """Test that data Arrow cannot convert gets 406 instead of silently switching to JSON."""
+    response = data_response(pd.DataFrame({"valor": [1 + 2j, 3j]}))
+
+    assert response.status_code == 406
@@ -0,0 +1,110 @@
+"""Testes da atualização por partição (upsert_partitions) das tabelas do banco local."""
+
+import numpy as np
+import pandas as pd
+
+# pylint: disable=import-error
+from src.helpers.variables import LocalTables
+from src.model.db_automacao_local_model import DBAutomacaoLocalModel
+
+TABLE = LocalTables.PRODUCTION.value
+
+
+def production_data(rows: int = 300, seed: int = 0) -> pd.DataFrame:
+    """Dados de produção com várias linhas por partição (data_registro, turno, maquina_id)."""
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame(
+        {
+            "fabrica": rng.integers(1, 3, rows),
+            "linha": rng.integers(1, 15, rows),
+            "maquina_id": rng.choice(["TMF001", "TMF002", "TMF003"], rows),
+            "turno": rng.choice(["MAT", "VES", "NOT"], rows),
+            "produto": rng.choice(["ROSQUINHA", "BOLO"], rows),
+            "total_ciclos": rng.integers(0, 1000, rows),
+            "total_produzido_sensor": rng.integers(0, 1000, rows),
+            "bdj_vazias": rng.integers(0, 10, rows),
+            "bdj_retrabalho": rng.integers(0, 10, rows),
+            "total_produzido": np.arange(rows),
+            "data_registro": pd.Timestamp("2024-03-01")
+            + pd.to_timedelta(rng.integers(0, 10, rows), "D"),
+            "hora_registro": "10:00:00.000000",
+        }
+    )
+    return data.sort_values(["data_registro", "turno", "linha", "maquina_id"], kind="stable")
+
+
+def sorted_rows(data: pd.DataFrame) -> pd.DataFrame:
+    """Linhas em uma ordem total, para comparar tabelas independentemente da ordem de leitura."""
+    return data.sort_values(list(data.columns)).reset_index(drop=True)
+
+
+def partition_mask(data: pd.DataFrame, row: pd.Series) -> pd.Series:
+    """Linhas da mesma partição que a linha informada."""
+    return (
+        (data.data_registro == row.data_registro)
+        & (data.turno == row.turno)
+        & (data.maquina_id == row.maquina_id)
+    )
+
+
+def stored_rowids(model: DBAutomacaoLocalModel) -> pd.DataFrame:
+    """rowid de cada linha gravada (muda quando a linha é apagada e reinserida)."""
+    return model.get_query(f"SELECT rowid, total_produzido FROM {TABLE}").set_index(
+        "total_produzido"
+    )["rowid"]
+
+
+def test_upsert_partitions_rewrites_only_changed_partitions(local_db):
+    """Test that only changed partitions are rewritten and removed ones are deleted."""
+    model = DBAutomacaoLocalModel()
+    data = production_data()
+
+    first = model.upsert_partitions(data, TABLE)
+    assert first["changed"] == first["partitions"]
+    rowids = stored_rowids(model)
+
+    # Uma partição alterada e uma partição que deixou de existir na origem
+    changed_row, removed_row = data.iloc[0], data.iloc[-1]
+    changed = partition_mask(data, changed_row)
+    new_data = data.copy()
+    new_data.loc[changed, "total_ciclos"] = -1
+    new_data = new_data[~partition_mask(new_data, removed_row)]
+
+    report = model.upsert_partitions(new_data, TABLE)
+
+    assert report["changed"] == 1
+    assert report["removed"] == 1
+    assert report["rows_inserted"] == changed.sum()
+    assert report["rows_deleted"] == changed.sum() + partition_mask(data, removed_row).sum()
+
+    # As linhas das partições não alteradas continuam as mesmas (mesmo rowid)
+    after = stored_rowids(model)
+    unchanged = new_data.total_produzido[~partition_mask(new_data, changed_row)]
+    pd.testing.assert_series_equal(after[unchanged], rowids[unchanged])
+    rewritten = data.total_produzido[changed]
+    assert (after[rewritten] != rowids[rewritten]).all()
+
+    upserted = model.get_data(TABLE)
+    assert (upserted.total_ciclos[upserted.total_produzido.isin(unchanged)] != -1).all()
+
+    # O resultado é o mesmo da substituição completa com os mesmos dados
+    model.replace_data(new_data, TABLE)
+    pd.testing.assert_frame_equal(sorted_rows(upserted), sorted_rows(model.get_data(TABLE)))
+
+
+def test_upsert_partitions_without_changes_keeps_table(local_db):
+    """Test that upserting the same data rewrites nothing."""
+    model = DBAutomacaoLocalModel()
+    data = production_data()
+
+    model.upsert_partitions(data, TABLE)
+    rowids = stored_rowids(model)
+    version = model.get_version(TABLE)
+
+    report = model.upsert_partitions(data.sample(frac=1, random_state=1), TABLE)
+
+    assert report["changed"] == 0
+    assert report["removed"] == 0
+    assert report["rows_deleted"] == 0
+    pd.testing.assert_series_equal(stored_rowids(model), rowids)
+    assert model.get_version(TABLE) == version
@@ -6,7 +6,7 @@ from datetime import datetime
 import pandas as pd
 
 # pylint: disable=import-error
-from app.api.requests_ import fetch_api_data
+from app.api.requests_ import fetch_api_changes, fetch_api_data
 from app.api.urls import APIUrl
 
 
@@ -46,8 +46,24 @@ async def update_api() -> list[pd.DataFrame]:
         APIUrl.URL_CART_GREENHOUSE.value,
     ]
 
-    # Execução de tasks
-    tasks = [fetch_api_data(url) for url in urls]
+    # Tabelas atualizadas por partição: após a primeira carga, baixa apenas as mudanças
+    changes_urls = {
+        APIUrl.URL_PROD.value,
+        APIUrl.URL_EFF.value,
+        APIUrl.URL_PERF.value,
+        APIUrl.URL_REP.value,
+        APIUrl.URL_INFO_IHM.value,
+    }
+
+    # Execução de tasks (dados em Arrow IPC, já tipados)
+    tasks = [
+        (
+            fetch_api_changes(url, columnar=True)
+            if url in changes_urls
+            else fetch_api_data(url, columnar=True)
+        )
+        for url in urls
+    ]
 
     # Gather tasks
     result = await asyncio.gather(*tasks)
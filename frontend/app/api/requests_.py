@@ -1,39 +1,303 @@
 """Módulo que gerencia as requisições da API."""
 
+import json
 import logging
+import threading
+from collections import OrderedDict
 from io import StringIO
 
 import aiohttp
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import streamlit as st
 
 logging.basicConfig(level=logging.INFO)
 
 logger = logging.getLogger(__name__)
 
+# Versão do payload pedida à API: na versão 2 o JSON do DataFrame vem direto no corpo da resposta
+PAYLOAD_VERSION_HEADER = "X-Payload-Version"
+PAYLOAD_VERSION = "2"
 
-async def fetch_api_data(url: str) -> pd.DataFrame:
+# Formatos colunares (binários) aceitos pela API
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+PARQUET_MEDIA_TYPE = "application/x-parquet"
+
+# Cursor da próxima página nas consultas paginadas (parâmetro limit)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Último ETag e DataFrame recebidos de cada URL (e formato), compartilhados pelas sessões. Apenas
+# as consultas sem parâmetros (tabelas completas) ficam em cache, limitadas às mais recentes
+ETAG_CACHE_MAX_ENTRIES = 32
+_etag_cache: OrderedDict[tuple[str, bool], tuple[str, pd.DataFrame]] = OrderedDict()
+_etag_cache_lock = threading.Lock()
+
+
+def read_columnar_data(payload: bytes, media_type: str, categories: bool = False) -> pd.DataFrame:
+    """
+    Lê os dados recebidos em Arrow IPC (streaming) ou Parquet.
+
+    Datas e números já vêm tipados. As horas (time) são convertidas para texto (HH:MM:SS), como
+    no JSON, e as colunas category também, a menos que categories seja verdadeiro (as páginas
+    preenchem essas colunas com valores novos, o que não é permitido em uma category).
+    """
+    if media_type == PARQUET_MEDIA_TYPE:
+        table = pq.read_table(pa.BufferReader(payload))
+    else:
+        table = pa.ipc.open_stream(payload).read_all()
+
+    df = table.to_pandas()
+
+    for field in table.schema:
+        if pa.types.is_time(field.type):
+            df[field.name] = df[field.name].map(lambda x: x.isoformat(), na_action="ignore")
+
+    if not categories:
+        df = df.astype({column: object for column in df.select_dtypes("category").columns})
+
+    return df
+
+
+async def fetch_api_data(
+    url: str, columnar: bool = False, params: dict | None = None
+) -> pd.DataFrame:
     """
     Obtém os dados da API.
+
+    Com columnar, os dados são pedidos em Arrow IPC (JSON se a API não suportar). Os params são
+    enviados na query string (ex.: {"linha": [1, 2], "columns": ["linha", "turno"]} nas rotas
+    /local e /machine, que filtram os dados na API). Respostas com ETag das consultas sem params
+    ficam em cache: a próxima requisição envia If-None-Match e, se a API responder 304 (os dados
+    não mudaram), retorna o DataFrame em cache sem baixar os dados novamente.
     """
+    headers = _request_headers(columnar)
+    query = _query_items(params)
+
+    cached = None if query else _cache_get((url, columnar))
+    if cached is not None:
+        headers["If-None-Match"] = cached[0]
 
     async with aiohttp.ClientSession() as session:
-        async with session.get(url) as response:
+        async with session.get(url, headers=headers, params=query) as response:
+            if response.status == 304 and cached is not None:
+                # Cópia: as páginas alteram os DataFrames recebidos
+                return cached[1].copy()
+
             if response.status == 200:
-                data = await response.json()
-                df = pd.read_json(StringIO(str(data)), orient="split")
+                df = await _read_response(response)
+
+                etag = response.headers.get("ETag")
+                if etag is not None and not query:
+                    _cache_put((url, columnar), (etag, df.copy()))
+
                 return df
             else:
-                logger.error(
-                    "Erro ao obter os dados da API. Status code: %s\n Message: %s\n Url: %s",
-                    response.status,
-                    response.reason,
-                    response.url,
-                )
+                _log_error(response)
 
                 return pd.DataFrame()
 
 
+async def fetch_api_pages(url: str, params: dict, columnar: bool = False) -> pd.DataFrame:
+    """
+    Obtém todas as páginas de uma consulta paginada da API (params com limit).
+
+    Cada página traz no cabeçalho X-Next-Cursor o cursor da seguinte, enviado no parâmetro
+    cursor até a última página (sem o cabeçalho).
+    """
+    headers = _request_headers(columnar)
+    params = dict(params)
+    frames = []
+
+    async with aiohttp.ClientSession() as session:
+        while True:
+            async with session.get(url, headers=headers, params=_query_items(params)) as response:
+                if response.status != 200:
+                    _log_error(response)
+                    break
+
+                frames.append(await _read_response(response))
+                cursor = response.headers.get(NEXT_CURSOR_HEADER)
+
+            if cursor is None:
+                break
+
+            params["cursor"] = cursor
+
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+async def fetch_api_changes(url: str, columnar: bool = False) -> pd.DataFrame:
+    """
+    Obtém os dados da API aplicando ao DataFrame em cache apenas as mudanças da tabela.
+
+    Com os dados da URL em cache, pede à rota {url}/changes as partições alteradas e removidas
+    desde a versão (ETag) em cache: as linhas dessas partições são removidas e as recebidas,
+    acrescentadas. Sem cache, ou se a API pedir a recarga completa, usa o fetch_api_data.
+    """
+    key = (url, columnar)
+    cached = _cache_get(key)
+
+    since = _cached_version(cached)
+    if since is None:
+        return await fetch_api_data(url, columnar)
+
+    changes, etag = await _request_changes(url, since)
+    if changes is None or etag is None or changes["full"]:
+        return await fetch_api_data(url, columnar)
+
+    df = cached[1]
+    if changes["changed"] or changes["removed"]:
+        df = _apply_changes(df, changes)
+
+    _cache_put(key, (etag, df.copy()))
+
+    # Cópia: as páginas alteram os DataFrames recebidos
+    return df.copy()
+
+
+def _cached_version(cached: tuple[str, pd.DataFrame] | None) -> str | None:
+    """Versão (ETag sem aspas) dos dados em cache (None se não houver ou não for uma versão)."""
+    if cached is None:
+        return None
+
+    since = cached[0].removeprefix("W/").strip('"')
+    return since if since.isdigit() else None
+
+
+async def _request_changes(url: str, since: str) -> tuple[dict | None, str | None]:
+    """
+    Pede à rota {url}/changes as mudanças desde a versão.
+
+    Returns:
+        tuple[dict | None, str | None]: Mudanças e ETag da versão atual (None em caso de erro).
+    """
+    async with aiohttp.ClientSession() as session:
+        async with session.get(f"{url}/changes", params={"since": since}) as response:
+            if response.status != 200:
+                _log_error(response)
+                return None, None
+
+            return await response.json(), response.headers.get("ETag")
+
+
+def _apply_changes(df: pd.DataFrame, changes: dict) -> pd.DataFrame:
+    """Remove as linhas das partições alteradas e removidas e acrescenta as linhas recebidas."""
+    keys = changes["keys"]
+    partitions = _like(pd.DataFrame(changes["changed"] + changes["removed"], columns=keys), df)
+
+    # Linhas cujas chaves estão entre as partições alteradas ou removidas
+    index = pd.MultiIndex.from_frame(df[keys].astype(object).where(df[keys].notna(), None))
+    changed = index.isin(
+        pd.MultiIndex.from_frame(partitions.astype(object).where(partitions.notna(), None))
+    )
+
+    frames = [df[~changed]]
+    if changes["data"] is not None:
+        # Sem inferir os tipos: textos só com dígitos (ex.: "000123") continuam textos
+        data = pd.read_json(StringIO(json.dumps(changes["data"])), orient="split", dtype=False)
+        frames.append(_like(data, df))
+
+    merged = _restore_categories(pd.concat(frames, ignore_index=True), df)
+    order_by = [column for column in changes["order_by"] if column in merged.columns]
+
+    return merged.sort_values(order_by, kind="stable", ignore_index=True)
+
+
+def _restore_categories(merged: pd.DataFrame, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converte de volta para category as colunas category de df (o concat com as linhas recebidas
+    as transforma em object), acrescentando às categorias os valores novos.
+    """
+    dtypes = {}
+
+    for column in df.select_dtypes("category").columns.intersection(merged.columns):
+        values = pd.Index(merged[column].dropna().astype(object).unique())
+        categories = df[column].cat.categories.union(values, sort=False)
+        dtypes[column] = pd.CategoricalDtype(categories, ordered=df[column].cat.ordered)
+
+    return merged.astype(dtypes)
+
+
+def _like(data: pd.DataFrame, df: pd.DataFrame) -> pd.DataFrame:
+    """Converte as colunas de data para os tipos das mesmas colunas de df."""
+    converted = {}
+
+    for column in data.columns.intersection(df.columns):
+        dtype = df[column].dtype
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            converted[column] = pd.to_datetime(data[column]).astype(dtype)
+        elif pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+            converted[column] = pd.to_numeric(data[column]).astype(dtype, errors="ignore")
+        elif dtype == object:
+            converted[column] = data[column].astype(object).where(data[column].notna(), None)
+
+    return data.assign(**converted)
+
+
+def _cache_get(key: tuple[str, bool]) -> tuple[str, pd.DataFrame] | None:
+    """ETag e DataFrame em cache da URL (None se não houver), marcados como os mais recentes."""
+    with _etag_cache_lock:
+        if key not in _etag_cache:
+            return None
+
+        _etag_cache.move_to_end(key)
+        return _etag_cache[key]
+
+
+def _cache_put(key: tuple[str, bool], value: tuple[str, pd.DataFrame]) -> None:
+    """Guarda o ETag e o DataFrame da URL, descartando os menos usados acima do limite."""
+    with _etag_cache_lock:
+        _etag_cache[key] = value
+        _etag_cache.move_to_end(key)
+
+        while len(_etag_cache) > ETAG_CACHE_MAX_ENTRIES:
+            _etag_cache.popitem(last=False)
+
+
+def _request_headers(columnar: bool) -> dict[str, str]:
+    """Cabeçalhos das requisições de dados (versão do payload e formatos aceitos)."""
+    headers = {PAYLOAD_VERSION_HEADER: PAYLOAD_VERSION}
+    if columnar:
+        headers["Accept"] = f"{ARROW_STREAM_MEDIA_TYPE}, application/json;q=0.5"
+
+    return headers
+
+
+def _query_items(params: dict | None) -> list[tuple[str, str]]:
+    """Parâmetros da query string, com as listas repetindo o parâmetro (linha=1&linha=2)."""
+    items = []
+    for key, value in (params or {}).items():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        items.extend((key, str(item)) for item in values if item is not None)
+
+    return items
+
+
+async def _read_response(response: aiohttp.ClientResponse) -> pd.DataFrame:
+    """Lê o DataFrame de uma resposta de dados (Arrow IPC, Parquet ou JSON)."""
+    if response.content_type in (ARROW_STREAM_MEDIA_TYPE, PARQUET_MEDIA_TYPE):
+        return read_columnar_data(await response.read(), response.content_type)
+
+    # Versão 1 (API sem suporte ao cabeçalho): o JSON vem codificado como string
+    if response.headers.get(PAYLOAD_VERSION_HEADER) == PAYLOAD_VERSION:
+        data = await response.text()
+    else:
+        data = str(await response.json())
+
+    return pd.read_json(StringIO(data), orient="split")
+
+
+def _log_error(response: aiohttp.ClientResponse) -> None:
+    """Registra a resposta de erro da API."""
+    logger.error(
+        "Erro ao obter os dados da API. Status code: %s\n Message: %s\n Url: %s",
+        response.status,
+        response.reason,
+        response.url,
+    )
+
+
 async def insert_api_data(url: str, data: list[dict]) -> None:
     """
     Insere os dados na API.